@@ -1,5 +1,6 @@
 import os
 from celery import Celery
+from celery.schedules import crontab
 from django.conf import settings
 
 # Set the default Django settings module
@@ -13,12 +14,40 @@ app.config_from_object('django.conf:settings', namespace='CELERY')
 
 # Auto-discover tasks from all registered Django apps
 app.autodiscover_tasks(lambda: settings.INSTALLED_APPS)
+# Shared tasks defined outside the apps' tasks modules
+app.conf.imports = ('utils.exports', 'utils.audit')
 
 # Optional: Configure task routes
 app.conf.task_routes = {
     'notifications.tasks.send_notification_task': {'queue': 'notifications'},
+    'apps.notifications.tasks.send_notification_batch_task': {'queue': 'notifications'},
+    'apps.notifications.tasks.deliver_queued_notifications': {'queue': 'notifications'},
     'notifications.tasks.notification_reminder_worker': {'queue': 'notifications'},
-    'notifications.tasks.mark_travel_as_completed': {'queue': 'notifications'},
+}
+
+# Periodic tasks (synced into django_celery_beat's DatabaseScheduler on beat start)
+app.conf.beat_schedule = {
+    'refresh-travel-analytics-rollups': {
+        'task': 'apps.travel.tasks.refresh_travel_analytics_rollups',
+        'schedule': crontab(minute='*/15'),
+    },
+    'deliver-queued-notifications': {
+        'task': 'apps.notifications.tasks.deliver_queued_notifications',
+        'schedule': crontab(minute='*'),
+        'options': {'queue': 'notifications'},
+    },
+    'sweep-travel-completion': {
+        'task': 'apps.travel.tasks.sweep_travel_completion',
+        'schedule': crontab(minute=30),
+    },
+    'archive-old-audit-logs': {
+        'task': 'utils.audit.archive_old_audit_logs',
+        'schedule': crontab(hour=2, minute=15),
+    },
+    'purge-old-export-files': {
+        'task': 'utils.exports.purge_old_export_files',
+        'schedule': crontab(minute=45),
+    },
 }
 
 @app.task(bind=True)
@@ -83,6 +83,7 @@ INSTALLED_APPS = [
     'apps.travel',
     'apps.expenses',
     'apps.notifications',
+    'apps.search',
 ]
 
 MIDDLEWARE = [
@@ -95,6 +96,7 @@ MIDDLEWARE = [
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
     'utils.middleware.StandardResponseMiddleware',
+    'utils.middleware.AuditBufferMiddleware',
     'utils.logging_middleware.RequestLoggingMiddleware',
 ]
 
@@ -277,6 +279,11 @@ REST_FRAMEWORK = {
         'rest_framework.permissions.IsAuthenticated',
     ),
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema', 
+    # Standard response format, applied while rendering (see utils.renderers)
+    'DEFAULT_RENDERER_CLASSES': (
+        'utils.renderers.EnvelopeJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ),
     # Pagination
     "DEFAULT_PAGINATION_CLASS": "utils.pagination.FlexiblePagination",
     "PAGE_SIZE": 10, 
@@ -0,0 +1,132 @@
+"""
+Resolved role / permission sets per user.
+
+`resolve_access(user)` fetches every active UserRole of the user together with
+the role's permission codenames in a single query, and keeps the result:
+  1. on the User instance (DRF authenticates a fresh instance per request,
+     so this is request-scoped memoization), and
+  2. in the shared cache under a versioned key, so warm requests do not touch
+     the database at all.
+
+Invalidation (see apps.authentication.signals):
+  - UserRole change      -> drop that user's cache entry
+  - Role / Permission /
+    RolePermission change -> bump the global version, dropping every entry
+"""
+
+import logging
+import uuid
+
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+ACCESS_CACHE_TIMEOUT = 60 * 15
+VERSION_KEY = "auth:access:version"
+MEMO_ATTR = "_resolved_access"
+
+ROLE_FIELDS = ("id", "name", "role_type", "is_active", "description", "created_at", "updated_at")
+
+
+class ResolvedAccess:
+    """Roles and permission codenames of one user, resolved from a single query."""
+
+    def __init__(self, rows):
+        from apps.authentication.models import Role
+
+        self.roles = []
+        self.primary_role = None
+        self.permissions = set()
+        seen = {}
+
+        for row in rows:
+            role_id = row["role_id"]
+            role = seen.get(role_id)
+            if role is None:
+                role = Role(**{f: row[f"role__{f}"] for f in ROLE_FIELDS})
+                seen[role_id] = role
+                if role.is_active:
+                    self.roles.append(role)
+                if row["is_primary"] and self.primary_role is None:
+                    self.primary_role = role
+            codename = row["role__rolepermission__permission__codename"]
+            if role.is_active and codename and row["role__rolepermission__permission__is_active"]:
+                self.permissions.add(codename)
+
+        # Role names are matched case-insensitively, as the MySQL collation does
+        self.role_names = {r.name.casefold() for r in self.roles}
+
+    def has_role(self, role_name):
+        return (role_name or "").casefold() in self.role_names
+
+
+def _fetch_rows(user_id):
+    from apps.authentication.models import UserRole
+
+    values = ["role_id", "is_primary",
+              "role__rolepermission__permission__codename",
+              "role__rolepermission__permission__is_active"]
+    values += [f"role__{f}" for f in ROLE_FIELDS]
+    return list(
+        UserRole.objects.filter(user_id=user_id, is_active=True)
+        .order_by("id")
+        .values(*values)
+    )
+
+
+def _cache_key(user_id):
+    version = cache.get(VERSION_KEY)
+    if version is None:
+        cache.add(VERSION_KEY, uuid.uuid4().hex, None)
+        version = cache.get(VERSION_KEY)
+    return f"auth:access:{version}:{user_id}"
+
+
+def resolve_access(user):
+    """Return the ResolvedAccess for user, memoized on the instance and in cache."""
+    access = user.__dict__.get(MEMO_ATTR)
+    if access is not None:
+        return access
+
+    if user.pk is None:
+        access = ResolvedAccess([])
+    else:
+        rows = None
+        key = None
+        try:
+            key = _cache_key(user.pk)
+            rows = cache.get(key)
+        except Exception as e:
+            logger.debug("Access cache unavailable for user %s: %s", user.pk, e)
+
+        if rows is None:
+            rows = _fetch_rows(user.pk)
+            if key:
+                try:
+                    cache.set(key, rows, ACCESS_CACHE_TIMEOUT)
+                except Exception as e:
+                    logger.debug("Could not cache access for user %s: %s", user.pk, e)
+
+        access = ResolvedAccess(rows)
+
+    user.__dict__[MEMO_ATTR] = access
+    return access
+
+
+def clear_access_memo(user):
+    """Forget the per-instance memo (e.g. after assigning roles to this instance)."""
+    user.__dict__.pop(MEMO_ATTR, None)
+
+
+def invalidate_user_access(user_id):
+    try:
+        cache.delete(_cache_key(user_id))
+    except Exception as e:
+        logger.debug("Could not invalidate access cache for user %s: %s", user_id, e)
+
+
+def invalidate_all_access():
+    try:
+        cache.set(VERSION_KEY, uuid.uuid4().hex, None)
+    except Exception as e:
+        logger.debug("Could not bump access cache version: %s", e)
@@ -0,0 +1,65 @@
+"""Export spec for users (see utils.exports)."""
+
+from django_filters.filterset import filterset_factory
+
+from apps.authentication.models import User
+from utils.exports import ExportSpec, column, full_name, search_q
+
+
+def filter_users(queryset, params, user):
+    """Same filterset_fields / search_fields as UserListCreateView."""
+    from apps.authentication.views import UserListCreateView as view
+
+    queryset = queryset.filter(is_superuser=False)
+    filterset = filterset_factory(User, fields=view.filterset_fields)(params, queryset=queryset)
+    queryset = filterset.qs
+    search = params.get("search")
+    if search:
+        queryset = queryset.filter(search_q(view.search_fields, search))
+    return queryset
+
+
+def can_export_users(user):
+    return user.is_staff or user.has_role("Admin")
+
+
+def scope_users(queryset, user):
+    return queryset if can_export_users(user) else queryset.none()
+
+
+USER_EXPORT = ExportSpec(
+    name="users",
+    model=User,
+    columns=[
+        column("ID", "id"),
+        column("Username", "username"),
+        column("First Name", "first_name"),
+        column("Last Name", "last_name"),
+        column("Email", "email"),
+        column("Gender", "gender"),
+        column("User Type", "user_type"),
+        column("Active", "is_active"),
+        column("Date Joined", "date_joined"),
+        column("Last Login", "last_login"),
+        column("Employee ID", "organizational_profile__employee_id"),
+        column("Company", "organizational_profile__company__name"),
+        column("Department", "organizational_profile__department__dept_name"),
+        column("Designation", "organizational_profile__designation__designation_name"),
+        column("Employee Type", "organizational_profile__employee_type__type"),
+        column("Grade", "organizational_profile__grade__name"),
+        column("Base Location", "organizational_profile__base_location__location_name"),
+        column(
+            "Reporting Manager",
+            "organizational_profile__reporting_manager__first_name",
+            "organizational_profile__reporting_manager__last_name",
+            format=full_name,
+        ),
+        column("Organization", "external_profile__organization_name"),
+        column("Contact Person", "external_profile__contact_person"),
+        column("Phone", "external_profile__phone"),
+        column("Vendor Email", "external_profile__email"),
+    ],
+    filter=filter_users,
+    scope=scope_users,
+    allow=can_export_users,
+)
@@ -130,32 +130,28 @@ class User(AbstractUser):
         return self.user_type == 'external'
     
     # Multi-role support methods
+    # Backed by apps.authentication.access: one query per user, memoized on the
+    # instance and cached in Redis until a role/permission change invalidates it.
+    def get_resolved_access(self):
+        """Get the cached role/permission resolution for this user"""
+        from apps.authentication.access import resolve_access
+        return resolve_access(self)
+
     def get_primary_role(self):
         """Get user's primary role (determines default dashboard)"""
-        primary_role = self.userrole_set.filter(is_primary=True, is_active=True).first()
-        return primary_role.role if primary_role else None
+        return self.get_resolved_access().primary_role
     
     def get_all_roles(self):
         """Get all active roles assigned to user"""
-        return [ur.role for ur in self.userrole_set.filter(role__is_active=True, is_active=True)]
+        return list(self.get_resolved_access().roles)
     
     def has_role(self, role_name):
         """Check if user has specific role"""
-        return self.userrole_set.filter(
-            role__name=role_name,
-            role__is_active=True,
-            is_active=True
-        ).exists()
+        return self.get_resolved_access().has_role(role_name)
     
     def get_user_permissions_list(self):
         """Get all permissions for user across all roles"""
-        permissions = set()
-        for role in self.get_all_roles():
-            role_perms = role.rolepermission_set.filter(
-                permission__is_active=True
-            ).values_list('permission__codename', flat=True)
-            permissions.update(role_perms)
-        return list(permissions)
+        return list(self.get_resolved_access().permissions)
     
     def get_approval_hierarchy(self):
         """Get approval chain for this user's travel requests"""
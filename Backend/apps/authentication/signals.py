@@ -0,0 +1,25 @@
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from apps.authentication.access import (
+    clear_access_memo, invalidate_all_access, invalidate_user_access,
+)
+from apps.authentication.models import Role, Permission, UserRole, RolePermission
+
+
+@receiver([post_save, post_delete], sender=UserRole)
+def invalidate_user_role_access(sender, instance, **kwargs):
+    """A user's role assignment changed: drop only that user's cached access."""
+    if UserRole._meta.get_field('user').is_cached(instance):
+        clear_access_memo(instance.user)
+    user_id = instance.user_id
+    transaction.on_commit(lambda: invalidate_user_access(user_id))
+
+
+@receiver([post_save, post_delete], sender=Role)
+@receiver([post_save, post_delete], sender=Permission)
+@receiver([post_save, post_delete], sender=RolePermission)
+def invalidate_role_permission_access(sender, **kwargs):
+    """Role or permission definitions changed: every cached access set is stale."""
+    transaction.on_commit(invalidate_all_access)
@@ -1,5 +1,14 @@
-from django.test import TestCase
+import os
+import tempfile
+import time
+from datetime import timedelta
+
+from django.test import TestCase, override_settings
 from django.contrib.auth import get_user_model
+from rest_framework.test import APIClient
+
+from utils.exports import purge_old_exports
+
 
 class LoginTestCase(TestCase):
     def setUp(self):
@@ -33,3 +42,43 @@ class LoginTestCase(TestCase):
         })
         self.assertEqual(response.status_code, 400)
         print("✅ Test 3 passed: invalid username rejected")
+
+
+class UserExportTestCase(TestCase):
+    def setUp(self):
+        User = get_user_model()
+        self.export_url = "/api/users/export/"
+        self.employee = User.objects.create_user(username="employee", password="x")
+        self.admin = User.objects.create_user(username="admin", password="x", is_staff=True)
+        self.client = APIClient()
+
+    def test_export_requires_admin(self):
+        self.client.force_authenticate(self.employee)
+        response = self.client.get(self.export_url)
+        self.assertEqual(response.status_code, 403)
+
+    def test_admin_export_streams_csv(self):
+        self.client.force_authenticate(self.admin)
+        response = self.client.get(self.export_url)
+        self.assertEqual(response.status_code, 200)
+        content = b"".join(response.streaming_content).decode()
+        self.assertIn("employee", content)
+
+
+class ExportRetentionTestCase(TestCase):
+    def test_old_export_files_are_deleted(self):
+        with tempfile.TemporaryDirectory() as media_root, override_settings(MEDIA_ROOT=media_root):
+            old_dir = os.path.join(media_root, "exports", "1")
+            recent_dir = os.path.join(media_root, "exports", "2")
+            os.makedirs(old_dir)
+            os.makedirs(recent_dir)
+            for path in (os.path.join(old_dir, "a.csv"), os.path.join(old_dir, "b.xlsx.failed")):
+                open(path, "w").close()
+                stale = time.time() - 2 * 3600
+                os.utime(path, (stale, stale))
+            open(os.path.join(recent_dir, "c.csv.part"), "w").close()
+
+            self.assertEqual(purge_old_exports(max_age=timedelta(hours=1)), 2)
+            self.assertFalse(os.path.exists(old_dir))
+            self.assertEqual(os.listdir(recent_dir), ["c.csv.part"])
+
@@ -16,6 +16,7 @@ urlpatterns = [
 
     # Bulk Export
     path("users/export/", UserExportCSV.as_view(), name='user-bulk-export'),
+    path("exports/<uuid:token>/", ExportFileView.as_view(), name='export-file'),
     
     # Role Management (Admin)
     path('roles/', RoleListCreateView.as_view(), name='role_list_create'),
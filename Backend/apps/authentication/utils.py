@@ -1,5 +1,6 @@
 from django.db import transaction
 from .models import User, Role, Permission, UserRole, RolePermission
+from .access import clear_access_memo, invalidate_user_access
 
 class RoleManager:
     """
@@ -58,6 +59,11 @@ class RoleManager:
                 user=user, 
                 role__name=role_name
             ).update(is_primary=True)
+
+            # .update() bypasses the UserRole signals, so drop cached access explicitly
+            clear_access_memo(user)
+            user_id = user.id
+            transaction.on_commit(lambda: invalidate_user_access(user_id))
     
     @staticmethod
     def create_default_roles():
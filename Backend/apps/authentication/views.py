@@ -15,9 +15,8 @@ from .permissions import IsAdminUser, HasCustomPermission
 from .utils import RoleManager
 from utils.rate_limiters import api_ratelimit
 from utils.response_formatter import success_response, error_response
+from utils.exports import ExportView, ExportFileView
 from django.contrib.auth import get_user_model
-import csv
-from django.http import HttpResponse
 
 User = get_user_model()
 
@@ -242,8 +241,8 @@ class UserListCreateView(ListCreateAPIView):
         "last_name",
         "organizational_profile__employee_id",
         "organizational_profile__company__name",
-        "organizational_profile__department__name",
-        "designation__name",
+        "organizational_profile__department__dept_name",
+        "designation__designation_name",
         "external_profile__organization_name",
     ]
 
@@ -254,21 +253,9 @@ class UserListCreateView(ListCreateAPIView):
     ]
 
 
-class UserExportCSV(APIView):
-    def get(self, request):
-        users = User.objects.all()
-        serializer = UserListSerializer(users, many=True)
-
-        response = HttpResponse(content_type="text/csv")
-        response["Content-Disposition"] = "attachment; filename=users_export.csv"
-
-        writer = csv.writer(response)
-        writer.writerow(serializer.data[0].keys())  # headers
-
-        for row in serializer.data:
-            writer.writerow(row.values())
-
-        return response
+class UserExportCSV(ExportView):
+    """Export users with the UserListCreateView filters (streamed CSV or background CSV/XLSX)."""
+    export_name = "users"
 
 class UserDetailView(RetrieveUpdateDestroyAPIView):
     """
@@ -0,0 +1,128 @@
+"""
+Expense claims PDF report
+
+The report is drawn from a values() projection read in keyset chunks
+(newest claim first), straight into a file, so neither claim instances nor the
+whole result set are held in memory and there is no row cap:
+
+  - ClaimReportPDFView renders reports of up to REPORT_SYNC_MAX_ROWS claims
+    in the request, into a temporary file;
+  - larger reports are rendered by generate_claim_report_task into
+    MEDIA_ROOT/exports/<user id>/<token>.pdf and downloaded from the export
+    status endpoint (utils.exports.ExportFileView).
+"""
+
+import logging
+import os
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+from reportlab.lib.pagesizes import A4
+from reportlab.pdfgen import canvas
+
+from apps.expenses.models import ExpenseClaim
+from apps.travel.exports import travel_request_id
+
+logger = logging.getLogger(__name__)
+
+REPORT_CHUNK_SIZE = 1000
+# Larger reports are generated in the background
+REPORT_SYNC_MAX_ROWS = getattr(settings, "CLAIM_REPORT_SYNC_MAX_ROWS", 2000)
+
+REPORT_FIELDS = (
+    "id", "created_on", "travel_application_id", "travel_application__created_at",
+    "employee__first_name", "employee__last_name", "employee__username",
+    "status__label", "final_amount_payable",
+)
+
+
+def report_queryset(filters):
+    """Claims matching validated ClaimReportFilterSerializer data."""
+    qs = ExpenseClaim.objects.all()
+    if filters.get("employee"):
+        qs = qs.filter(employee_id=filters["employee"])
+    if filters.get("department"):
+        qs = qs.filter(employee__department_id=filters["department"])
+    if filters.get("status"):
+        qs = qs.filter(status__code=filters["status"])
+    if filters.get("from_date"):
+        qs = qs.filter(created_on__date__gte=filters["from_date"])
+    if filters.get("to_date"):
+        qs = qs.filter(created_on__date__lte=filters["to_date"])
+    return qs
+
+
+def iter_report_rows(filters, chunk_size=REPORT_CHUNK_SIZE):
+    """Yield REPORT_FIELDS dicts newest first, chunk_size rows per query."""
+    base = report_queryset(filters).order_by("-created_on", "-id").values(*REPORT_FIELDS)
+    last = None
+    while True:
+        batch = base
+        if last is not None:
+            batch = base.filter(
+                Q(created_on__lt=last["created_on"])
+                | Q(created_on=last["created_on"], id__lt=last["id"])
+            )
+        batch = list(batch[:chunk_size])
+        yield from batch
+        if len(batch) < chunk_size:
+            return
+        last = batch[-1]
+
+
+def render_claim_report(output, filters, generated_by):
+    """Draw the report for filters into output (a path or binary file object)."""
+    p = canvas.Canvas(output, pagesize=A4)
+    width, height = A4
+
+    # Title
+    p.setFont("Helvetica-Bold", 16)
+    p.drawString(40, height - 60, "Expense Claims Report")
+    p.setFont("Helvetica", 10)
+    p.drawString(
+        40,
+        height - 80,
+        f"Generated by: {generated_by} "
+        f"on {timezone.now().strftime('%Y-%m-%d %H:%M:%S')}"
+    )
+    y = height - 110
+
+    def header(y):
+        p.setFont("Helvetica-Bold", 9)
+        p.drawString(40, y, "Claim ID")
+        p.drawString(100, y, "TR ID")
+        p.drawString(220, y, "Employee")
+        p.drawString(340, y, "Status")
+        p.drawString(420, y, "Final Amount")
+        p.setFont("Helvetica", 9)
+        return y - 18
+
+    y = header(y)
+    count = 0
+    for row in iter_report_rows(filters):
+        if y < 80:
+            p.showPage()
+            y = header(height - 80)
+
+        p.drawString(40, y, str(row["id"]))
+        tr_id = travel_request_id(row["travel_application_id"], row["travel_application__created_at"]) or ""
+        p.drawString(100, y, tr_id[:18])
+        emp = f"{row['employee__first_name']} {row['employee__last_name']}".strip() or row["employee__username"]
+        p.drawString(220, y, emp[:18])
+        p.drawString(340, y, (row["status__label"] or "")[:12])
+        p.drawString(420, y, str(row["final_amount_payable"]))
+        y -= 16
+        count += 1
+
+    p.showPage()
+    p.save()
+    return count
+
+
+def write_claim_report(path, filters, generated_by):
+    """Render to path via a .part file, renamed once complete."""
+    partial = f"{path}.part"
+    render_claim_report(partial, filters, generated_by)
+    os.replace(partial, path)
+    return path
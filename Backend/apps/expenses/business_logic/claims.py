@@ -8,7 +8,7 @@ from apps.travel.models.application import TravelApplication
 from apps.expenses.models import *
 from apps.master_data.models.travel import GradeEntitlementMaster
 from apps.master_data.models.geography import CityCategoriesMaster
-from apps.master_data.models.approval import DAIncidentalMaster  
+from apps.travel.business_logic.da_rates import da_rate_matrix
 from apps.travel.models.application import TripDetails         
 
 
@@ -47,39 +47,33 @@ def _get_expense_type_code(etype) -> str:
 # DA MASTER FETCH
 # --------------------------------------------------------------------
 
-def _get_da_rates_for_grade(grade_name: str):
+def _get_da_rates_for_grade(grade_name: str, matrix=None):
     """
     Fetch DA & incidental rates from master, grouped by city category.
     The TR provides employee_grade = "B-2A", which matches GradeMaster.name.
+    Rates come from the cached DA rate matrix, so this issues no queries.
     """
     today = date.today()
-    result = {}
-
-    # Fetch all DA rows for grade & active date range
-    rows = DAIncidentalMaster.objects.filter(
-        grade__name=grade_name,
-        is_active=True,
-        effective_from__lte=today
-    ).filter(
-        Q(effective_to__isnull=True) | Q(effective_to__gte=today)
-    )
+    matrix = matrix or da_rate_matrix.get()
+
+    # All DA rows for grade & active date range
+    rows = matrix.rates_for_grade(str(grade_name), today)
 
-    if not rows.exists():
+    if not rows:
         # Master data missing → validation error
         raise ValidationError({
             "da_master": [f"DA/Incidental master data not found for grade '{grade_name}'."]
         })
 
-    for r in rows:
-        cat = r.city_category.name  # "A", "B", "C"
-        result[cat] = {
+    return {
+        cat: {  # "A", "B", "C"
             "full": _to_decimal(r.da_full_day),
             "half": _to_decimal(r.da_half_day),
             "inc_full": _to_decimal(r.incidental_full_day),
             "inc_half": _to_decimal(r.incidental_half_day),
         }
-
-    return result
+        for cat, r in rows.items()
+    }
 
 # --------------------------------------------------------------------
 # MAIN: DA CALCULATION WITH FIXED DATE EXTRACTION
@@ -90,6 +84,32 @@ def calculate_da_breakdown(tr: TravelApplication) -> List[Dict[str, Any]]:
     Calculate DA/Incidental for each day of travel.
     FIX: Travel dates extracted from TripDetails if TR doesn't have start_date / end_date.
     """
+    return calculate_da_breakdowns([tr])[tr.id]
+
+
+def calculate_da_breakdowns(applications) -> Dict[int, List[Dict[str, Any]]]:
+    """
+    Batched calculate_da_breakdown for one or many travel applications
+    (e.g. month-end recomputation): trips are loaded in one prefetch and every
+    day is rated against the cached DA matrix.
+    Returns {application_id: breakdown}. An application whose grade has no
+    rates raises ValidationError, as calculate_da_breakdown does.
+    """
+    from django.db.models import Prefetch, prefetch_related_objects
+
+    applications = list(applications)
+    prefetch_related_objects(
+        applications,
+        "employee__grade",
+        Prefetch("trip_details", queryset=TripDetails.objects.select_related("to_location__category")),
+    )
+    matrix = da_rate_matrix.get()
+
+    return {tr.id: _da_breakdown(tr, matrix) for tr in applications}
+
+
+def _da_breakdown(tr: TravelApplication, matrix) -> List[Dict[str, Any]]:
+    trips = list(tr.trip_details.all())
 
     # ---------- Extract travel dates ----------
     start = _date_from_str(getattr(tr, "start_date", None))
@@ -97,24 +117,21 @@ def calculate_da_breakdown(tr: TravelApplication) -> List[Dict[str, Any]]:
 
     # Fallback to TripDetails table
     if not start or not end:
-        trips = tr.trip_details.all()
-        if trips.exists():
-            start = _date_from_str(trips.order_by("departure_date").first().departure_date)
-            end = _date_from_str(trips.order_by("-return_date").first().return_date)
+        if trips:
+            start = _date_from_str(min(trips, key=lambda t: t.departure_date).departure_date)
+            end = _date_from_str(max(trips, key=lambda t: t.return_date).return_date)
 
     if not start or not end:
         return []  # cannot calculate
 
     # ---------- Grade ----------
     grade_code = getattr(getattr(tr, "employee", None), "grade", None) or "B-3"
-    da_master = _get_da_rates_for_grade(grade_code)
+    da_master = _get_da_rates_for_grade(grade_code, matrix)
 
     # ---------- City Category (default B) ----------
-    trips = tr.trip_details.all()
     cat = "B"
-    if trips.exists():
-        first_trip = trips.first()
-        trip_cat = first_trip.get_city_category()
+    if trips:
+        trip_cat = trips[0].get_city_category()
         if trip_cat:
             cat = trip_cat
 
@@ -0,0 +1,68 @@
+"""Export spec for expense claims (see utils.exports)."""
+
+from apps.expenses.models import ExpenseClaim
+from apps.travel.exports import travel_request_id
+from utils.exports import ExportSpec, column, full_name
+
+EXPORT_ALL_GROUPS = ["Finance", "TravelDesk"]
+EXPORT_ALL_ROLES = ("Admin", "Finance")
+
+
+def scope_claims(queryset, user):
+    """Like ClaimListView: staff and Finance / TravelDesk export every claim."""
+    if (
+        user.is_staff
+        or any(user.has_role(role) for role in EXPORT_ALL_ROLES)
+        or user.groups.filter(name__in=EXPORT_ALL_GROUPS).exists()
+    ):
+        return queryset
+    return queryset.filter(employee=user)
+
+
+def filter_claims(queryset, params, user):
+    """
+    Query params of ClaimListCreateView (status, from_date / to_date on
+    created_on, search on claim id) and ClaimListView (from / to on submitted_on).
+    """
+    status_q = params.get("status")
+    if status_q:
+        queryset = queryset.filter(status__code=status_q)
+    if params.get("from_date"):
+        queryset = queryset.filter(created_on__date__gte=params["from_date"])
+    if params.get("to_date"):
+        queryset = queryset.filter(created_on__date__lte=params["to_date"])
+    if params.get("from"):
+        queryset = queryset.filter(submitted_on__date__gte=params["from"])
+    if params.get("to"):
+        queryset = queryset.filter(submitted_on__date__lte=params["to"])
+    search = params.get("search")
+    if search and search.isdigit():
+        queryset = queryset.filter(id=search)
+    return queryset
+
+
+CLAIM_EXPORT = ExportSpec(
+    name="expense_claims",
+    model=ExpenseClaim,
+    columns=[
+        column("Claim ID", "id"),
+        column(
+            "Travel Request ID",
+            "travel_application_id", "travel_application__created_at",
+            format=travel_request_id,
+        ),
+        column("Employee", "employee__username"),
+        column("Employee Name", "employee__first_name", "employee__last_name", format=full_name),
+        column("Status", "status__label"),
+        column("Total DA", "total_da"),
+        column("Total Incidental", "total_incidental"),
+        column("Total Expenses", "total_expenses"),
+        column("Advance Received", "advance_received"),
+        column("Final Amount Payable", "final_amount_payable"),
+        column("Late Submission", "is_late_submission"),
+        column("Submitted On", "submitted_on"),
+        column("Created On", "created_on"),
+    ],
+    filter=filter_claims,
+    scope=scope_claims,
+)
@@ -0,0 +1,32 @@
+import logging
+
+from celery import shared_task
+
+from utils.exports import export_path, record_export_failure
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task
+def generate_claim_report_task(params, user_id, token):
+    """
+    Render the expense claims PDF for ClaimReportFilterSerializer params to
+    MEDIA_ROOT/exports/<user_id>/<token>.pdf (see utils.exports.ExportFileView).
+    """
+    from apps.authentication.models import User
+    from apps.expenses.business_logic.claim_report import write_claim_report
+    from apps.expenses.serializers import ClaimReportFilterSerializer
+
+    path = export_path(user_id, token, "pdf")
+    try:
+        serializer = ClaimReportFilterSerializer(data=params)
+        serializer.is_valid(raise_exception=True)
+        user = User.objects.get(pk=user_id)
+        write_claim_report(path, serializer.validated_data, user.get_full_name() or user.username)
+    except Exception as e:
+        logger.exception("Claim report %s failed for user %s", token, user_id)
+        record_export_failure(path, e)
+        return None
+
+    logger.info("Claim report written to %s", path)
+    return path
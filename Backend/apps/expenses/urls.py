@@ -9,6 +9,7 @@ urlpatterns = [
     
     # My Claims (list) + Create (submit)
     path("claims/", ClaimListCreateView.as_view(), name="expense-claim-list-create"),
+    path("claims/export/", ClaimExportView.as_view(), name="expense-claim-export"),
 
 
     # Claim detail
@@ -29,7 +30,7 @@ urlpatterns = [
          name="claim-upload-receipts"),
 
     # Claim Reports (PDF)
-    # path("reports/claims/pdf/", ClaimReportPDFView.as_view(), name="expense-claims-report-pdf"),
+    path("reports/claims/pdf/", ClaimReportPDFView.as_view(), name="expense-claims-report-pdf"),
 
     # --- Master Data APIs ---
     path("expense-types/", ExpenseTypeListCreateView.as_view(), name="expense-types"),
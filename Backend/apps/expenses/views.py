@@ -1,5 +1,6 @@
-import io
+import tempfile
 import traceback
+import uuid
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
@@ -19,9 +20,12 @@ from apps.master_data.models.approval import ApprovalMatrix
 from apps.master_data.models.travel import TravelModeMaster
 from utils.pagination import StandardResultsSetPagination
 from utils.response_formatter import *
+from utils.exports import ExportView, start_export_file
+from apps.expenses.business_logic.claim_report import (
+    REPORT_SYNC_MAX_ROWS, render_claim_report, report_queryset,
+)
+from apps.expenses.tasks import generate_claim_report_task
 
-from reportlab.lib.pagesizes import A4
-from reportlab.pdfgen import canvas
 
 # -------------------------
 # Validate endpoint
@@ -132,6 +136,10 @@ class ClaimListCreateView(APIView):
             tb = traceback.format_exc()
             return error_response(data={"detail": str(ex), "trace": tb}, message="Unexpected error")
 
+class ClaimExportView(ExportView):
+    """Export claims with the ClaimListCreateView / ClaimListView filters."""
+    export_name = "expense_claims"
+
 # -------------------------
 # Claim detail
 # -------------------------
@@ -569,17 +577,17 @@ class ClaimReportPDFView(APIView):
     def get(self, request):
         """
         Generate PDF report for claims with filters.
-        Returns: application/pdf stream
+        Returns: application/pdf stream, or 202 with a token for reports
+        rendered in the background (see business_logic.claim_report).
+          - background=1: always render in the background
         """
         try:
             # permission: only staff/finance/admin can access
             if not (request.user.is_staff or request.user.groups.filter(name__in=["Finance"]).exists()):
-                return Response(
-                    error_response(
-                        message="Forbidden",
-                        serializer_data={"permission": ["Only finance/staff can generate reports"]}
-                    ),
-                    status=403
+                return error_response(
+                    message="Forbidden",
+                    errors={"permission": ["Only finance/staff can generate reports"]},
+                    status_code=status.HTTP_403_FORBIDDEN
                 )
 
             # validate filters
@@ -587,92 +595,39 @@ class ClaimReportPDFView(APIView):
             serializer.is_valid(raise_exception=False)
 
             if serializer.errors:
-                return Response(
-                    error_response(
-                        message="Invalid filters",
-                        serializer_data=serializer.errors
-                    ),
-                    status=400
-                )
+                return validation_error_response(serializer.errors)
 
             filters = serializer.validated_data
 
-            qs = ExpenseClaim.objects.select_related(
-                "employee", "status", "travel_application"
-            ).all()
-
-            # Apply filters
-            if filters.get("employee"):
-                qs = qs.filter(employee_id=filters["employee"])
-            if filters.get("status"):
-                qs = qs.filter(status__code=filters["status"])
-            if filters.get("from_date"):
-                qs = qs.filter(created_on__date__gte=filters["from_date"])
-            if filters.get("to_date"):
-                qs = qs.filter(created_on__date__lte=filters["to_date"])
-
-            qs = qs.order_by("-created_on")[:1000]  # safety cap
-
-            # Create PDF in-memory
-            buffer = io.BytesIO()
-            p = canvas.Canvas(buffer, pagesize=A4)
-            width, height = A4
-
-            # Title
-            p.setFont("Helvetica-Bold", 16)
-            p.drawString(40, height - 60, "Expense Claims Report")
-            p.setFont("Helvetica", 10)
-            p.drawString(
-                40,
-                height - 80,
-                f"Generated by: {request.user.get_full_name() or request.user.username} "
-                f"on {timezone.now().strftime('%Y-%m-%d %H:%M:%S')}"
-            )
-            y = height - 110
-
-            # Table header
-            p.setFont("Helvetica-Bold", 9)
-            p.drawString(40, y, "Claim ID")
-            p.drawString(100, y, "TR ID")
-            p.drawString(220, y, "Employee")
-            p.drawString(340, y, "Status")
-            p.drawString(420, y, "Final Amount")
-            p.setFont("Helvetica", 9)
-            y -= 18
-
-            # Rows
-            for claim in qs:
-                if y < 80:
-                    p.showPage()
-                    y = height - 80
-
-                p.drawString(40, y, str(claim.id))
-
-                tr_id = getattr(claim.travel_application, "travel_request_id", "") or ""
-                p.drawString(100, y, tr_id[:18])
-
-                emp = claim.employee.get_full_name() or claim.employee.username
-                p.drawString(220, y, emp[:18])
-
-                status_label = claim.status.label if claim.status else ""
-                p.drawString(340, y, status_label[:12])
-
-                p.drawString(420, y, str(claim.final_amount_payable))
-                y -= 16
+            background = request.query_params.get("background") in ("1", "true")
+            if not background:
+                background = report_queryset(filters).count() > REPORT_SYNC_MAX_ROWS
+
+            if background:
+                token = str(uuid.uuid4())
+                start_export_file(request.user.id, token, "pdf")
+                generate_claim_report_task.delay(request.query_params.dict(), request.user.id, token)
+                return success_response(
+                    data={
+                        "token": token,
+                        "status_url": request.build_absolute_uri(f"/api/exports/{token}/"),
+                    },
+                    message="Report is being generated",
+                    status_code=status.HTTP_202_ACCEPTED
+                )
 
-            p.showPage()
-            p.save()
-            buffer.seek(0)
+            # Render into a temporary file, streamed back and removed on close
+            output = tempfile.TemporaryFile(suffix=".pdf")
+            render_claim_report(output, filters, request.user.get_full_name() or request.user.username)
+            output.seek(0)
 
             filename = f"expense_claims_report_{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}.pdf"
-            return FileResponse(buffer, as_attachment=True, filename=filename)
+            return FileResponse(output, as_attachment=True, filename=filename)
 
         except Exception as ex:
             tb = traceback.format_exc()
-            return Response(
-                error_response(
-                    message="Unexpected error",
-                    serializer_data={"detail": str(ex), "trace": tb}
-                ),
-                status=500
-            )
\ No newline at end of file
+            return error_response(
+                message="Unexpected error",
+                errors={"detail": str(ex), "trace": tb},
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
@@ -0,0 +1,97 @@
+import copy
+import time
+from datetime import datetime, timezone as dt_timezone
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand, CommandError
+from django.test import RequestFactory
+from rest_framework.renderers import JSONRenderer
+from rest_framework.response import Response
+
+from utils.middleware import StandardResponseMiddleware
+from utils.renderers import EnvelopeJSONRenderer, orjson
+
+
+def city_rows(count):
+    """
+    Rows shaped like serializer output of the unpaginated master-data lists
+    (cities, modes, entitlements), plus a raw Decimal / datetime as some
+    hand-built payloads carry.
+    """
+    created = datetime(2025, 4, 1, 9, 30, 15, 123456, tzinfo=dt_timezone.utc)
+    return [
+        {
+            'id': i,
+            'city_name': f'City {i} - Bhubaneśwar',
+            'city_code': f'C{i:05d}',
+            'state': {'id': i % 36, 'state_name': 'Odisha', 'country': 'India'},
+            'category': {'id': i % 3 + 1, 'name': f'Category {"ABC"[i % 3]}'},
+            'latitude': '20.296059',
+            'longitude': 85.824539 + i / 1000,
+            'da_rate': '1250.00',
+            'is_active': i % 7 != 0,
+            'remarks': None,
+            'created_at': '2025-04-01T09:30:15.123456Z',
+            'updated_at': created if i % 10 == 0 else None,
+            'allowance': Decimal('312.50') if i % 10 == 0 else None,
+        }
+        for i in range(count)
+    ]
+
+
+class Command(BaseCommand):
+    help = 'Compare render + middleware re-serialization with the single-pass envelope renderer'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=5000)
+        parser.add_argument('--repeat', type=int, default=20)
+
+    def handle(self, *args, **options):
+        rows = city_rows(options['rows'])
+        # Views that wrap themselves (success_response) vs raw lists the middleware wraps
+        cases = {
+            'raw list': rows,
+            'success_response': {'success': True, 'message': 'Success', 'data': rows, 'errors': None},
+        }
+        self.stdout.write(
+            f"{options['rows']} rows, best of {options['repeat']}, "
+            f"orjson {'enabled' if orjson else 'not installed'}"
+        )
+        for name, data in cases.items():
+            before, old = self.measure(self.legacy, data, options['repeat'])
+            after, new = self.measure(self.single_pass, data, options['repeat'])
+            if old != new:
+                raise CommandError(f'{name}: output differs from the middleware format')
+            self.stdout.write(
+                f'{name:<17} middleware {before * 1000:8.1f} ms   renderer {after * 1000:8.1f} ms   '
+                f'saved {100 * (1 - after / before):5.1f}%   ({len(new)} bytes, identical)'
+            )
+
+    def measure(self, render, data, repeat):
+        best, content = None, None
+        for _ in range(repeat):
+            payload = copy.deepcopy(data)
+            start = time.perf_counter()
+            content = render(payload)
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        return best, content
+
+    def _respond(self, renderer, data):
+        request = RequestFactory().get('/api/master/cities/')
+        response = Response(data)
+        response.accepted_renderer = renderer
+        response.accepted_media_type = renderer.media_type
+        response.renderer_context = {'request': request, 'response': response, 'view': None}
+        return request, response.render()
+
+    def legacy(self, data):
+        """JSONRenderer, then StandardResponseMiddleware's wrap and json.dumps (before the renderer)."""
+        request, response = self._respond(JSONRenderer(), data)
+        middleware = StandardResponseMiddleware(lambda request: response)
+        return middleware(request).content
+
+    def single_pass(self, data):
+        request, response = self._respond(EnvelopeJSONRenderer(), data)
+        middleware = StandardResponseMiddleware(lambda request: response)
+        return middleware(request).content
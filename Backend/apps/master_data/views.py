@@ -6,7 +6,7 @@ from rest_framework import filters, viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.parsers import MultiPartParser, FormParser
-from django.db.models import Q
+from apps.search.index import filter_by_search
 
 from .models import *
 from .serializers import *
@@ -300,44 +300,22 @@ class AllowedTravelModesView(APIView):
         user = request.user
         profile = getattr(user, "organizational_profile", None)
 
-        if not profile or not profile.grade:
+        if not profile or not profile.grade_id:
             return Response({
                 "success": False,
                 "message": "User grade not found.",
                 "data": []
             }, status=400)
 
-        grade = profile.grade
+        from apps.travel.business_logic.entitlement_index import entitlement_index
 
-        # Fetch only allowed entitlements for this grade
-        entitlements = GradeEntitlementMaster.objects.filter(
-            grade=grade,
-            is_allowed=True
-        ).select_related("sub_option", "sub_option__mode")
-
-        response = {}
-
-        for ent in entitlements:
-            mode = ent.sub_option.mode   # TravelModeMaster FK
-            sub = ent.sub_option         # TravelSubOptionMaster
-
-            if mode.id not in response:
-                response[mode.id] = {
-                    "id": mode.id,
-                    "name": mode.name,
-                    "sub_options": []
-                }
-
-            response[mode.id]["sub_options"].append({
-                "id": sub.id,
-                "name": sub.name,
-                "max_amount": ent.max_amount
-            })
+        # Allowed entitlements for this grade, from the in-memory entitlement index
+        response = entitlement_index.get().allowed_for_grade(profile.grade_id)
 
         return Response({
             "success": True,
             "message": "Allowed travel modes loaded successfully.",
-            "data": list(response.values())
+            "data": response
         }, status=200)
     
 # Accommodation Views
@@ -355,21 +333,8 @@ class GuestHouseMasterViewSet(viewsets.ModelViewSet):
         search = self.request.query_params.get('search', None)
         
         if search:
-            queryset = queryset.filter(
-                Q(name__icontains=search) |
-                Q(address__icontains=search) |
-                Q(contact_person__icontains=search) |
-                Q(phone_number__icontains=search) |
-                Q(email__icontains=search) |
-                Q(gstin__icontains=search) |
-                Q(vendor_code__icontains=search) |
-                Q(registration_number__icontains=search) |
-                Q(district__icontains=search) |
-                Q(pin_code__icontains=search) |
-                Q(city__city_name__icontains=search) |
-                Q(state__state_name__icontains=search) |
-                Q(country__country_name__icontains=search)
-            )
+            # name, codes, contacts, address and location (search index), best first
+            queryset = filter_by_search(queryset, 'guest_house', search)
     
         return queryset
     
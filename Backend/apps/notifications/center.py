@@ -1,14 +1,20 @@
-from django.template import Template, Context
+import uuid
+from django.template import Context
 from django.conf import settings
 from django.utils import timezone
 from django.db import transaction
-from .models import NotificationRule, NotificationLog, NotificationEvent, EmailTemplateMaster
+from .models import NotificationLog, NotificationEvent, EmailTemplateMaster
 from apps.authentication.models import User
 from .providers import EmailProviderFactory
+from .rules import get_rule, compiled_template
+from . import recipients as recipients_resolver
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Recipients per delivery task
+DELIVERY_CHUNK_SIZE = 500
+
 
 class NotificationCenter:
     """Central notification orchestration API."""
@@ -21,19 +27,37 @@ class NotificationCenter:
         reference: {'type': 'TravelRequest', 'id': 12}
         payload: must contain IDs like 'employee_id', 'approver_id', 'booking_agent_id', 'desk_agent_id' as needed.
         """
-        rule = NotificationRule.objects.filter(event_name=event_name, is_active=True).first()
-        if not rule:
-            logger.info("No NotificationRule found for event: %s", event_name)
-            return
+        NotificationCenter.notify_many([(event_name, reference, payload)])
+
+    @staticmethod
+    def notify_many(events):
+        """
+        Notify a batch of (event_name, reference, payload) events.
+        Recipients of every event are resolved together with one user query.
+        """
+        ruled = []
+        for event_name, reference, payload in events:
+            rule = get_rule(event_name)
+            if not rule:
+                logger.info("No NotificationRule found for event: %s", event_name)
+                continue
+            ruled.append((rule, event_name, reference, payload))
 
+        # Resolve recipients (list of User objects or simple dicts mapping to contact methods)
+        resolved = recipients_resolver.resolve_many(
+            [(rule.recipient_resolver, payload) for rule, _, _, payload in ruled]
+        )
+
+        for (rule, event_name, reference, payload), recipients in zip(ruled, resolved):
+            NotificationCenter._notify_recipients(rule, event_name, reference, payload, recipients)
+
+    @staticmethod
+    def _notify_recipients(rule, event_name, reference, payload, recipients):
         # Render template if present
         subject, body_html, body_text = None, None, None
         if rule.template:
             subject, body_html, body_text = NotificationCenter._render_template(rule.template, payload)
 
-        # Resolve recipients (list of User objects or simple dicts mapping to contact methods)
-        recipients = NotificationCenter._resolve_recipients(rule.recipient_resolver, payload)
-
         # Create NotificationEvent for reminders if configured
         if rule.send_reminder and rule.reminder_intervals:
             # set first reminder time according to rule.reminder_intervals[0]
@@ -49,7 +73,9 @@ class NotificationCenter:
                 reminder_index=0,
             )
 
-        # For each channel and recipient create log and enqueue Celery task
+        # For each channel and recipient build a log row; rows are written with
+        # bulk_create and delivered by one Celery task per chunk of recipients
+        logs = []
         for channel in rule.channels:
             for r in recipients:
                 # r expected to be a User instance or dict { 'email':..., 'phone':... }
@@ -58,48 +84,67 @@ class NotificationCenter:
                     logger.debug("No contact for channel %s on recipient %s", channel, r)
                     continue
 
+                status = 'queued'
                 # Respect user preferences if r is User
                 if isinstance(r, User):
+                    # loaded by the resolver's select_related when the relation exists
                     prefs = getattr(r, 'notification_preferences', None)
                     # convert event_name dots to field-like name for preferences check
                     pref_key = event_name.replace('.', '_')
                     if prefs and not prefs.should_notify(pref_key, channel=channel):
-                        NotificationLog.objects.create(
-                            event_name=event_name,
-                            channel=channel,
-                            recipient=recipient_contact,
-                            subject=subject,
-                            body=body_text or body_html,
-                            payload=payload,
-                            status='skipped',
-                        )
-                        continue
-
-                # create log
-                log = NotificationLog.objects.create(
+                        status = 'skipped'
+
+                logs.append(NotificationLog(
                     event_name=event_name,
                     channel=channel,
                     recipient=recipient_contact,
                     subject=subject,
                     body=body_text or body_html,
                     payload=payload,
-                    status='queued',
-                )
+                    status=status,
+                ))
+
+        NotificationCenter._enqueue(logs, subject, body_text, body_html, payload)
 
-                # enqueue Celery task routing to 'notifications' queue
-                from . import tasks
-                tasks.send_notification_task.apply_async(
-                    args=[log.id, channel, subject, body_text or '', body_html or '', payload],
+    @staticmethod
+    def _enqueue(logs, subject, body_text, body_html, payload):
+        """
+        Write log rows in bulk and enqueue one delivery task per
+        (channel, chunk of DELIVERY_CHUNK_SIZE recipients). Each chunk is tagged
+        with its own batch_id so the task can find its rows without relying on
+        bulk_create returning primary keys (it does not on MySQL).
+        """
+        chunks = []
+        by_channel = {}
+        for log in logs:
+            if log.status == 'queued':
+                by_channel.setdefault(log.channel, []).append(log)
+        for channel, queued in by_channel.items():
+            for i in range(0, len(queued), DELIVERY_CHUNK_SIZE):
+                batch_id = uuid.uuid4()
+                for log in queued[i:i + DELIVERY_CHUNK_SIZE]:
+                    log.batch_id = batch_id
+                chunks.append((batch_id, channel))
+
+        NotificationLog.objects.bulk_create(logs, batch_size=DELIVERY_CHUNK_SIZE)
+
+        from . import tasks
+
+        def send():
+            for batch_id, channel in chunks:
+                tasks.send_notification_batch_task.apply_async(
+                    args=[str(batch_id), channel, subject, body_text or '', body_html or '', payload],
                     queue='notifications'
                 )
 
+        # Do not let workers look for rows before they are committed
+        transaction.on_commit(send)
+
     @staticmethod
     def _render_template(template_obj: EmailTemplateMaster, payload: dict):
         """Render HTML (and text fallback) using Django template engine."""
         ctx = Context(payload)
-        subj_template = Template(template_obj.subject or '')
-        html_template = Template(template_obj.body_html or '')
-        text_template = Template(template_obj.body_text or '')
+        subj_template, html_template, text_template = compiled_template(template_obj)
 
         subject = subj_template.render(ctx)
         body_html = html_template.render(ctx)
@@ -116,34 +161,15 @@ class NotificationCenter:
     def _resolve_recipients(resolver_key: str, payload: dict):
         """Resolve recipient User instances or simple dicts based on payload IDs.
 
-        Supported resolver keys (Phase 2 minimal set):
+        Supported resolver keys (see apps.notifications.recipients):
             - 'employee' -> payload['employee_id']
             - 'approver' -> payload['approver_id']
             - 'booking_agent' -> payload['booking_agent_id']
             - 'desk_agent' -> payload['desk_agent_id']
             - 'default_resolver' -> payload['recipients'] (list of ids or contacts)
+            - 'travel_desk', 'chro', 'ceo', 'admin', 'role:<Role name>' -> every active member of the role
         """
-        users = []
-        try:
-            if resolver_key == 'employee' and payload.get('employee_id'):
-                users = list(User.objects.filter(id=payload.get('employee_id')))
-            elif resolver_key == 'approver' and payload.get('approver_id'):
-                users = list(User.objects.filter(id=payload.get('approver_id')))
-            elif resolver_key == 'booking_agent' and payload.get('booking_agent_id'):
-                users = list(User.objects.filter(id=payload.get('booking_agent_id')))
-            elif resolver_key == 'desk_agent' and payload.get('desk_agent_id'):
-                users = list(User.objects.filter(id=payload.get('desk_agent_id')))
-            elif resolver_key == 'default_resolver':
-                # payload['recipients'] can be list of user ids, or list of contact dicts
-                recs = payload.get('recipients', [])
-                ids = [r for r in recs if isinstance(r, int)]
-                users = list(User.objects.filter(id__in=ids))
-                # also keep non-user dicts
-                others = [r for r in recs if isinstance(r, dict)]
-                users.extend(others)
-        except Exception as e:
-            logger.exception("Error resolving recipients for %s: %s", resolver_key, e)
-        return users
+        return recipients_resolver.resolve(resolver_key, payload)
 
     @staticmethod
     def _get_contact_for_channel(recipient, channel):
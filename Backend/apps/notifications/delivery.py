@@ -0,0 +1,119 @@
+"""
+Batch delivery of queued NotificationLog rows.
+
+A delivery run:
+  1. claims up to `limit` queued rows (select_for_update(skip_locked) in a
+     short transaction, then status -> 'sending'), so concurrent workers and
+     the periodic drain never send the same row twice;
+  2. sends them through the worker's shared provider (one reused SMTP
+     connection or SendGrid client per worker process);
+  3. records every outcome with a single bulk_update.
+"""
+
+import logging
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import Q
+from django.template import Context
+from django.utils import timezone
+
+from .models import NotificationLog
+from .providers import get_worker_provider
+
+logger = logging.getLogger(__name__)
+
+# Rows left 'sending' this long after being claimed (worker died mid-batch) are queued again
+STALE_SENDING_AFTER = timedelta(minutes=15)
+
+OUTCOME_FIELDS = ['status', 'attempts', 'last_error', 'sent_at']
+
+
+def claim_logs(queryset, limit):
+    """Atomically move up to limit (None: all) queued rows of queryset to 'sending' and return them."""
+    with transaction.atomic():
+        queryset = queryset.filter(status='queued').select_for_update(skip_locked=True).order_by('id')
+        logs = list(queryset[:limit] if limit else queryset)
+        if logs:
+            NotificationLog.objects.filter(id__in=[log.id for log in logs]).update(
+                status='sending', claimed_at=timezone.now()
+            )
+    return logs
+
+
+def requeue_stale_sending():
+    """
+    Put rows stuck in 'sending' (worker lost mid-batch) back in the queue.
+    Staleness counts from the claim, not from creation: a backlog row claimed
+    a moment ago is still being sent.
+    """
+    cutoff = timezone.now() - STALE_SENDING_AFTER
+    return NotificationLog.objects.filter(
+        # claimed_at is empty on rows claimed before it was recorded
+        Q(claimed_at__lt=cutoff) | Q(claimed_at__isnull=True, created_at__lt=cutoff),
+        status='sending',
+    ).update(status='queued')
+
+
+def _render_from_rule(log):
+    """(subject, body_text, body_html) re-rendered from the rule's template, or the stored log text."""
+    from .rules import get_rule, compiled_template
+
+    rule = get_rule(log.event_name)
+    if rule and rule.template:
+        ctx = Context(log.payload or {})
+        subject, html, text = (t.render(ctx) for t in compiled_template(rule.template))
+        return subject, text or log.body or '', html
+    return log.subject or '', log.body or '', ''
+
+
+def deliver_one(log, channel, subject, body_text, body_html, payload, provider=None):
+    """Send a single message on channel. Raises on failure."""
+    if channel == 'email':
+        provider = provider or get_worker_provider()
+        to_emails = [log.recipient] if isinstance(log.recipient, str) else log.recipient
+        provider.send(subject=subject, body_text=body_text, body_html=body_html, to_emails=to_emails)
+    elif channel == 'in_app':
+        # create an in-app notification record or push through websocket
+        from .in_app import create_in_app_notification
+        create_in_app_notification(payload=payload, recipient=log.recipient, title=subject, body=body_text)
+    else:
+        # SMS / other channels placeholder
+        logger.warning('Channel %s not implemented yet', channel)
+
+
+def deliver_logs(logs, rendered=None):
+    """
+    Send claimed logs and record outcomes in bulk.
+    rendered: (subject, body_text, body_html) shared by every log (a NotificationCenter
+    chunk); when omitted each log is rendered from its rule (memoized per event/payload).
+    Returns the list of logs that failed.
+    """
+    provider = get_worker_provider()
+    memo = {}
+    failed = []
+    now = timezone.now()
+
+    for log in logs:
+        if rendered is not None:
+            subject, body_text, body_html = rendered
+        else:
+            key = (log.event_name, repr(log.payload))
+            if key not in memo:
+                memo[key] = _render_from_rule(log)
+            subject, body_text, body_html = memo[key]
+
+        log.attempts += 1
+        try:
+            deliver_one(log, log.channel, subject, body_text, body_html, log.payload, provider=provider)
+            log.status = 'sent'
+            log.sent_at = now
+        except Exception as exc:
+            logger.exception('Failed to send notification log=%s', log.id)
+            log.status = 'failed'
+            log.last_error = str(exc)
+            failed.append(log)
+
+    NotificationLog.objects.bulk_update(logs, OUTCOME_FIELDS, batch_size=500)
+    logger.info('Delivered %s notifications (%s failed)', len(logs) - len(failed), len(failed))
+    return failed
@@ -80,7 +80,8 @@ class NotificationRule(models.Model):
     template = models.ForeignKey(EmailTemplateMaster, null=True, blank=True, on_delete=models.SET_NULL)
     channels = models.JSONField(default=list, blank=True) # e.g. ['email','in_app']
 
-    # 'resolver' is string key like 'employee', 'approver', 'booking_agent', interpreted by NotificationCenter
+    # 'resolver' is string key like 'employee', 'approver', 'booking_agent', 'travel_desk' or 'role:<name>',
+    # interpreted by apps.notifications.recipients
     recipient_resolver = models.CharField(max_length=100, default='default_resolver')
     is_active = models.BooleanField(default=True)
 
@@ -103,6 +104,7 @@ class NotificationLog(models.Model):
     """
     STATUS_CHOICES = [
         ('queued', 'Queued'),
+        ('sending', 'Sending'),
         ('sent', 'Sent'),
         ('failed', 'Failed'),
         ('skipped', 'Skipped'),
@@ -118,9 +120,13 @@ class NotificationLog(models.Model):
     payload = models.JSONField(default=dict, blank=True)
 
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='queued')
+    # delivery chunk this row was enqueued with (see NotificationCenter._enqueue)
+    batch_id = models.UUIDField(null=True, blank=True, db_index=True)
     attempts = models.IntegerField(default=0)
     last_error = models.TextField(null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
+    # when a delivery run moved the row to 'sending' (see delivery.claim_logs)
+    claimed_at = models.DateTimeField(null=True, blank=True)
     sent_at = models.DateTimeField(null=True, blank=True)
 
     class Meta:
@@ -1,4 +1,7 @@
 import logging
+import os
+import smtplib
+import time
 from django.core.mail import EmailMultiAlternatives, get_connection
 from django.conf import settings
 
@@ -9,10 +12,63 @@ class BaseEmailProvider:
     def send(self, subject, body_text, body_html, to_emails, cc=None, bcc=None, attachments=None):
         raise NotImplementedError
 
+    def close(self):
+        """Release any held connection (no-op by default)."""
+
 
 class SMTPEmailProvider(BaseEmailProvider):
+    """
+    persistent=False: a fresh connection per message (previous behaviour).
+    persistent=True : one connection is opened lazily and reused for many
+    messages; it is recycled after NOTIFICATION_SMTP_MAX_MESSAGES messages or
+    NOTIFICATION_SMTP_MAX_AGE seconds, and re-opened once if the server
+    dropped it.
+    """
+
+    def __init__(self, persistent=False):
+        self.persistent = persistent
+        self._connection = None
+        self._opened_at = 0
+        self._sent = 0
+
+    def _get_connection(self):
+        if not self.persistent:
+            return get_connection()  # respects settings.EMAIL_BACKEND
+
+        max_messages = getattr(settings, 'NOTIFICATION_SMTP_MAX_MESSAGES', 200)
+        max_age = getattr(settings, 'NOTIFICATION_SMTP_MAX_AGE', 240)
+        if self._connection is not None and (
+            self._sent >= max_messages or time.monotonic() - self._opened_at > max_age
+        ):
+            self.close()
+        if self._connection is None:
+            self._connection = get_connection()
+            self._connection.open()
+            self._opened_at = time.monotonic()
+            self._sent = 0
+        return self._connection
+
+    def close(self):
+        if self._connection is not None:
+            try:
+                self._connection.close()
+            except Exception as e:
+                logger.debug('Error closing SMTP connection: %s', e)
+            self._connection = None
+
     def send(self, subject, body_text, body_html, to_emails, cc=None, bcc=None, attachments=None):
-        connection = get_connection()  # respects settings.EMAIL_BACKEND
+        try:
+            self._send(subject, body_text, body_html, to_emails, cc, bcc, attachments)
+        except (smtplib.SMTPServerDisconnected, ConnectionError):
+            if not self.persistent:
+                raise
+            # The server dropped the idle connection: reconnect once and retry
+            self.close()
+            self._send(subject, body_text, body_html, to_emails, cc, bcc, attachments)
+        self._sent += 1
+
+    def _send(self, subject, body_text, body_html, to_emails, cc, bcc, attachments):
+        connection = self._get_connection()
         email = EmailMultiAlternatives(
             subject=subject,
             body=body_text or '',
@@ -56,9 +112,25 @@ except Exception:
     SendGridProvider = None
 
 
-def EmailProviderFactory():
+def EmailProviderFactory(persistent=False):
     provider_name = getattr(settings, 'NOTIFICATION_EMAIL_PROVIDER', 'smtp').lower()
     if provider_name == 'sendgrid' and SendGridProvider:
         api_key = getattr(settings, 'SENDGRID_API_KEY', None)
         return SendGridProvider(api_key)
-    return SMTPEmailProvider()
+    return SMTPEmailProvider(persistent=persistent)
+
+
+_worker_provider = None
+_worker_pid = None
+
+
+def get_worker_provider():
+    """
+    Email provider shared by every delivery task in this worker process: one
+    reused SMTP connection, or one SendGrid client. Re-created after a fork.
+    """
+    global _worker_provider, _worker_pid
+    if _worker_provider is None or _worker_pid != os.getpid():
+        _worker_provider = EmailProviderFactory(persistent=True)
+        _worker_pid = os.getpid()
+    return _worker_provider
@@ -0,0 +1,142 @@
+"""
+Recipient resolution for NotificationCenter.
+
+Resolving is done in two steps so the cost does not grow with the number of
+recipients or resolver keys:
+  1. every (resolver_key, payload) of an event - or of a batch of events - is
+     turned into user ids (and raw contact dicts) without touching the
+     database: payload ids are read directly, role resolvers ("all Travel
+     Desk users") come from a cached role-membership index;
+  2. all user ids are fetched with one query, together with the user's
+     notification preferences when that relation exists.
+
+The role-membership index is a VersionedSnapshot invalidated on UserRole /
+Role changes (apps.notifications.signals).
+"""
+
+import logging
+
+from django.core.exceptions import FieldDoesNotExist
+
+from apps.authentication.models import User, UserRole
+from utils.versioned_cache import VersionedSnapshot
+
+logger = logging.getLogger(__name__)
+
+# resolver key -> payload key holding a single user id
+PAYLOAD_RESOLVERS = {
+    'employee': 'employee_id',
+    'approver': 'approver_id',
+    'booking_agent': 'booking_agent_id',
+    'desk_agent': 'desk_agent_id',
+}
+
+# resolver key -> role name, resolved to every active member of the role.
+# Any role can also be addressed as 'role:<Role name>'.
+ROLE_RESOLVERS = {
+    'travel_desk': 'Travel Desk',
+    'chro': 'CHRO',
+    'ceo': 'CEO',
+    'admin': 'Admin',
+}
+ROLE_PREFIX = 'role:'
+
+# User -> preferences one-to-one, loaded with select_related when installed
+PREFERENCES_RELATION = 'notification_preferences'
+
+
+def _load_role_members():
+    members = {}
+    rows = (
+        UserRole.objects.filter(is_active=True, role__is_active=True)
+        .order_by('user_id')
+        .values_list('role__name', 'user_id')
+    )
+    for role_name, user_id in rows:
+        members.setdefault(role_name.casefold(), []).append(user_id)
+    return {name: tuple(ids) for name, ids in members.items()}
+
+
+role_members = VersionedSnapshot("notification_role_members", _load_role_members)
+
+
+def _role_name(resolver_key):
+    if resolver_key in ROLE_RESOLVERS:
+        return ROLE_RESOLVERS[resolver_key]
+    if resolver_key and resolver_key.startswith(ROLE_PREFIX):
+        return resolver_key[len(ROLE_PREFIX):]
+    return None
+
+
+def collect(resolver_key, payload):
+    """
+    (user_ids, contacts, role_based) for one resolver key, without queries.
+    contacts are raw contact dicts from payload['recipients'].
+    """
+    if resolver_key in PAYLOAD_RESOLVERS:
+        user_id = payload.get(PAYLOAD_RESOLVERS[resolver_key])
+        return ([user_id] if user_id else []), [], False
+
+    if resolver_key == 'default_resolver':
+        # payload['recipients'] can be list of user ids, or list of contact dicts
+        recs = payload.get('recipients', [])
+        ids = [r for r in recs if isinstance(r, int)]
+        others = [r for r in recs if isinstance(r, dict)]
+        return ids, others, False
+
+    role_name = _role_name(resolver_key)
+    if role_name:
+        return list(role_members.get().get(role_name.casefold(), ())), [], True
+
+    logger.warning("Unknown recipient resolver: %s", resolver_key)
+    return [], [], False
+
+
+def _user_queryset():
+    users = User.objects.all()
+    try:
+        User._meta.get_field(PREFERENCES_RELATION)
+    except FieldDoesNotExist:
+        return users
+    return users.select_related(PREFERENCES_RELATION)
+
+
+def resolve_many(requests):
+    """
+    Resolve [(resolver_key, payload), ...] to one recipient list per request
+    (User instances followed by contact dicts), with a single user query.
+    Role resolvers only yield active users.
+    """
+    collected = []
+    all_ids = set()
+    for resolver_key, payload in requests:
+        try:
+            ids, contacts, role_based = collect(resolver_key, payload or {})
+        except Exception as e:
+            logger.exception("Error resolving recipients for %s: %s", resolver_key, e)
+            ids, contacts, role_based = [], [], False
+        collected.append((ids, contacts, role_based))
+        all_ids.update(ids)
+
+    users = {}
+    if all_ids:
+        users = _user_queryset().in_bulk(all_ids)
+
+    results = []
+    for ids, contacts, role_based in collected:
+        recipients = []
+        seen = set()
+        for user_id in ids:
+            user = users.get(user_id)
+            if user is None or user_id in seen or (role_based and not user.is_active):
+                continue
+            seen.add(user_id)
+            recipients.append(user)
+        recipients.extend(contacts)
+        results.append(recipients)
+    return results
+
+
+def resolve(resolver_key, payload):
+    """Recipient list (User instances and contact dicts) for one resolver key."""
+    return resolve_many([(resolver_key, payload)])[0]
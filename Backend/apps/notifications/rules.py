@@ -0,0 +1,70 @@
+"""
+Notification rule and template caches used by NotificationCenter.
+
+- Active NotificationRules (with their template) are held per process in a
+  VersionedSnapshot keyed by event_name, so notify() does not query for the
+  rule. Saving or deleting a rule or template invalidates it
+  (apps.notifications.signals).
+- Compiled django Template objects are cached per process, keyed by
+  (template id, updated_at): an edited template gets a new key and is
+  recompiled on first use, without any explicit invalidation.
+"""
+
+import logging
+import threading
+from collections import OrderedDict
+
+from django.template import Template
+
+from utils.versioned_cache import VersionedSnapshot
+
+logger = logging.getLogger(__name__)
+
+# Upper bound on compiled template triples kept per process
+COMPILED_TEMPLATE_LIMIT = 256
+
+
+def _load_rules():
+    from .models import NotificationRule
+
+    return {
+        rule.event_name: rule
+        for rule in NotificationRule.objects.filter(is_active=True).select_related('template')
+    }
+
+
+notification_rules = VersionedSnapshot("notification_rules", _load_rules)
+
+
+def get_rule(event_name):
+    """Active NotificationRule for event_name (template preloaded), or None."""
+    return notification_rules.get().get(event_name)
+
+
+_compiled = OrderedDict()
+_compiled_lock = threading.Lock()
+
+
+def compiled_template(template_obj):
+    """
+    (subject, body_html, body_text) compiled Template objects for an
+    EmailTemplateMaster, compiled once per (id, updated_at).
+    """
+    key = (template_obj.pk, template_obj.updated_at)
+    with _compiled_lock:
+        compiled = _compiled.get(key)
+        if compiled is not None:
+            _compiled.move_to_end(key)
+            return compiled
+
+    compiled = (
+        Template(template_obj.subject or ''),
+        Template(template_obj.body_html or ''),
+        Template(template_obj.body_text or ''),
+    )
+    with _compiled_lock:
+        _compiled[key] = compiled
+        while len(_compiled) > COMPILED_TEMPLATE_LIMIT:
+            _compiled.popitem(last=False)
+    logger.debug("Compiled notification template %s", template_obj.pk)
+    return compiled
@@ -0,0 +1,23 @@
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from apps.authentication.models import Role, UserRole
+
+from .models import NotificationRule, EmailTemplateMaster
+from .recipients import role_members
+from .rules import notification_rules
+
+
+@receiver([post_save, post_delete], sender=NotificationRule)
+@receiver([post_save, post_delete], sender=EmailTemplateMaster)
+def invalidate_notification_rules(sender, **kwargs):
+    """Reload the rule cache (rules hold their template) once the change is committed."""
+    transaction.on_commit(notification_rules.invalidate)
+
+
+@receiver([post_save, post_delete], sender=UserRole)
+@receiver([post_save, post_delete], sender=Role)
+def invalidate_role_members(sender, **kwargs):
+    """Role membership changed: rebuild the role resolver index after commit."""
+    transaction.on_commit(role_members.invalidate)
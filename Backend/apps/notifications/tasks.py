@@ -1,12 +1,8 @@
 from celery import shared_task
 from django.utils import timezone
-from travel.models import TravelApplication
 from .models import NotificationLog, NotificationEvent
-from .providers import EmailProviderFactory
 from .center import NotificationCenter
-from django_celery_beat.models import ClockedSchedule, PeriodicTask
-from django.utils import timezone
-import json
+from .delivery import claim_logs, deliver_logs, deliver_one, requeue_stale_sending
 import datetime
 import logging
 
@@ -21,18 +17,7 @@ def send_notification_task(self, log_id, channel, subject, body_text, body_html,
         return
 
     try:
-        if channel == 'email':
-            provider = EmailProviderFactory()
-            to_emails = [log.recipient] if isinstance(log.recipient, str) else log.recipient
-            provider.send(subject=subject, body_text=body_text, body_html=body_html, to_emails=to_emails)
-        elif channel == 'in_app':
-            # create an in-app notification record or push through websocket
-            from .in_app import create_in_app_notification
-            create_in_app_notification(payload=payload, recipient=log.recipient, title=subject, body=body_text)
-        else:
-            # SMS / other channels placeholder
-            logger.warning('Channel %s not implemented yet', channel)
-
+        deliver_one(log, channel, subject, body_text, body_html, payload)
         log.mark_sent()
         logger.info('Notification sent log=%s', log.id)
     except Exception as exc:
@@ -45,52 +30,45 @@ def send_notification_task(self, log_id, channel, subject, body_text, body_html,
 
 
 @shared_task
-def mark_travel_as_completed(travel_id):
-    try:
-        travel = TravelApplication.objects.get(id=travel_id)
+def send_notification_batch_task(batch_id, channel, subject, body_text, body_html, payload):
+    """
+    Deliver every queued log of one NotificationCenter chunk (same event, channel
+    and rendered message) over the worker's shared connection. Failed messages
+    are handed to send_notification_task so they get its retry schedule.
+    """
+    logs = claim_logs(NotificationLog.objects.filter(batch_id=batch_id), limit=None)
+    failed = deliver_logs(logs, rendered=(subject, body_text, body_html))
 
-        # if already completed or cancelled, do nothing
-        if travel.status in ["Completed", "Cancelled"]:
-            return
+    for log in failed:
+        send_notification_task.apply_async(
+            args=[log.id, channel, subject, body_text, body_html, payload],
+            queue='notifications',
+            countdown=60
+        )
 
-        # ensure end date has passed
-        if timezone.now().date() >= travel.end_date:
-            travel.status = "Completed"
-            travel.is_claimable = True  # Assuming such a field exists
-            travel.save()
 
-            # optionally trigger settlement reminder here
-            from notifications.center import NotificationCenter
-            NotificationCenter.notify(
-                "travel.settlement.reminder",
-                {"type": "TravelRequest", "id": travel.id},
-                {
-                    "employee_id": travel.employee.id,
-                    "employee_name": travel.employee.get_full_name(),
-                    "request_id": travel.get_travel_request_id(),
-                    "settlement_due_date": travel.get_settlement_due_date()
-                }
-            )
-    except TravelApplication.DoesNotExist:
-        pass
+# Queued rows younger than this are left to their own batch task
+DRAIN_GRACE_PERIOD = datetime.timedelta(minutes=2)
 
 
-def schedule_travel_completion(travel_app):
-    # When to run the job? End date at midnight or immediately after.
-    run_datetime = timezone.make_aware(
-        datetime.datetime.combine(travel_app.end_date, datetime.time(hour=1))
-    )
+@shared_task
+def deliver_queued_notifications(batch_size=500, max_batches=20):
+    """
+    Periodic drain: deliver queued NotificationLog rows whose batch task never
+    ran (broker loss, enqueue outside a transaction, rows queued by other code),
+    batch_size rows at a time over one reused connection.
+    """
+    requeued = requeue_stale_sending()
+    if requeued:
+        logger.warning('Re-queued %s notifications stuck in sending', requeued)
 
-    # Create clocked schedule
-    clocked, _ = ClockedSchedule.objects.get_or_create(
-        clocked_time=run_datetime
-    )
+    pending = NotificationLog.objects.filter(created_at__lt=timezone.now() - DRAIN_GRACE_PERIOD)
+    delivered = failed = 0
+    for _ in range(max_batches):
+        logs = claim_logs(pending, limit=batch_size)
+        if not logs:
+            break
+        failed += len(deliver_logs(logs))
+        delivered += len(logs)
 
-    # Create one-off task
-    PeriodicTask.objects.create(
-        name=f"travel_complete_{travel_app.id}",
-        task="notifications.tasks.mark_travel_as_completed",
-        one_off=True,
-        clocked=clocked,
-        args=json.dumps([travel_app.id])
-    )
\ No newline at end of file
+    return {'processed': delivered, 'failed': failed}
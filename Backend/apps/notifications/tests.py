@@ -1,3 +1,30 @@
+from datetime import timedelta
+
 from django.test import TestCase
+from django.utils import timezone
+
+from apps.notifications.delivery import claim_logs, requeue_stale_sending
+from apps.notifications.models import NotificationLog
+
+
+class RequeueStaleSendingTestCase(TestCase):
+
+    def _log(self, age):
+        log = NotificationLog.objects.create(event_name="travel.submitted", channel="email", recipient="a@x.org")
+        NotificationLog.objects.filter(pk=log.pk).update(created_at=timezone.now() - age)
+        return log
+
+    def test_old_row_claimed_just_now_is_not_requeued(self):
+        log = self._log(timedelta(hours=2))
+        claim_logs(NotificationLog.objects.filter(pk=log.pk), limit=None)
+
+        self.assertEqual(requeue_stale_sending(), 0)
+        self.assertEqual(NotificationLog.objects.get(pk=log.pk).status, 'sending')
+
+    def test_row_claimed_long_ago_is_requeued(self):
+        log = self._log(timedelta(hours=2))
+        claim_logs(NotificationLog.objects.filter(pk=log.pk), limit=None)
+        NotificationLog.objects.filter(pk=log.pk).update(claimed_at=timezone.now() - timedelta(minutes=20))
 
-# Create your tests here.
+        self.assertEqual(requeue_stale_sending(), 1)
+        self.assertEqual(NotificationLog.objects.get(pk=log.pk).status, 'queued')
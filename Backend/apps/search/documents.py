@@ -0,0 +1,163 @@
+"""
+Search documents
+
+A document builder turns records of one kind into {object_id: {token: weight}}
+with a few values() queries, whatever the number of records. The tokens are
+what apps.search.index stores as SearchTerm rows and matches by prefix.
+
+Kinds:
+  travel_application  request id, employee, purpose, IO / sanction, trip cities
+  booking             request id, employee, references, mode, cities, vendor details
+  guest_house         name, vendor / registration codes, contacts, address, city
+"""
+
+import re
+
+TOKEN_RE = re.compile(r"[^\W_]+")
+MAX_TOKEN_LENGTH = 64
+
+# Field weights
+REFERENCE = 3
+NAME = 2
+TEXT = 1
+
+
+def tokenize(text):
+    """Lower-cased word tokens of text (letters / digits, any script)."""
+    if text is None or text == "":
+        return []
+    return [t[:MAX_TOKEN_LENGTH] for t in TOKEN_RE.findall(str(text).casefold())]
+
+
+class _Document:
+    def __init__(self):
+        self.terms = {}
+
+    def add(self, text, weight=TEXT):
+        for token in tokenize(text):
+            if self.terms.get(token, 0) < weight:
+                self.terms[token] = weight
+
+    def add_reference(self, reference, weight=REFERENCE):
+        """A reference like TSF-TR-2026-000012: its parts plus the joined form."""
+        if not reference:
+            return
+        self.add(reference, weight)
+        self.add("".join(tokenize(reference)), weight)
+
+    def add_request_id(self, application_id, created_at):
+        from apps.travel.exports import travel_request_id
+
+        self.add_reference(travel_request_id(application_id, created_at))
+        self.add(application_id, REFERENCE)
+
+
+def _strings(value):
+    """Every string inside a JSON value (vendor names in booking_details etc.)."""
+    if isinstance(value, str):
+        yield value
+    elif isinstance(value, dict):
+        for item in value.values():
+            yield from _strings(item)
+    elif isinstance(value, (list, tuple)):
+        for item in value:
+            yield from _strings(item)
+
+
+def build_travel_applications(ids):
+    from apps.travel.models import TravelApplication, TripDetails
+
+    documents = {}
+    rows = TravelApplication.objects.filter(id__in=ids).values(
+        "id", "created_at", "purpose", "internal_order", "sanction_number",
+        "employee__username", "employee__first_name", "employee__last_name",
+        "employee__organizational_profile__employee_id",
+    )
+    for row in rows:
+        doc = documents[row["id"]] = _Document()
+        doc.add_request_id(row["id"], row["created_at"])
+        doc.add(row["employee__first_name"], NAME)
+        doc.add(row["employee__last_name"], NAME)
+        doc.add(row["employee__username"], NAME)
+        doc.add(row["employee__organizational_profile__employee_id"], REFERENCE)
+        doc.add(row["internal_order"], REFERENCE)
+        doc.add(row["sanction_number"], REFERENCE)
+        doc.add(row["purpose"])
+
+    trips = TripDetails.objects.filter(travel_application_id__in=documents).values_list(
+        "travel_application_id", "from_location__city_name", "to_location__city_name",
+    )
+    for application_id, from_city, to_city in trips:
+        documents[application_id].add(from_city)
+        documents[application_id].add(to_city)
+
+    return {pk: doc.terms for pk, doc in documents.items()}
+
+
+def build_bookings(ids):
+    from apps.travel.models import Booking
+
+    documents = {}
+    rows = Booking.objects.filter(id__in=ids).values(
+        "id", "booking_reference", "vendor_reference", "booking_details",
+        "booking_type__name", "sub_option__name",
+        "trip_details__travel_application_id", "trip_details__travel_application__created_at",
+        "trip_details__travel_application__employee__username",
+        "trip_details__travel_application__employee__first_name",
+        "trip_details__travel_application__employee__last_name",
+        "trip_details__from_location__city_name", "trip_details__to_location__city_name",
+    )
+    for row in rows:
+        doc = documents[row["id"]] = _Document()
+        doc.add_request_id(
+            row["trip_details__travel_application_id"],
+            row["trip_details__travel_application__created_at"],
+        )
+        doc.add_reference(row["booking_reference"])
+        doc.add_reference(row["vendor_reference"])
+        doc.add(row["trip_details__travel_application__employee__first_name"], NAME)
+        doc.add(row["trip_details__travel_application__employee__last_name"], NAME)
+        doc.add(row["trip_details__travel_application__employee__username"], NAME)
+        doc.add(row["booking_type__name"])
+        doc.add(row["sub_option__name"])
+        doc.add(row["trip_details__from_location__city_name"])
+        doc.add(row["trip_details__to_location__city_name"])
+        for text in _strings(row["booking_details"]):
+            doc.add(text)
+
+    return {pk: doc.terms for pk, doc in documents.items()}
+
+
+def build_guest_houses(ids):
+    from apps.master_data.models import GuestHouseMaster
+
+    documents = {}
+    rows = GuestHouseMaster.objects.filter(id__in=ids).values(
+        "id", "name", "gstin", "vendor_code", "registration_number",
+        "contact_person", "phone_number", "email", "address", "district", "pin_code",
+        "city__city_name", "state__state_name", "country__country_name",
+    )
+    for row in rows:
+        doc = documents[row["id"]] = _Document()
+        doc.add(row["name"], REFERENCE)
+        doc.add_reference(row["vendor_code"])
+        doc.add_reference(row["gstin"])
+        doc.add_reference(row["registration_number"])
+        doc.add(row["contact_person"], NAME)
+        doc.add(row["phone_number"], NAME)
+        doc.add(row["email"], NAME)
+        doc.add(row["pin_code"], NAME)
+        doc.add(row["city__city_name"], NAME)
+        doc.add(row["address"])
+        doc.add(row["district"])
+        doc.add(row["state__state_name"])
+        doc.add(row["country__country_name"])
+
+    return {pk: doc.terms for pk, doc in documents.items()}
+
+
+BUILDERS = {
+    "travel_application": build_travel_applications,
+    "booking": build_bookings,
+    "guest_house": build_guest_houses,
+}
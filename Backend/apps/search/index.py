@@ -0,0 +1,176 @@
+"""
+Search index API
+
+- search(kind, text): ranked object ids of kind matching every word of text
+  as a prefix (AND semantics). A record's score sums, per query word, the
+  weight of its best matching token, doubled for whole-word matches; ties go
+  to the newest record.
+- filter_by_search(queryset, kind, text): the queryset restricted to (and by
+  default ordered by) the ranked matches inside it. List views use it
+  instead of icontains chains whenever a search term is supplied.
+- schedule_reindex / reindex / remove keep SearchTerm in step with the
+  source tables (see apps.search.signals); rebuild() repopulates a kind.
+"""
+
+import logging
+import threading
+from functools import reduce
+from operator import add, or_
+
+from django.apps import apps
+from django.db import transaction
+from django.db.models import Case, F, IntegerField, Max, Q, Value, When
+
+from .documents import BUILDERS, tokenize
+from .models import SearchTerm
+
+logger = logging.getLogger(__name__)
+
+# Matches returned per ranked search (list views page within these)
+SEARCH_RESULT_LIMIT = 1000
+MAX_QUERY_TOKENS = 8
+REINDEX_BATCH_SIZE = 500
+
+KIND_MODELS = {
+    "travel_application": "travel.TravelApplication",
+    "booking": "travel.Booking",
+    "guest_house": "master_data.GuestHouseMaster",
+}
+
+
+def query_tokens(text):
+    tokens = []
+    for token in tokenize(text):
+        if token not in tokens:
+            tokens.append(token)
+    return tokens[:MAX_QUERY_TOKENS]
+
+
+def _matches(kind, tokens, within=None):
+    """object_id / score rows of kind matching every token (within: queryset of the kind's model)."""
+    prefix = {f"p{i}": Max(Case(
+        When(token__istartswith=t, then="weight"), default=Value(0), output_field=IntegerField(),
+    )) for i, t in enumerate(tokens)}
+    exact = {f"e{i}": Max(Case(
+        When(token=t, then="weight"), default=Value(0), output_field=IntegerField(),
+    )) for i, t in enumerate(tokens)}
+
+    terms = SearchTerm.objects.filter(kind=kind)
+    if within is not None:
+        terms = terms.filter(object_id__in=within.order_by().values("pk"))
+    matches = (
+        terms.filter(reduce(or_, (Q(token__istartswith=t) for t in tokens)))
+        .values("object_id")
+        .annotate(**prefix, **exact)
+        .filter(**{f"{name}__gt": 0 for name in prefix})
+    )
+    # Whole-word matches count twice: best prefix weight + best exact weight
+    return matches.annotate(score=reduce(add, (F(name) for name in (*prefix, *exact))))
+
+
+def search(kind, text, limit=SEARCH_RESULT_LIMIT, within=None):
+    """
+    Ranked object ids of kind matching text, or None when text has no words.
+    within (a queryset of the kind's model) restricts the candidates before
+    the top limit are taken.
+    """
+    tokens = query_tokens(text)
+    if not tokens:
+        return None
+    return list(
+        _matches(kind, tokens, within)
+        .order_by("-score", "-object_id")
+        .values_list("object_id", flat=True)[:limit]
+    )
+
+
+def filter_by_search(queryset, kind, text, rank=True):
+    """
+    queryset limited to the search matches of text. Ranked, the best
+    SEARCH_RESULT_LIMIT matches inside queryset are kept in rank order;
+    unranked, every match is kept (one subquery, no limit).
+    """
+    if not rank:
+        tokens = query_tokens(text)
+        if not tokens:
+            return queryset
+        return queryset.filter(pk__in=_matches(kind, tokens).values("object_id"))
+
+    ids = search(kind, text, limit=SEARCH_RESULT_LIMIT, within=queryset)
+    if ids is None:
+        return queryset
+    queryset = queryset.filter(pk__in=ids)
+    if ids:
+        queryset = queryset.order_by(Case(
+            *(When(pk=pk, then=Value(position)) for position, pk in enumerate(ids)),
+            output_field=IntegerField(),
+        ))
+    return queryset
+
+
+def reindex(kind, ids):
+    """Rewrite the terms of records ids of kind (records that no longer exist are dropped)."""
+    ids = list(ids)
+    documents = BUILDERS[kind](ids)
+    terms = [
+        SearchTerm(kind=kind, object_id=object_id, token=token, weight=weight)
+        for object_id, tokens in documents.items()
+        for token, weight in tokens.items()
+    ]
+    with transaction.atomic():
+        SearchTerm.objects.filter(kind=kind, object_id__in=ids).delete()
+        SearchTerm.objects.bulk_create(terms, batch_size=1000)
+    return len(documents)
+
+
+def remove(kind, ids):
+    SearchTerm.objects.filter(kind=kind, object_id__in=list(ids)).delete()
+
+
+_pending = threading.local()
+
+
+def _pending_keys():
+    if not hasattr(_pending, "keys"):
+        _pending.keys = set()
+    return _pending.keys
+
+
+def _flush():
+    keys = _pending_keys()
+    if not keys:
+        return
+    by_kind = {}
+    for kind, object_id in keys:
+        by_kind.setdefault(kind, []).append(object_id)
+    keys.clear()
+    for kind, ids in by_kind.items():
+        try:
+            reindex(kind, ids)
+        except Exception:
+            logger.exception("Search reindex failed for %s %s", kind, ids)
+
+
+def schedule_reindex(kind, *object_ids):
+    """
+    Reindex records once the current transaction commits. Records touched
+    several times in one transaction are reindexed once: every call registers
+    a flush (a rolled-back transaction discards its callbacks, not the keys,
+    so the next commit in this thread still covers them) and the first flush
+    to run takes all pending keys.
+    """
+    keys = {(kind, object_id) for object_id in object_ids if object_id}
+    if keys:
+        _pending_keys().update(keys)
+        transaction.on_commit(_flush)
+
+
+def rebuild(kind, batch_size=REINDEX_BATCH_SIZE):
+    """Reindex every record of kind; returns the number of records indexed."""
+    model = apps.get_model(KIND_MODELS[kind])
+    SearchTerm.objects.filter(kind=kind).delete()
+    ids = list(model.objects.order_by("pk").values_list("pk", flat=True))
+    indexed = 0
+    for i in range(0, len(ids), batch_size):
+        indexed += reindex(kind, ids[i:i + batch_size])
+    return indexed
@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand, CommandError
+from apps.search.index import KIND_MODELS, REINDEX_BATCH_SIZE, rebuild
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the search index (all kinds, or those given)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('kinds', nargs='*', help=f"Kinds to rebuild: {', '.join(KIND_MODELS)}")
+        parser.add_argument('--batch-size', type=int, default=REINDEX_BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        unknown = set(options['kinds']) - set(KIND_MODELS)
+        if unknown:
+            raise CommandError(f"Unknown kinds: {', '.join(sorted(unknown))}")
+        for kind in options['kinds'] or KIND_MODELS:
+            indexed = rebuild(kind, batch_size=options['batch_size'])
+            self.stdout.write(self.style.SUCCESS(f'{kind}: {indexed} records indexed'))
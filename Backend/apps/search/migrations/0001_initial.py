@@ -0,0 +1,28 @@
+# Generated by Django 5.2.6 on 2026-10-17 00:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchTerm',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(max_length=30)),
+                ('object_id', models.PositiveBigIntegerField()),
+                ('token', models.CharField(max_length=64)),
+                ('weight', models.PositiveSmallIntegerField(default=1)),
+            ],
+            options={
+                'db_table': 'search_terms',
+                'indexes': [models.Index(fields=['kind', 'token'], name='search_term_kind_token'), models.Index(fields=['kind', 'object_id'], name='search_term_kind_object')],
+            },
+        ),
+    ]
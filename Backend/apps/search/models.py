@@ -0,0 +1,28 @@
+from django.db import models
+
+
+class SearchTerm(models.Model):
+    """
+    One token of a searchable record (an inverted-index posting).
+
+    Every indexed record (kind, object_id) owns the terms produced by its
+    document builder in apps.search.documents; they are rewritten whenever
+    the record changes (apps.search.signals). Searches are prefix lookups on
+    (kind, token), which a B-tree index answers without scanning the
+    source tables.
+    """
+    kind = models.CharField(max_length=30)
+    object_id = models.PositiveBigIntegerField()
+    token = models.CharField(max_length=64)
+    # field weight: request ids / references rank above free text
+    weight = models.PositiveSmallIntegerField(default=1)
+
+    class Meta:
+        db_table = 'search_terms'
+        indexes = [
+            models.Index(fields=['kind', 'token'], name='search_term_kind_token'),
+            models.Index(fields=['kind', 'object_id'], name='search_term_kind_object'),
+        ]
+
+    def __str__(self):
+        return f"{self.kind}:{self.object_id} {self.token}"
@@ -0,0 +1,91 @@
+"""
+Keep the search index in step with the source tables. Besides the indexed
+records themselves, changes to values copied into their documents reindex the
+records that carry them: employee names / employee id (User,
+OrganizationalProfile) and city names (CityMaster). State and country names
+on guest houses are only refreshed by rebuild_search_index.
+"""
+
+from django.db.models import Q
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from apps.authentication.models import OrganizationalProfile, User
+from apps.master_data.models import CityMaster, GuestHouseMaster
+from apps.travel.models import Booking, TravelApplication, TripDetails
+
+from .index import schedule_reindex
+
+
+def _application_bookings(application_id):
+    return Booking.objects.filter(
+        trip_details__travel_application_id=application_id
+    ).values_list("id", flat=True)
+
+
+@receiver([post_save, post_delete], sender=TravelApplication)
+def index_travel_application(sender, instance, **kwargs):
+    """Application documents also feed its bookings (request id, employee)."""
+    schedule_reindex("travel_application", instance.pk)
+    if not kwargs.get("created"):
+        schedule_reindex("booking", *_application_bookings(instance.pk))
+
+
+@receiver([post_save, post_delete], sender=TripDetails)
+def index_trip(sender, instance, **kwargs):
+    """Trip cities are indexed on the application and on the trip's bookings."""
+    schedule_reindex("travel_application", instance.travel_application_id)
+    if not kwargs.get("created"):
+        schedule_reindex("booking", *instance.bookings.values_list("id", flat=True))
+
+
+@receiver([post_save, post_delete], sender=Booking)
+def index_booking(sender, instance, **kwargs):
+    schedule_reindex("booking", instance.pk)
+
+
+@receiver([post_save, post_delete], sender=GuestHouseMaster)
+def index_guest_house(sender, instance, **kwargs):
+    schedule_reindex("guest_house", instance.pk)
+
+
+def _touches(kwargs, fields):
+    """False for saves that cannot have changed fields (new rows, other update_fields)."""
+    if kwargs.get("created"):
+        return False
+    update_fields = kwargs.get("update_fields")
+    return update_fields is None or not fields.isdisjoint(update_fields)
+
+
+@receiver(post_save, sender=User)
+def index_employee(sender, instance, **kwargs):
+    """Employee names appear on their applications and bookings (not on login's last_login save)."""
+    if not _touches(kwargs, {"first_name", "last_name", "username"}):
+        return
+    schedule_reindex("travel_application", *TravelApplication.objects.filter(
+        employee_id=instance.pk
+    ).values_list("id", flat=True))
+    schedule_reindex("booking", *Booking.objects.filter(
+        trip_details__travel_application__employee_id=instance.pk
+    ).values_list("id", flat=True))
+
+
+@receiver(post_save, sender=OrganizationalProfile)
+def index_employee_profile(sender, instance, **kwargs):
+    if not _touches(kwargs, {"employee_id"}):
+        return
+    schedule_reindex("travel_application", *TravelApplication.objects.filter(
+        employee_id=instance.user_id
+    ).values_list("id", flat=True))
+
+
+@receiver(post_save, sender=CityMaster)
+def index_city(sender, instance, **kwargs):
+    """City names appear on the applications and bookings travelling there and on its guest houses."""
+    if not _touches(kwargs, {"city_name"}):
+        return
+    trips = TripDetails.objects.filter(Q(from_location=instance) | Q(to_location=instance))
+    schedule_reindex("travel_application", *trips.values_list("travel_application_id", flat=True).distinct())
+    schedule_reindex("booking", *Booking.objects.filter(trip_details__in=trips).values_list("id", flat=True))
+    schedule_reindex("guest_house", *GuestHouseMaster.objects.filter(city=instance).values_list("id", flat=True))
+
@@ -0,0 +1,71 @@
+from unittest import mock
+
+from django.db import transaction
+from django.test import TestCase
+
+from apps.authentication.models import User
+from apps.master_data.models import GLCodeMaster
+from apps.search.index import filter_by_search, search
+from apps.travel.models import TravelApplication
+
+
+class SearchIndexTestCase(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.gl = GLCodeMaster.objects.create(vertical_name="V", sorting_no=1, gl_code="GL1")
+        cls.employee = User.objects.create_user(username="employee", password="x")
+        cls.other = User.objects.create_user(username="other", password="x")
+
+    def _application(self, employee, purpose):
+        with self.captureOnCommitCallbacks(execute=True):
+            return TravelApplication.objects.create(
+                employee=employee, purpose=purpose, internal_order="IO", general_ledger=self.gl,
+            )
+
+    def test_ranked_limit_applies_within_the_queryset(self):
+        own = self._application(self.employee, "Plant audit")
+        self._application(self.other, "Plant audit")
+        self._application(self.other, "Plant audit")
+
+        own_list = TravelApplication.objects.filter(employee=self.employee)
+
+        with mock.patch("apps.search.index.SEARCH_RESULT_LIMIT", 1):
+            ranked = filter_by_search(own_list, "travel_application", "plant")
+        unranked = filter_by_search(own_list, "travel_application", "plant", rank=False)
+
+        self.assertEqual(list(ranked), [own])
+        self.assertEqual(list(unranked), [own])
+
+    def test_record_saved_again_after_rollback_is_reindexed(self):
+        app = self._application(self.employee, "Plant audit")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            try:
+                with transaction.atomic():
+                    app.purpose = "Zanzibar"
+                    app.save()
+                    raise RuntimeError
+            except RuntimeError:
+                pass
+            app.save()
+
+        self.assertEqual(search("travel_application", "zanzibar"), [app.pk])
+
+    def test_renamed_employee_is_found_under_the_new_name(self):
+        app = self._application(self.employee, "Plant audit")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.employee.first_name = "Zubin"
+            self.employee.save()
+
+        self.assertEqual(search("travel_application", "zubin"), [app.pk])
+
+    def test_login_save_does_not_reindex(self):
+        self._application(self.employee, "Plant audit")
+
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.employee.save(update_fields=["last_login"])
+
+        self.assertEqual(callbacks, [])
+
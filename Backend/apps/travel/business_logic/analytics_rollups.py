@@ -0,0 +1,206 @@
+"""
+Travel analytics rollups
+
+Maintains the daily rollup tables in apps.travel.models.analytics so that
+TravelAnalyticsView never scans TravelApplication / TripDetails /
+TravelApprovalFlow directly.
+
+Incremental refresh:
+- The watermark records when the last refresh started.
+- Applications with updated_at >= watermark (minus a small overlap for late
+  commits) identify the creation days whose status / department / destination
+  rollups are stale; approvals with approved_at >= watermark identify the
+  latency days that are stale.
+- Each stale day is recomputed in full (delete + bulk_create), so the result is
+  identical to a full rebuild for those days.
+"""
+
+import logging
+from collections import defaultdict
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+WATERMARK_NAME = "travel_rollups"
+WATERMARK_OVERLAP = timedelta(minutes=5)
+DAY_CHUNK = 31
+LOCK_KEY = "analytics:travel_rollups:lock"
+DIRTY_DAYS_KEY = "analytics:travel_rollups:dirty_days"
+LOCK_TIMEOUT = 60 * 30
+
+# Upper bounds (hours) of the approval latency histogram; beyond the last is overflow (None)
+LATENCY_BUCKETS_HOURS = [1, 4, 8, 24, 48, 72, 168]
+
+
+def latency_bucket(seconds):
+    hours = seconds / 3600
+    for bound in LATENCY_BUCKETS_HOURS:
+        if hours <= bound:
+            return bound
+    return None
+
+
+def _chunks(days):
+    days = sorted(days)
+    for i in range(0, len(days), DAY_CHUNK):
+        yield days[i:i + DAY_CHUNK]
+
+
+def _refresh_application_days(days):
+    """Recompute status, department and destination rollups for the given creation days."""
+    from apps.travel.models import (
+        TravelApplication, TripDetails,
+        TravelStatusDailyRollup, TravelDepartmentDailyRollup, TravelDestinationDailyRollup,
+    )
+
+    for chunk in _chunks(days):
+        apps = (TravelApplication.objects
+                .filter(created_at__date__in=chunk)
+                .annotate(day=TruncDate('created_at')))
+
+        status_rows = [
+            TravelStatusDailyRollup(
+                day=row['day'], status=row['status'],
+                application_count=row['count'],
+                estimated_cost_total=row['total_cost'] or Decimal('0'),
+            )
+            for row in apps.values('day', 'status').annotate(
+                count=Count('id'), total_cost=Sum('estimated_total_cost'))
+        ]
+
+        department_rows = [
+            TravelDepartmentDailyRollup(
+                day=row['day'], department_id=row['employee__department'], status=row['status'],
+                application_count=row['count'],
+                estimated_cost_total=row['total_cost'] or Decimal('0'),
+            )
+            for row in apps.values('day', 'employee__department', 'status').annotate(
+                count=Count('id'), total_cost=Sum('estimated_total_cost'))
+        ]
+
+        destination_rows = [
+            TravelDestinationDailyRollup(
+                day=row['day'], city_id=row['to_location'], trip_count=row['count'],
+            )
+            for row in (TripDetails.objects
+                        .filter(travel_application__created_at__date__in=chunk)
+                        .annotate(day=TruncDate('travel_application__created_at'))
+                        .values('day', 'to_location')
+                        .annotate(count=Count('id')))
+        ]
+
+        with transaction.atomic():
+            TravelStatusDailyRollup.objects.filter(day__in=chunk).delete()
+            TravelDepartmentDailyRollup.objects.filter(day__in=chunk).delete()
+            TravelDestinationDailyRollup.objects.filter(day__in=chunk).delete()
+            TravelStatusDailyRollup.objects.bulk_create(status_rows)
+            TravelDepartmentDailyRollup.objects.bulk_create(department_rows)
+            TravelDestinationDailyRollup.objects.bulk_create(destination_rows)
+
+
+def _refresh_latency_days(days):
+    """Recompute the approval latency histogram for the given approval days."""
+    from apps.travel.models import TravelApprovalFlow, ApprovalLatencyDailyRollup
+
+    for chunk in _chunks(days):
+        histogram = defaultdict(lambda: [0, 0])
+        flows = (TravelApprovalFlow.objects
+                 .filter(status='approved', approved_at__date__in=chunk)
+                 .values_list('approved_at', 'created_at'))
+        for approved_at, created_at in flows.iterator(chunk_size=2000):
+            seconds = max(int((approved_at - created_at).total_seconds()), 0)
+            cell = histogram[(approved_at.date(), latency_bucket(seconds))]
+            cell[0] += 1
+            cell[1] += seconds
+
+        rows = [
+            ApprovalLatencyDailyRollup(day=day, bucket_hours=bucket,
+                                       approval_count=count, total_seconds=total)
+            for (day, bucket), (count, total) in histogram.items()
+        ]
+
+        with transaction.atomic():
+            ApprovalLatencyDailyRollup.objects.filter(day__in=chunk).delete()
+            ApprovalLatencyDailyRollup.objects.bulk_create(rows)
+
+
+def _distinct_days(queryset, field):
+    return set(
+        queryset.annotate(rollup_day=TruncDate(field))
+        .values_list('rollup_day', flat=True)
+        .distinct()
+    )
+
+
+def mark_day_dirty(day):
+    """
+    Queue a creation day for recomputation. Used for deletions, which leave no
+    updated_at behind for the watermark query to find.
+    """
+    try:
+        days = set(cache.get(DIRTY_DAYS_KEY) or ())
+        days.add(day.isoformat())
+        cache.set(DIRTY_DAYS_KEY, sorted(days), None)
+    except Exception as e:
+        logger.debug("Could not queue rollup day %s: %s", day, e)
+
+
+def _pop_dirty_days():
+    try:
+        days = cache.get(DIRTY_DAYS_KEY) or []
+        cache.delete(DIRTY_DAYS_KEY)
+    except Exception as e:
+        logger.debug("Could not read queued rollup days: %s", e)
+        return set()
+    return {date.fromisoformat(d) for d in days}
+
+
+def refresh_travel_rollups(full=False):
+    """
+    Bring the rollup tables up to date.
+    full=True (or no watermark yet) recomputes every day that has data.
+    Returns a summary dict.
+    """
+    from apps.travel.models import TravelApplication, TravelApprovalFlow, AnalyticsWatermark
+
+    if not cache.add(LOCK_KEY, 1, LOCK_TIMEOUT):
+        logger.info("Travel rollup refresh already running; skipping")
+        return {"skipped": True}
+
+    try:
+        started_at = timezone.now()
+        watermark = AnalyticsWatermark.objects.filter(name=WATERMARK_NAME).first()
+        apps = TravelApplication.objects.all()
+        approvals = TravelApprovalFlow.objects.filter(approved_at__isnull=False)
+
+        if not full and watermark:
+            since = watermark.value - WATERMARK_OVERLAP
+            apps = apps.filter(updated_at__gte=since)
+            approvals = approvals.filter(approved_at__gte=since)
+
+        application_days = _distinct_days(apps, 'created_at') | _pop_dirty_days()
+        latency_days = _distinct_days(approvals, 'approved_at')
+
+        _refresh_application_days(application_days)
+        _refresh_latency_days(latency_days)
+
+        AnalyticsWatermark.objects.update_or_create(
+            name=WATERMARK_NAME, defaults={'value': started_at}
+        )
+
+        summary = {
+            "full": full or watermark is None,
+            "application_days": len(application_days),
+            "latency_days": len(latency_days),
+        }
+        logger.info("Travel rollups refreshed: %s", summary)
+        return summary
+    finally:
+        cache.delete(LOCK_KEY)
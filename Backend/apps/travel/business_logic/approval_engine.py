@@ -1,6 +1,7 @@
 from apps.master_data.models import ApprovalMatrix
 from apps.authentication.models import User
 from ..models import TravelApprovalFlow
+from .approver_inbox import record_flows_created, record_flows_deleted
 from django.db import transaction
 import logging
 
@@ -34,7 +35,9 @@ class ApprovalEngine:
         try:
             with transaction.atomic():
                 # Clear any existing approval flows
+                previous_flows = list(self.travel_application.approval_flows.all())
                 self.travel_application.approval_flows.all().delete()
+                record_flows_deleted(previous_flows)
                 
                 # Generate approval chain
                 approval_chain = self.generate_approval_chain()
@@ -46,6 +49,7 @@ class ApprovalEngine:
                 
                 # Create approval flow records
                 created_flows = self.create_approval_flows(approval_chain)
+                record_flows_created(created_flows)
 
                 """ # Set current approver and status
                 if approval_chain:
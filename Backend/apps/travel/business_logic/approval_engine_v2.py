@@ -9,6 +9,8 @@ Purpose:
 Output:
 - build() -> list of ApproverEntry objects with attributes:
     .user, .level, .sequence, .is_required, .can_view, .can_approve
+- ApprovalEngineV2.build_many(applications) -> {application_id: [ApproverEntry, ...]}
+  evaluates many applications against one shared EngineSnapshot.
 
 Notes:
 - Does NOT auto-approve when approver == requester.
@@ -19,7 +21,6 @@ import logging
 from decimal import Decimal
 from django.utils import timezone
 from django.db import models
-from django.utils import timezone
 
 logger = logging.getLogger(__name__)
 
@@ -43,6 +44,43 @@ class ApproverEntry:
             "can_approve": self.can_approve
         }
 
+class EngineSnapshot:
+    """
+    Read-only data shared by every engine in a build_many() run.
+      - policies   : active, currently effective TravelPolicyMaster rows
+      - role_users : {role_name_lower: first active user holding that role}
+      - user_roles : {user_id: set(role_name_lower)} for the submitting users
+    """
+    LOOKUP_ROLES = ("Manager", "CHRO", "CEO")
+
+    def __init__(self, policies, role_users, user_roles):
+        self.policies = policies
+        self.role_users = role_users
+        self.user_roles = user_roles
+
+    @classmethod
+    def load(cls, user_ids):
+        from apps.authentication.models import UserRole
+        from apps.travel.business_logic.policy_index import effective_policies
+
+        policies = effective_policies().matching_type()
+
+        role_q = models.Q()
+        for name in cls.LOOKUP_ROLES:
+            role_q |= models.Q(role__name__iexact=name)
+        role_users = {}
+        for ur in (UserRole.objects.filter(role_q, is_active=True)
+                   .select_related("role", "user").order_by("-is_primary")):
+            role_users.setdefault(ur.role.name.lower(), ur.user)
+
+        user_roles = {}
+        for user_id, role_name in (UserRole.objects.filter(user_id__in=user_ids, is_active=True)
+                                   .values_list("user_id", "role__name")):
+            user_roles.setdefault(user_id, set()).add(role_name.lower())
+
+        return cls(policies, role_users, user_roles)
+
+
 class ApprovalEngineV2:
     """
     ApprovalEngineV2
@@ -50,15 +88,17 @@ class ApprovalEngineV2:
       - travel_app : TravelApplication instance
       - request_user: User instance who is submitting (for role checks)
       - config (optional): dict to override default thresholds if needed
+      - snapshot (optional): EngineSnapshot shared across a build_many() run
     """
     DEFAULTS = {
         "flight_amount_threshold": Decimal("10000"),  # TSF fallback if TravelPolicyMaster not present
         "own_car_distance_km": 150,                   # TSF fallback
     }
 
-    def __init__(self, travel_app, request_user, config=None):
+    def __init__(self, travel_app, request_user, config=None, snapshot=None):
         self.travel_application = travel_app
         self.request_user = request_user
+        self.snapshot = snapshot
         self.config = self.DEFAULTS.copy()
         if config:
             self.config.update(config)
@@ -107,6 +147,8 @@ class ApprovalEngineV2:
         - Else fallback to UserRole join if available.
         Case-insensitive match on role name.
         """
+        if self.snapshot is not None and getattr(user, "id", None) is not None:
+            return role_name.lower() in self.snapshot.user_roles.get(user.id, ())
         try:
             if hasattr(user, "roles"):
                 # roles might be list or a Django related manager
@@ -192,6 +234,8 @@ class ApprovalEngineV2:
           1. UserRole join (preferred)
           2. Role-based fallback (if some other mapping exists)
         """
+        if self.snapshot is not None:
+            return self.snapshot.role_users.get(role_name.lower())
         try:
             if self.UserRole and self.Role:
                 role = self.Role.objects.filter(name__iexact=role_name).first()
@@ -215,16 +259,14 @@ class ApprovalEngineV2:
         Returns list/queryset of active TravelPolicyMaster rules (if model present).
         If policy_type provided, filter by it.
         """
+        if self.snapshot is not None:
+            return [p for p in self.snapshot.policies
+                    if not policy_type or policy_type.lower() in (p.policy_type or "").lower()]
         if not self.TravelPolicyMaster:
             return []
         try:
-            qs = self.TravelPolicyMaster.objects.filter(is_active=True)
-            today = timezone.now().date()
-            qs = qs.filter(effective_from__lte=today).filter(models.Q(effective_to__isnull=True) | models.Q(effective_to__gte=today))
-            if policy_type:
-                # qs = qs.filter(policy_type=policy_type)
-                qs = qs.filter(policy_type__icontains=policy_type)
-            return list(qs)
+            from apps.travel.business_logic.policy_index import effective_policies
+            return effective_policies().matching_type(policy_type)
         except Exception as e:
             logger.debug("Error fetching TravelPolicyMaster: %s", e)
             return []
@@ -367,111 +409,50 @@ class ApprovalEngineV2:
     # ---------------------------
     # Matrix-based checks (if available)
     # ---------------------------
-    def matrix_requires_chro(self, bookings):
+    def _matrix_flags(self, bookings):
         """
-        Check if ApprovalMatrix requires CHRO for any booking
+        Evaluate CEO and CHRO matrix rules for the whole booking list in one pass
+        against the compiled ApprovalMatrixIndex (no queries on a warm index).
+        Result is memoised for the booking list object (kept referenced and
+        compared by identity) so both checks share one pass.
+        Returns dict or None if the matrix is unavailable.
         """
         if not self.ApprovalMatrix:
             return None
-        
+
+        cached = getattr(self, "_matrix_flags_cache", None)
+        if cached and cached[0] is bookings:
+            return cached[1]
+
         try:
-            
-            for b in bookings:
-                try:
-                    mode = getattr(b.booking_type, "id", None)
-                    amt = getattr(b, "estimated_cost", None)
-                    
-                    if amt is None or mode is None:
-                        continue
-                    
-                    amt_decimal = Decimal(amt)
-                    
-                    rows = self.ApprovalMatrix.objects.filter(
-                        is_active=True,
-                        travel_mode=mode
-                    )
-                    
-                    grade = getattr(self.travel_application.employee, "grade", None)
-                    if grade:
-                        rows = rows.filter(employee_grade=grade)
-                    
-                    for r in rows:
-                        min_a = r.min_amount or Decimal("0")
-                        max_a = r.max_amount or None
-                        
-                        in_range = amt_decimal >= min_a
-                        if max_a is not None:
-                            in_range = in_range and amt_decimal <= max_a
-                        
-                        if in_range and getattr(r, "requires_chro", False):
-                            logger.info("ApprovalMatrix rule %s triggered: CHRO required for booking %s amount %s", getattr(r, "id", None), getattr(b, "id", None), amt)
-                            return True
-                            
-                except Exception:
-                    continue
-            
-            return False
-            
+            from apps.travel.business_logic.approval_matrix_index import approval_matrix_index
+            grade_id = getattr(self.travel_application.employee, "grade_id", None)
+            flags = approval_matrix_index.get().evaluate(bookings, grade_id)
         except Exception as e:
-            logger.debug("matrix_requires_chro error: %s", e)
+            logger.debug("ApprovalMatrix index error: %s", e)
+            flags = None
+
+        self._matrix_flags_cache = (bookings, flags)
+        return flags
+
+    def matrix_requires_chro(self, bookings):
+        """
+        Check if ApprovalMatrix requires CHRO for any booking
+        """
+        flags = self._matrix_flags(bookings)
+        if flags is None:
             return None
-        
+        return flags["requires_chro"]
+
     def matrix_requires_ceo_for_amount(self, bookings):
         """
         If ApprovalMatrix indicates CEO required for booking amounts,
         check against min_amount and max_amount ranges.
         """
-        if not self.ApprovalMatrix:
-            return None
-        
-        try:
-            
-            for b in bookings:
-                try:
-                    mode = getattr(b.booking_type, "id", None)
-                    amt = getattr(b, "estimated_cost", None)
-                    
-                    if amt is None or mode is None:
-                        continue
-                    
-                    amt_decimal = Decimal(amt)
-                    
-                    # Find matching matrix rows
-                    rows = self.ApprovalMatrix.objects.filter(
-                        is_active=True,
-                        travel_mode=mode
-                    )
-                    
-                    # Filter by grade if available
-                    grade = getattr(self.travel_application.employee, "grade", None)
-                    if grade:
-                        rows = rows.filter(employee_grade=grade)
-                    
-                    # Check amount ranges
-                    for r in rows:
-                        min_a = r.min_amount or Decimal("0")
-                        max_a = r.max_amount or None
-                        
-                        # Check if amount falls in range
-                        in_range = amt_decimal >= min_a
-                        if max_a is not None:
-                            in_range = in_range and amt_decimal <= max_a
-                        
-                        if in_range:
-                            # Check if this rule requires CEO
-                            if getattr(r, "requires_ceo", False):
-                                logger.info(f"ApprovalMatrix rule {r.id} triggered: CEO required for {b.booking_type.name} amount {amt}")
-                                return True
-                            
-                except Exception as e:
-                    logger.debug(f"Error checking booking against matrix: {e}")
-                    continue
-            
-            return False
-        
-        except Exception as e:
-            logger.debug("matrix_requires_ceo_for_amount error: %s", e)
+        flags = self._matrix_flags(bookings)
+        if flags is None:
             return None
+        return flags["requires_ceo"]
 
     # ---------------------------
     # Merge/dedupe/order helpers
@@ -790,6 +771,42 @@ class ApprovalEngineV2:
 
         return final
 
+    @classmethod
+    def build_many(cls, applications, config=None):
+        """
+        Evaluate many TravelApplications against one shared snapshot.
+
+        Trips -> bookings -> booking_type, employee grade / reporting manager,
+        UserRole and effective TravelPolicyMaster rows are each loaded once,
+        so the query count does not grow with the number of applications.
+        The submitting user is taken to be each application's employee.
+
+        Returns: {application_id: [ApproverEntry, ...]}
+        """
+        from django.db.models import Prefetch
+        from apps.travel.models import TravelApplication, Booking
+
+        ids = [getattr(a, "id", a) for a in applications]
+        apps = list(
+            TravelApplication.objects.filter(id__in=ids)
+            .select_related("employee__grade", "employee__organizational_profile__reporting_manager")
+            .prefetch_related(Prefetch(
+                "trip_details__bookings",
+                queryset=Booking.objects.select_related("booking_type"),
+            ))
+        )
+
+        snapshot = EngineSnapshot.load({a.employee_id for a in apps})
+
+        results = {}
+        for travel_app in apps:
+            engine = cls(travel_app, travel_app.employee, config=config, snapshot=snapshot)
+            try:
+                results[travel_app.id] = engine.build()
+            except Exception as e:
+                logger.exception("ApprovalEngineV2.build_many failed for travel_app %s: %s", travel_app.id, e)
+                results[travel_app.id] = []
+        return results
     
     '''
     def build(self):
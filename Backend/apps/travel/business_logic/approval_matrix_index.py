@@ -0,0 +1,125 @@
+"""
+ApprovalMatrixIndex
+
+Compiled, in-memory view of the active ApprovalMatrix rows.
+
+- Rows are grouped by (travel_mode_id, employee_grade_id), plus a
+  (travel_mode_id, None) bucket holding every grade for the mode (used when
+  the employee has no grade, mirroring the old queryset behaviour).
+- Each bucket keeps its rows sorted by min_amount, together with a running
+  maximum of the upper bound for the CEO and CHRO flags. "Does any rule
+  covering this amount require CEO?" is then a bisect plus one comparison.
+- Built once per process via VersionedSnapshot and invalidated from the
+  post_save / post_delete receivers in apps.travel.signals.
+"""
+
+import logging
+from bisect import bisect_right
+from decimal import Decimal, InvalidOperation
+
+from utils.versioned_cache import VersionedSnapshot
+
+logger = logging.getLogger(__name__)
+
+UNBOUNDED = Decimal("Infinity")
+
+
+class _AmountIntervals:
+    """Sorted amount intervals for one (mode, grade) bucket."""
+
+    FLAGS = ("requires_ceo", "requires_chro")
+
+    def __init__(self, rows):
+        # rows: iterable of (min_amount, max_amount, rule_id, flags_dict)
+        rows = sorted(rows, key=lambda r: r[0])
+        self.mins = [r[0] for r in rows]
+        # prefix[flag][i] = (highest upper bound among rows[0..i] carrying flag, rule id)
+        self.prefix = {}
+        for flag in self.FLAGS:
+            best = (Decimal("-Infinity"), None)
+            running = []
+            for min_a, max_a, rule_id, flags in rows:
+                if flags.get(flag) and max_a > best[0]:
+                    best = (max_a, rule_id)
+                running.append(best)
+            self.prefix[flag] = running
+
+    def match(self, flag, amount):
+        """Return the id of a rule with `flag` whose interval contains amount, else None."""
+        k = bisect_right(self.mins, amount)
+        if k == 0:
+            return None
+        upper, rule_id = self.prefix[flag][k - 1]
+        return rule_id if upper >= amount else None
+
+
+class ApprovalMatrixIndex:
+    """
+    Answers CEO / CHRO matrix questions for a whole booking list with zero queries.
+    """
+
+    def __init__(self, rows):
+        buckets = {}
+        for row in rows:
+            min_a = row["min_amount"] or Decimal("0")
+            # max_amount of None (or 0) means "no upper limit"
+            max_a = row["max_amount"] or UNBOUNDED
+            entry = (min_a, max_a, row["id"], {
+                "requires_ceo": row["requires_ceo"],
+                "requires_chro": row["requires_chro"],
+            })
+            mode_id = row["travel_mode_id"]
+            buckets.setdefault((mode_id, row["employee_grade_id"]), []).append(entry)
+            buckets.setdefault((mode_id, None), []).append(entry)
+
+        self._buckets = {key: _AmountIntervals(entries) for key, entries in buckets.items()}
+
+    @classmethod
+    def build(cls):
+        from apps.master_data.models import ApprovalMatrix
+
+        rows = ApprovalMatrix.objects.filter(is_active=True).values(
+            "id", "travel_mode_id", "employee_grade_id",
+            "min_amount", "max_amount", "requires_ceo", "requires_chro",
+        )
+        return cls(list(rows))
+
+    def evaluate(self, bookings, grade_id=None):
+        """
+        Single pass over bookings.
+        Returns {"requires_ceo": bool, "requires_chro": bool}.
+        """
+        result = {"requires_ceo": False, "requires_chro": False}
+
+        for b in bookings:
+            mode_id = getattr(b, "booking_type_id", None)
+            amt = getattr(b, "estimated_cost", None)
+            if amt is None or mode_id is None:
+                continue
+            try:
+                amt_decimal = Decimal(str(amt))
+            except (InvalidOperation, ValueError):
+                continue
+
+            intervals = self._buckets.get((mode_id, grade_id or None))
+            if intervals is None:
+                continue
+
+            for flag in _AmountIntervals.FLAGS:
+                if result[flag]:
+                    continue
+                rule_id = intervals.match(flag, amt_decimal)
+                if rule_id is not None:
+                    logger.info(
+                        "ApprovalMatrix rule %s triggered: %s for booking %s amount %s",
+                        rule_id, flag, getattr(b, "id", None), amt,
+                    )
+                    result[flag] = True
+
+            if all(result.values()):
+                break
+
+        return result
+
+
+approval_matrix_index = VersionedSnapshot("approval_matrix", ApprovalMatrixIndex.build)
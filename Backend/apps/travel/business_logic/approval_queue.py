@@ -0,0 +1,78 @@
+"""
+Approval queue read model
+
+Builds the querysets behind the approver queues (ManagerApprovalsView,
+ManagerPendingApprovalsView, CHRO / CEO pending views) so that
+ManagerApprovalListSerializer renders a page in a fixed number of queries,
+whatever the page size:
+
+  1. the applications, with employee grade / department joined;
+  2. the caller's pending approval flows (Prefetch -> PENDING_FLOWS_ATTR);
+  3. the trips, with from / to locations joined (Prefetch).
+
+Queue membership is an Exists() on the caller's flows instead of a join +
+DISTINCT, so rows are not duplicated and no de-duplication pass is needed.
+"""
+
+from django.db.models import Exists, OuterRef, Prefetch
+
+# Attribute holding the caller's pending flows, read by ManagerApprovalListSerializer
+PENDING_FLOWS_ATTR = 'caller_pending_flows'
+
+QUEUE_STATUSES = ('pending', 'approved', 'rejected')
+
+
+def trips_prefetch():
+    """trip_details with both locations pre-joined."""
+    from apps.travel.models import TripDetails
+
+    return Prefetch(
+        'trip_details',
+        queryset=TripDetails.objects.select_related('from_location', 'to_location'),
+    )
+
+
+def pending_flows_prefetch(user):
+    """The user's pending approval flows on each application, in creation order."""
+    from apps.travel.models import TravelApprovalFlow
+
+    return Prefetch(
+        'approval_flows',
+        queryset=TravelApprovalFlow.objects.filter(approver=user, status='pending').order_by('id'),
+        to_attr=PENDING_FLOWS_ATTR,
+    )
+
+
+def with_queue_relations(queryset, user):
+    """Attach everything ManagerApprovalListSerializer reads for user."""
+    return queryset.select_related(
+        'employee__grade', 'employee__department'
+    ).prefetch_related(
+        pending_flows_prefetch(user), trips_prefetch()
+    )
+
+
+def approver_queue(user, flow_status='pending'):
+    """
+    Applications on which user has an approving flow, optionally restricted to
+    flows of user in flow_status ('pending', 'approved', 'rejected'; 'all' or
+    None for no restriction). Newest submission first.
+    """
+    from apps.travel.models import TravelApplication, TravelApprovalFlow
+
+    flows = TravelApprovalFlow.objects.filter(
+        travel_application=OuterRef('pk'), approver=user, can_approve=True
+    )
+    if flow_status in QUEUE_STATUSES:
+        flows = flows.filter(status=flow_status)
+
+    queryset = TravelApplication.objects.filter(Exists(flows))
+    return with_queue_relations(queryset, user).order_by('-submitted_at')
+
+
+def status_queue(user, application_status):
+    """Applications in application_status (e.g. 'pending_chro'), newest submission first."""
+    from apps.travel.models import TravelApplication
+
+    queryset = TravelApplication.objects.filter(status=application_status)
+    return with_queue_relations(queryset, user).order_by('-submitted_at')
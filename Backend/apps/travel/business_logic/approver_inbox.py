@@ -0,0 +1,225 @@
+"""
+Approver inbox counters
+
+ApproverInboxStats holds, per approver, everything the approval dashboards
+show (pending / actionable / budget, decision totals, today / this month,
+average approval time), so a dashboard load is one primary-key read whatever
+the approver's history.
+
+The counters move with the flows, inside the same transaction:
+  - record_flows_created: flows created by the submit pipeline / approval engine
+  - record_decision: TravelApprovalFlow.approve / reject
+  - record_flows_deleted: flows discarded when a chain is rebuilt
+  - record_flows_reassigned: pending flows handed to another approver
+    (approval delegation)
+each as a single UPDATE of F() deltas. An approver without a row yet (history
+from before the counters existed) is rebuilt from TravelApprovalFlow instead,
+and the reconcile_approver_inbox command rebuilds all rows to repair drift
+(e.g. an application's estimated cost edited while its flows are pending).
+"""
+
+import logging
+from collections import defaultdict
+from datetime import datetime
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import Case, Count, DurationField, F, Q, Sum, Value, When
+from django.utils import timezone
+
+from utils.query_optimizer import bulk_upsert
+
+logger = logging.getLogger(__name__)
+
+TOTAL_FIELDS = (
+    'pending_count', 'actionable_count', 'pending_budget',
+    'approved_count', 'rejected_count', 'approval_seconds',
+)
+WINDOW_FIELDS = {
+    'approved_today': 'day',
+    'approved_this_month': 'month',
+    'decided_this_month': 'month',
+}
+
+
+def _windows():
+    today = timezone.localdate()
+    return today, today.replace(day=1)
+
+
+def _flow_deltas(flow, status, sign=1):
+    """Counter deltas contributed by flow while in status (sign=-1 removes them)."""
+    deltas = defaultdict(int)
+    if status == 'pending':
+        deltas['pending_count'] += sign
+        if flow.can_approve:
+            deltas['actionable_count'] += sign
+        deltas['pending_budget'] += sign * (flow.travel_application.estimated_total_cost or Decimal(0))
+    elif status in ('approved', 'rejected'):
+        deltas[f'{status}_count'] += sign
+        if status == 'approved' and flow.approved_at and flow.created_at:
+            deltas['approval_seconds'] += sign * int((flow.approved_at - flow.created_at).total_seconds())
+
+        today, month = _windows()
+        decided_on = timezone.localdate(flow.approved_at) if flow.approved_at else None
+        if decided_on and decided_on >= month:
+            deltas['decided_this_month'] += sign
+            if status == 'approved':
+                deltas['approved_this_month'] += sign
+                if decided_on == today:
+                    deltas['approved_today'] += sign
+    return deltas
+
+
+def _plus(name, delta):
+    """
+    F(name) + delta, floored at zero. A decrement is only computed when it
+    cannot go negative: the counters are UNSIGNED columns on MySQL, where
+    even an intermediate negative value is an out-of-range error.
+    """
+    zero = Decimal(0) if name == 'pending_budget' else 0
+    if delta >= 0:
+        return F(name) + Value(delta)
+    return Case(
+        When(**{f'{name}__gte': -delta}, then=F(name) - Value(-delta)),
+        default=Value(zero),
+    )
+
+
+def _apply(approver_id, deltas):
+    from apps.travel.models import ApproverInboxStats
+
+    today, month = _windows()
+    window_start = {'day': today, 'month': month}
+    changes = {
+        name: _plus(name, deltas[name])
+        for name in TOTAL_FIELDS if deltas.get(name)
+    }
+    for name, window in WINDOW_FIELDS.items():
+        # A stale window restarts from this change
+        changes[name] = Case(
+            When(**{window: window_start[window]}, then=_plus(name, deltas.get(name, 0))),
+            default=Value(max(deltas.get(name, 0), 0)),
+        )
+    changes.update(window_start)
+    changes['updated_at'] = timezone.now()
+
+    with transaction.atomic():
+        if not ApproverInboxStats.objects.filter(pk=approver_id).update(**changes):
+            # First change for this approver: start from the flows as saved
+            rebuild_inbox_stats([approver_id])
+
+
+def _record(flows_and_deltas):
+    per_approver = defaultdict(lambda: defaultdict(int))
+    for flow, deltas in flows_and_deltas:
+        for name, delta in deltas.items():
+            per_approver[flow.approver_id][name] += delta
+    for approver_id, deltas in per_approver.items():
+        _apply(approver_id, deltas)
+
+
+def record_flows_created(flows):
+    """Count newly saved flows (any status) for their approvers."""
+    _record((flow, _flow_deltas(flow, flow.status)) for flow in flows)
+
+
+def record_flows_deleted(flows):
+    """Uncount flows that have been deleted (pass the instances loaded before deletion)."""
+    _record((flow, _flow_deltas(flow, flow.status, sign=-1)) for flow in flows)
+
+
+def record_flows_reassigned(flows, approver):
+    """
+    Move flows (instances loaded before the reassignment, travel_application
+    loaded) from their approvers to approver.
+    """
+    flows = list(flows)
+    record_flows_deleted(flows)
+    for flow in flows:
+        flow.approver = approver
+    record_flows_created(flows)
+
+
+def record_decision(flow, previous_status):
+    """flow (already saved) moved from previous_status to flow.status."""
+    deltas = _flow_deltas(flow, previous_status, sign=-1)
+    for name, delta in _flow_deltas(flow, flow.status).items():
+        deltas[name] += delta
+    _record([(flow, deltas)])
+
+
+def rebuild_inbox_stats(approver_ids=None):
+    """
+    Recompute the counters of approver_ids (all approvers when None) from
+    TravelApprovalFlow. Returns the number of rows written.
+    """
+    from apps.travel.models import ApproverInboxStats, TravelApprovalFlow
+
+    today, month = _windows()
+    month_start = timezone.make_aware(datetime(month.year, month.month, 1))
+    approved = Q(status='approved')
+    decided = Q(status__in=['approved', 'rejected'])
+    pending = Q(status='pending')
+
+    flows = TravelApprovalFlow.objects.all()
+    if approver_ids is not None:
+        flows = flows.filter(approver_id__in=approver_ids)
+    rows = flows.order_by().values('approver_id').annotate(
+        pending_count=Count('id', filter=pending),
+        actionable_count=Count('id', filter=pending & Q(can_approve=True)),
+        pending_budget=Sum('travel_application__estimated_total_cost', filter=pending),
+        approved_count=Count('id', filter=approved),
+        rejected_count=Count('id', filter=Q(status='rejected')),
+        approval_time=Sum(
+            F('approved_at') - F('created_at'), filter=approved, output_field=DurationField()
+        ),
+        approved_today=Count('id', filter=approved & Q(approved_at__date=today)),
+        approved_this_month=Count('id', filter=approved & Q(approved_at__gte=month_start)),
+        decided_this_month=Count('id', filter=decided & Q(approved_at__gte=month_start)),
+    )
+
+    now = timezone.now()
+    stats = {}
+    for row in rows:
+        approval_time = row.pop('approval_time')
+        row['pending_budget'] = row['pending_budget'] or 0
+        row['approval_seconds'] = int(approval_time.total_seconds()) if approval_time else 0
+        stats[row['approver_id']] = ApproverInboxStats(**row, day=today, month=month, updated_at=now)
+    for approver_id in approver_ids or ():
+        stats.setdefault(approver_id, ApproverInboxStats(approver_id=approver_id, day=today, month=month))
+
+    fields = [*TOTAL_FIELDS, *WINDOW_FIELDS, 'day', 'month', 'updated_at']
+    with transaction.atomic():
+        if approver_ids is None:
+            ApproverInboxStats.objects.exclude(pk__in=list(stats)).delete()
+        bulk_upsert(ApproverInboxStats, list(stats.values()), ['approver'], fields)
+    return len(stats)
+
+
+def get_inbox_stats(user):
+    """The user's counters as a dict (one primary-key read)."""
+    from apps.travel.models import ApproverInboxStats
+
+    stats = ApproverInboxStats.objects.filter(pk=user.pk).first()
+    if stats is None:
+        rebuild_inbox_stats([user.pk])
+        stats = ApproverInboxStats.objects.get(pk=user.pk)
+
+    today, month = _windows()
+    current_day = stats.day == today
+    current_month = stats.month == month
+    return {
+        'pending': stats.pending_count,
+        'actionable': stats.actionable_count,
+        'pending_budget': stats.pending_budget,
+        'approved': stats.approved_count,
+        'rejected': stats.rejected_count,
+        'decided': stats.approved_count + stats.rejected_count,
+        'approved_today': stats.approved_today if current_day else 0,
+        'approved_this_month': stats.approved_this_month if current_month else 0,
+        'decided_this_month': stats.decided_this_month if current_month else 0,
+        'average_approval_hours': (
+            stats.approval_seconds / stats.approved_count / 3600 if stats.approved_count else 0
+        ),
+    }
@@ -0,0 +1,143 @@
+"""
+Booking assignment service
+
+The travel desk hands bookings to booking agents either booking by booking
+(assign_bookings) or a whole application at a time (forward_applications,
+any number of applications to any number of agents in one call). Whatever
+the number of bookings, an assignment run is a fixed handful of statements:
+  - one BookingAssignment upsert (utils.query_optimizer.bulk_upsert),
+  - one UPDATE moving pending bookings to 'requested',
+  - one audit batch (utils.audit, written after commit),
+  - one UPDATE moving the applications to 'booking_in_progress'.
+Reassigning a booking resets its assignment (assigned_at, accepted_at,
+completed_at) exactly as a fresh assignment would.
+"""
+
+from collections import defaultdict
+
+from django.db import transaction
+from django.utils import timezone
+
+from utils.audit import build_entry, record
+from utils.query_optimizer import bulk_upsert
+
+from .dashboard import invalidate_employee_status_counts
+
+# Application statuses that move to booking_in_progress once bookings are assigned
+FORWARDABLE_STATUSES = (
+    "approved_manager",
+    "approved_chro",
+    "approved_ceo",
+    "pending_travel_desk",
+)
+
+ASSIGNMENT_FIELDS = [
+    "assigned_to", "assigned_by", "assignment_scope",
+    "assigned_at", "accepted_at", "completed_at",
+]
+
+
+def _invalidate_dashboards(employee_ids):
+    for employee_id in employee_ids:
+        invalidate_employee_status_counts(employee_id)
+
+
+def _assign(rows, assigned_by, application_ids, extra_audit=()):
+    """
+    rows: (booking_id, application_id, agent, scope) tuples. Writes the
+    assignments, booking statuses and audit rows (plus extra_audit), then
+    moves application_ids still awaiting the desk to booking_in_progress;
+    returns the ids of the applications moved.
+    """
+    from apps.travel.models import Booking, BookingAssignment, TravelApplication
+
+    now = timezone.now()
+
+    assignments = [
+        BookingAssignment(
+            booking_id=booking_id,
+            assigned_to=agent,
+            assigned_by=assigned_by,
+            assignment_scope=scope,
+            assigned_at=now,
+            accepted_at=None,
+            completed_at=None,
+        )
+        for booking_id, _, agent, scope in rows
+    ]
+    audit = [
+        build_entry(assigned_by, "assign_booking", Booking, booking_id, {
+            "booking_id": booking_id,
+            "application_id": application_id,
+            "agent_id": agent.id,
+            "scope": scope,
+        })
+        for booking_id, application_id, agent, scope in rows
+    ]
+
+    with transaction.atomic():
+        bulk_upsert(BookingAssignment, assignments, ["booking"], ASSIGNMENT_FIELDS)
+        Booking.objects.filter(
+            pk__in=[booking_id for booking_id, _, _, _ in rows], status="pending"
+        ).update(status="requested", updated_at=now)
+        record(*audit, *extra_audit)
+
+        forwarded = TravelApplication.objects.filter(
+            pk__in=list(application_ids), status__in=FORWARDABLE_STATUSES
+        )
+        moved = dict(forwarded.values_list("id", "employee_id"))
+        if moved:
+            TravelApplication.objects.filter(pk__in=list(moved)).update(
+                status="booking_in_progress", updated_at=now
+            )
+
+    employee_ids = set(moved.values())
+    transaction.on_commit(lambda: _invalidate_dashboards(employee_ids))
+    return list(moved)
+
+
+def assign_bookings(bookings, agent, assigned_by, scope="single_booking"):
+    """
+    Assign bookings (instances with trip_details loaded, from any
+    applications) to agent. Returns the ids of applications moved to
+    booking_in_progress.
+    """
+    rows = [
+        (booking.id, booking.trip_details.travel_application_id, agent, scope)
+        for booking in bookings
+    ]
+    return _assign(rows, assigned_by, {application_id for _, application_id, _, _ in rows})
+
+
+def forward_applications(forwards, assigned_by):
+    """
+    Assign every booking of each application to its agent.
+
+    forwards: (application_id, agent) pairs. Returns {application_id: number
+    of bookings forwarded}; each forwarded application also gets a
+    forward_to_travel_desk audit row.
+    """
+    from apps.travel.models import Booking, TravelApplication
+
+    agents = dict(forwards)
+    bookings = Booking.objects.filter(
+        trip_details__travel_application_id__in=list(agents)
+    ).values_list("id", "trip_details__travel_application_id")
+
+    rows = []
+    counts = defaultdict(int)
+    for booking_id, application_id in bookings:
+        rows.append((booking_id, application_id, agents[application_id], "full_application"))
+        counts[application_id] += 1
+
+    forward_audit = [
+        build_entry(assigned_by, "forward_to_travel_desk", TravelApplication, application_id, {
+            "application_id": application_id,
+            "forwarded_to": agent.id,
+            "total_bookings": counts[application_id],
+        })
+        for application_id, agent in agents.items()
+    ]
+
+    _assign(rows, assigned_by, list(agents), extra_audit=forward_audit)
+    return {application_id: counts[application_id] for application_id in agents}
@@ -1,6 +1,7 @@
 from django.db import transaction
-from apps.master_data.models import GuestHouseMaster, ARCHotelMaster, LocationSPOC
+from apps.master_data.models import ARCHotelMaster, LocationSPOC
 from ..models import AccommodationBooking, VehicleBooking
+from .guest_house_availability import GuestHouseAvailability, DEFAULT_TOTAL_ROOMS
 
 class AccommodationBookingEngine:
     """
@@ -16,6 +17,16 @@ class AccommodationBookingEngine:
         self.check_in_date = trip_details.departure_date
         self.check_out_date = trip_details.return_date
         self.duration_nights = (self.check_out_date - self.check_in_date).days
+        self._availability = None
+    
+    @property
+    def availability(self):
+        """Occupancy of the destination's guest houses for this stay, loaded once."""
+        if self._availability is None:
+            self._availability = GuestHouseAvailability.load(
+                self.destination_location, self.check_in_date, self.check_out_date
+            )
+        return self._availability
     
     @transaction.atomic
     def process_accommodation_request(self, guest_count=1, special_requests=""):
@@ -50,10 +61,11 @@ class AccommodationBookingEngine:
         """
         Try to book TSF Guest House
         """
-        available_guest_houses = GuestHouseMaster.objects.filter(
-            location=self.destination_location,
-            is_active=True
-        ).order_by('capacity')
+        # Smallest property first
+        available_guest_houses = sorted(
+            (t.guest_house for t in self.availability.properties.values()),
+            key=lambda gh: (gh.total_rooms or DEFAULT_TOTAL_ROOMS, gh.name)
+        )
         
         for guest_house in available_guest_houses:
             # Check availability (simplified - real implementation would check bookings)
@@ -134,48 +146,24 @@ class AccommodationBookingEngine:
         }
     
     def check_guest_house_availability(self, guest_house):
-        """Check guest house availability - REAL implementation"""
-        from ..models import AccommodationBooking
-        from django.db.models import Q
-        
-        # Get overlapping bookings
-        overlapping = AccommodationBooking.objects.filter(
-            guest_house=guest_house,
-            status__in=['guest_house_confirmed', 'guest_house_requested'],
-            check_in_date__lt=self.check_out_date,
-            check_out_date__gt=self.check_in_date
-        )
-        
-        # Count total rooms booked
-        total_booked_rooms = overlapping.count()
-        
-        # Check if rooms available
-        total_rooms = guest_house.total_rooms or 10  # Default if not set
-        available_rooms = total_rooms - total_booked_rooms
-        
-        return available_rooms > 0
+        """Check guest house availability against the loaded occupancy"""
+        if guest_house.id not in self.availability.properties:
+            occupancy = GuestHouseAvailability.load(
+                None, self.check_in_date, self.check_out_date, guest_houses=[guest_house]
+            )
+        else:
+            occupancy = self.availability
+        return occupancy.is_available(guest_house, self.check_in_date, self.check_out_date)
     
     def get_available_guest_houses(self):
         """Get list of available guest houses with room counts"""
-        available_guest_houses = GuestHouseMaster.objects.filter(
-            city=self.destination_location.city,
-            is_active=True
-        ).order_by('name')
-        
         availability_list = []
-        for gh in available_guest_houses:
-            if self.check_guest_house_availability(gh):
-                # Calculate available rooms
-                overlapping = AccommodationBooking.objects.filter(
-                    guest_house=gh,
-                    status__in=['guest_house_confirmed', 'guest_house_requested'],
-                    check_in_date__lt=self.check_out_date,
-                    check_out_date__gt=self.check_in_date
-                ).count()
-                
-                total_rooms = gh.total_rooms or 10
-                available = total_rooms - overlapping
-                
+        summary = sorted(
+            self.availability.summary(self.check_in_date, self.check_out_date),
+            key=lambda row: row[0].name
+        )
+        for gh, total_rooms, available in summary:
+            if available > 0:
                 availability_list.append({
                     'guest_house': gh,
                     'available_rooms': available,
@@ -1,7 +1,9 @@
 from rest_framework import serializers
+from datetime import date
 from decimal import Decimal
 from django.utils import timezone
-from apps.master_data.models import DAIncidentalMaster, ConveyanceRateMaster
+from apps.master_data.models import ConveyanceRateMaster
+from apps.travel.business_logic.da_rates import da_rate_matrix
 
 # def calculate_da_incidentals(user, city_category, duration_days, duration_hours):
 #     """
@@ -87,24 +89,17 @@ def calculate_da_incidentals(employee, city_category, duration_days, duration_ho
             'da_type': None
         }
     
-    # 3. Fetch DA rate for grade + city category
+    # 3. Fetch DA rate for grade + city category (from the cached rate matrix)
     try:
-        rate = (
-            DAIncidentalMaster.objects
-            .filter(
-                grade=employee.grade,
-                city_category=city_category,
-                is_active=True,
-                effective_from__lte=timezone.now().date()
-            )
-            .order_by('-effective_from')
-            .first()
-        )
+        matrix = da_rate_matrix.get()
+        grade_id = getattr(employee, "grade_id", None)
+        rate = matrix.latest(grade_id, city_category, timezone.now().date())
         
         if not rate:
+            grade_name = matrix.grade_names.get(grade_id)
             return {
                 'eligible': False,
-                'reason': f"No DA/Incidental rate configured for grade {employee.grade} in {city_category}",
+                'reason': f"No DA/Incidental rate configured for grade {grade_name} in {city_category}",
                 'da_amount': Decimal('0'),
                 'incidental_amount': Decimal('0'),
                 'total': Decimal('0'),
@@ -145,59 +140,81 @@ def calculate_da_for_entire_travel(travel_app):
     """
     Calculates DA + incidental amounts for the entire completed travel application.
     """
+    return calculate_da_for_applications([travel_app])[travel_app.id]
 
-    total_da = Decimal('0')
-    total_incidentals = Decimal('0')
-    breakdown = []
 
-    today = timezone.now().date()
+def calculate_da_for_applications(applications):
+    """
+    Batched calculate_da_for_entire_travel: trips of every application are loaded
+    in one prefetch and rated against the cached DA matrix.
+    Returns {application_id: breakdown} with the same structure per application.
+    """
+    from django.db.models import Prefetch
+    from apps.travel.models import TripDetails
+
+    trips = TripDetails.objects.select_related('from_location', 'to_location__category')
+    prefetch = Prefetch('trip_details', queryset=trips)
+    if hasattr(applications, 'prefetch_related'):
+        applications = applications.select_related('employee').prefetch_related(prefetch)
+    else:
+        from django.db.models import prefetch_related_objects
+        applications = list(applications)
+        prefetch_related_objects(applications, prefetch)
+
+    results = {}
+    for travel_app in applications:
+        total_da = Decimal('0')
+        total_incidentals = Decimal('0')
+        breakdown = []
+
+        for trip in travel_app.trip_details.all():
+            try:
+                duration_days = trip.get_duration_days()
+                duration_hours = duration_days * 24  # Trip model handles special cases
+                city_category = trip.to_location.category if trip.to_location else None
+                distance_km = trip.estimated_distance_km
 
-    for trip in travel_app.trip_details.all():
-        try:
-            duration_days = trip.get_duration_days()
-            duration_hours = duration_days * 24  # Trip model handles special cases
-            city_category = trip.get_city_category()
-            distance_km = trip.estimated_distance_km
+                result = calculate_da_incidentals(
+                    employee=travel_app.employee,
+                    city_category=city_category,
+                    duration_days=duration_days,
+                    duration_hours=duration_hours,
+                    distance_km=distance_km
+                )
 
-            result = calculate_da_incidentals(
-                employee=travel_app.employee,
-                city_category=city_category,
-                duration_days=duration_days,
-                duration_hours=duration_hours,
-                distance_km=distance_km
-            )
+                if result['eligible']:
+                    total_da += result['da_amount']
+                    total_incidentals += result['incidental_amount']
 
-            if result['eligible']:
-                total_da += result['da_amount']
-                total_incidentals += result['incidental_amount']
+                    breakdown.append({
+                        'trip_id': trip.id,
+                        'from_location': trip.from_location.city_name if trip.from_location else None,
+                        'to_location': trip.to_location.city_name if trip.to_location else None,
+                        'duration_days': duration_days,
+                        'city_category': city_category.name if city_category else None,
+                        'da_amount': float(result['da_amount']),
+                        'incidental_amount': float(result['incidental_amount']),
+                        'total': float(result['total']),
+                        'da_type': result['da_type']
+                    })
 
+            except Exception as e:
+                # Continue gracefully for each trip
                 breakdown.append({
                     'trip_id': trip.id,
-                    'from_location': trip.from_location.city_name if trip.from_location else None,
-                    'to_location': trip.to_location.city_name if trip.to_location else None,
-                    'duration_days': duration_days,
-                    'city_category': city_category.name if city_category else None,
-                    'da_amount': float(result['da_amount']),
-                    'incidental_amount': float(result['incidental_amount']),
-                    'total': float(result['total']),
-                    'da_type': result['da_type']
+                    'error': str(e)
                 })
+                continue
 
-        except Exception as e:
-            # Continue gracefully for each trip
-            breakdown.append({
-                'trip_id': trip.id,
-                'error': str(e)
-            })
-            continue
+        results[travel_app.id] = {
+            'total_da': float(total_da),
+            'total_incidentals': float(total_incidentals),
+            'grand_total': float(total_da + total_incidentals),
+            'trip_breakdown': breakdown,
+            'currency': 'INR'
+        }
 
-    return {
-        'total_da': float(total_da),
-        'total_incidentals': float(total_incidentals),
-        'grand_total': float(total_da + total_incidentals),
-        'trip_breakdown': breakdown,
-        'currency': 'INR'
-    }
+    return results
 
 
 def calculate_conveyance_cost(conveyance_type, distance_km, has_receipt=False):
@@ -242,14 +259,12 @@ def calculate_accommodation_allowance(user, city_category, accommodation_type='s
     if not user.grade:
         return {'error': 'User grade not defined'}
     
-    da_rates = DAIncidentalMaster.objects.filter(
-        grade=user.grade,
-        city_category__name=city_category,
-        is_active=True
-    ).order_by('-effective_from').first()
+    # Latest active rate regardless of effective dates, as before
+    matrix = da_rate_matrix.get()
+    da_rates = matrix.latest(user.grade_id, city_category, date.max)
     
     if not da_rates:
-        return {'error': f'Rates not found for grade {user.grade.name} in category {city_category}'}
+        return {'error': f'Rates not found for grade {matrix.grade_names.get(user.grade_id)} in category {city_category}'}
     
     if city_category == 'A':
         allowance = da_rates.stay_allowance_category_a
@@ -0,0 +1,167 @@
+"""
+Travel completion sweeper
+
+One periodic task (apps.travel.tasks.sweep_travel_completion) replaces the
+per-application one-off beat schedules:
+  - complete_due_applications: booked applications whose travel_end_date
+    (latest trip return date, set on submission) has passed move to
+    'completed' batch by batch, one UPDATE per batch, and their employees get
+    the settlement reminder.
+  - remind_overdue_settlements: completed, unsettled applications past their
+    settlement due date are reminded again every SETTLEMENT_REMINDER_INTERVAL.
+Both walk indexed (status, date) ranges and hand their reminders to
+NotificationCenter.notify_many once the batch has committed. The
+check_settlement_deadlines command runs the same sweep.
+"""
+
+import logging
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import Max, Q
+from django.utils import timezone
+
+from .dashboard import invalidate_employee_status_counts
+
+logger = logging.getLogger(__name__)
+
+SWEEP_BATCH_SIZE = 500
+SETTLEMENT_REMINDER_INTERVAL = timedelta(days=7)
+SETTLEMENT_REMINDER_EVENT = "travel.settlement.reminder"
+
+
+def due_for_completion(today=None):
+    """Booked applications whose last trip returned before today."""
+    from apps.travel.models import TravelApplication
+
+    today = today or timezone.localdate()
+    return TravelApplication.objects.filter(status="booked", travel_end_date__lt=today)
+
+
+def overdue_settlements(today=None, now=None):
+    """Completed, unsettled applications past their due date and not reminded recently."""
+    from apps.travel.models import TravelApplication
+
+    today = today or timezone.localdate()
+    now = now or timezone.now()
+    return TravelApplication.objects.filter(
+        status="completed", is_settled=False, settlement_due_date__lt=today
+    ).filter(
+        Q(settlement_reminded_at__isnull=True)
+        | Q(settlement_reminded_at__lt=now - SETTLEMENT_REMINDER_INTERVAL)
+    )
+
+
+def _reminder(travel_app, overdue):
+    return (
+        SETTLEMENT_REMINDER_EVENT,
+        {"type": "TravelRequest", "id": travel_app.id},
+        {
+            "employee_id": travel_app.employee_id,
+            "employee_name": travel_app.employee.get_full_name(),
+            "request_id": travel_app.get_travel_request_id(),
+            "settlement_due_date": str(travel_app.settlement_due_date),
+            "overdue": overdue,
+        },
+    )
+
+
+def _send_reminders(events):
+    if not events:
+        return
+    try:
+        from apps.notifications.center import NotificationCenter
+        NotificationCenter.notify_many(events)
+    except Exception:
+        logger.exception("Settlement reminders failed for %s applications", len(events))
+
+
+def _after_commit(travel_apps, overdue):
+    events = [_reminder(travel_app, overdue) for travel_app in travel_apps]
+    employee_ids = {travel_app.employee_id for travel_app in travel_apps}
+
+    def run():
+        for employee_id in employee_ids:
+            invalidate_employee_status_counts(employee_id)
+        _send_reminders(events)
+
+    transaction.on_commit(run)
+
+
+def _complete_batch(today, now, batch_size):
+    """Complete one batch; returns (completed, corrected, examined) counts."""
+    from apps.travel.models import TravelApplication
+
+    candidates = list(
+        due_for_completion(today)
+        .select_related("employee")
+        .annotate(last_return=Max("trip_details__return_date"))
+        .order_by("travel_end_date", "id")[:batch_size]
+    )
+    due, stale = [], []
+    for travel_app in candidates:
+        # Trips edited after submission: re-file under the real end date
+        if travel_app.last_return is None or travel_app.last_return >= today:
+            travel_app.travel_end_date = travel_app.last_return
+            stale.append(travel_app)
+        else:
+            due.append(travel_app)
+
+    with transaction.atomic():
+        if stale:
+            TravelApplication.objects.bulk_update(stale, ["travel_end_date"])
+        completed = TravelApplication.objects.filter(
+            pk__in=[travel_app.pk for travel_app in due], status="booked"
+        ).update(status="completed", settlement_reminded_at=now, updated_at=now)
+        _after_commit(due, overdue=False)
+    return completed, len(stale), len(candidates)
+
+
+def complete_due_applications(today=None, batch_size=SWEEP_BATCH_SIZE, max_batches=None):
+    """Move every due booked application to completed. Returns the number completed."""
+    today = today or timezone.localdate()
+    now = timezone.now()
+    completed = batches = 0
+    while max_batches is None or batches < max_batches:
+        done, corrected, examined = _complete_batch(today, now, batch_size)
+        if corrected:
+            logger.info("Corrected travel_end_date of %s applications", corrected)
+        completed += done
+        batches += 1
+        if examined < batch_size:
+            break
+    return completed
+
+
+def remind_overdue_settlements(today=None, batch_size=SWEEP_BATCH_SIZE, max_batches=None):
+    """Remind employees of overdue settlements. Returns the number of reminders queued."""
+    from apps.travel.models import TravelApplication
+
+    today = today or timezone.localdate()
+    now = timezone.now()
+    reminded = batches = 0
+    while max_batches is None or batches < max_batches:
+        overdue = list(
+            overdue_settlements(today, now)
+            .select_related("employee")
+            .order_by("settlement_due_date", "id")[:batch_size]
+        )
+        with transaction.atomic():
+            TravelApplication.objects.filter(pk__in=[a.pk for a in overdue]).update(
+                settlement_reminded_at=now
+            )
+            _after_commit(overdue, overdue=True)
+        reminded += len(overdue)
+        batches += 1
+        if len(overdue) < batch_size:
+            break
+    return reminded
+
+
+def sweep_travel_completion(today=None, batch_size=SWEEP_BATCH_SIZE, max_batches=None):
+    """Run both passes; returns their counts."""
+    today = today or timezone.localdate()
+    return {
+        "completed": complete_due_applications(today, batch_size, max_batches),
+        "settlement_reminders": remind_overdue_settlements(today, batch_size, max_batches),
+    }
@@ -0,0 +1,94 @@
+"""
+Travel policy compliance checks, evaluated set-wise.
+
+Instead of walking application -> trip -> booking with a query per level, the
+report reads one values() projection of every flight booking submitted in the
+window, with "has an approved CEO flow" folded in as an Exists() annotation,
+and applies the rules in a single columnar pass.
+"""
+
+from decimal import Decimal
+
+from django.db.models import Exists, OuterRef
+
+FLIGHT_ADVANCE_DAYS = 7
+FLIGHT_CEO_AMOUNT = Decimal('10000')
+
+
+def _window(queryset, field, start, end):
+    filters = {f'{field}__gte': start}
+    if end is not None:
+        filters[f'{field}__lt'] = end
+    return queryset.filter(**filters)
+
+
+def find_violations(start, end=None):
+    """
+    Returns (total_applications, violations) where violations is an ordered dict
+    {application_id: [violation, ...]} in the report order (newest application first).
+    """
+    from apps.travel.models import TravelApplication, Booking, TravelApprovalFlow
+
+    total = _window(TravelApplication.objects, 'submitted_at', start, end).count()
+
+    ceo_approved = TravelApprovalFlow.objects.filter(
+        travel_application=OuterRef('trip_details__travel_application'),
+        approval_level='ceo',
+        status='approved',
+    )
+
+    rows = (
+        _window(Booking.objects, 'trip_details__travel_application__submitted_at', start, end)
+        .filter(booking_type__name__iexact='flight')
+        .annotate(has_ceo_approval=Exists(ceo_approved))
+        .order_by(
+            '-trip_details__travel_application__created_at',
+            'trip_details__travel_application_id',
+            'trip_details__departure_date', 'trip_details_id',
+            'created_at', 'id',
+        )
+        .values_list(
+            'trip_details__travel_application_id',
+            'trip_details__travel_application__submitted_at',
+            'trip_details__departure_date',
+            'estimated_cost',
+            'has_ceo_approval',
+        )
+    )
+
+    violations = {}
+    for app_id, submitted_at, departure_date, cost, has_ceo_approval in rows.iterator(chunk_size=2000):
+        found = []
+        days_ahead = (departure_date - submitted_at.date()).days
+        if days_ahead < FLIGHT_ADVANCE_DAYS:
+            found.append({
+                'type': 'advance_booking',
+                'message': f'Flight booked {days_ahead} days ahead (required: {FLIGHT_ADVANCE_DAYS} days)'
+            })
+        if cost is not None and cost > FLIGHT_CEO_AMOUNT and not has_ceo_approval:
+            found.append({
+                'type': 'missing_approval',
+                'message': f'Flight cost ₹{cost} requires CEO approval'
+            })
+        if found:
+            violations.setdefault(app_id, []).extend(found)
+
+    return total, violations
+
+
+def violation_details(app_ids, violations):
+    """Build report rows for the given application ids (one query for the whole page)."""
+    from apps.travel.models import TravelApplication
+
+    apps = TravelApplication.objects.filter(id__in=app_ids).select_related('employee').only(
+        'id', 'created_at', 'employee__first_name', 'employee__last_name',
+    ).in_bulk()
+
+    return [
+        {
+            'travel_request_id': apps[app_id].get_travel_request_id(),
+            'employee': apps[app_id].employee.get_full_name(),
+            'violations': violations[app_id],
+        }
+        for app_id in app_ids if app_id in apps
+    ]
@@ -0,0 +1,124 @@
+"""
+DARateMatrix
+
+Compiled, in-memory view of the active DAIncidentalMaster rows.
+
+- Rates are kept on a timeline per (grade_id, city_category_id), sorted by
+  effective_from, so "the rate in force on day D" is a bisect.
+- Grades and city categories can be given as instances, ids or names; the
+  matrix resolves them without a query.
+- Built once per process via VersionedSnapshot and invalidated from the
+  post_save / post_delete receivers in apps.travel.signals.
+
+Used by the DA calculators in apps.travel.business_logic.calculations and
+apps.expenses.business_logic.claims, which therefore issue no rate queries.
+"""
+
+import logging
+from bisect import bisect_right
+from collections import namedtuple
+
+from django.db.models import F
+
+from utils.versioned_cache import VersionedSnapshot
+
+logger = logging.getLogger(__name__)
+
+DARate = namedtuple(
+    "DARate",
+    "id grade_id city_category_id city_category_name effective_from effective_to "
+    "da_full_day da_half_day incidental_full_day incidental_half_day "
+    "stay_allowance_category_a stay_allowance_category_b",
+)
+
+RATE_FIELDS = (
+    "da_full_day", "da_half_day", "incidental_full_day", "incidental_half_day",
+    "stay_allowance_category_a", "stay_allowance_category_b",
+)
+
+
+class DARateMatrix:
+    """
+    Answers "which DA / incidental rate applies" for any number of trips with zero queries.
+    """
+
+    def __init__(self, rates, grades, categories):
+        self.grade_ids = {name.casefold(): gid for gid, name in grades}
+        self.grade_names = dict(grades)
+        self.category_ids = {name.casefold(): cid for cid, name in categories}
+
+        timelines = {}
+        for rate in rates:
+            timelines.setdefault((rate.grade_id, rate.city_category_id), []).append(rate)
+        self._timelines = {}
+        for key, rows in timelines.items():
+            rows.sort(key=lambda r: r.effective_from)
+            self._timelines[key] = ([r.effective_from for r in rows], rows)
+
+    @classmethod
+    def build(cls):
+        from apps.master_data.models import DAIncidentalMaster, GradeMaster, CityCategoriesMaster
+
+        rates = [
+            DARate(**row) for row in
+            DAIncidentalMaster.objects.filter(is_active=True).values(
+                "id", "grade_id", "city_category_id", "effective_from", "effective_to",
+                *RATE_FIELDS, city_category_name=F("city_category__name"),
+            )
+        ]
+        grades = list(GradeMaster.objects.values_list("id", "name"))
+        categories = list(CityCategoriesMaster.objects.values_list("id", "name"))
+        return cls(rates, grades, categories)
+
+    @staticmethod
+    def _resolve(value, by_name):
+        if value is None or value == "":
+            return None
+        if hasattr(value, "pk"):
+            return value.pk
+        if isinstance(value, int):
+            return value
+        text = str(value)
+        if text.isdigit():
+            return int(text)
+        return by_name.get(text.casefold())
+
+    def grade_id(self, grade):
+        """Normalize a GradeMaster instance, id or name to an id (None if unknown)."""
+        return self._resolve(grade, self.grade_ids)
+
+    def category_id(self, city_category):
+        """Normalize a CityCategoriesMaster instance, id or name to an id (None if unknown)."""
+        return self._resolve(city_category, self.category_ids)
+
+    def latest(self, grade, city_category, day, honour_effective_to=False):
+        """
+        The rate with the most recent effective_from <= day, or None.
+        honour_effective_to=True additionally skips rates that ended before day.
+        """
+        timeline = self._timelines.get((self.grade_id(grade), self.category_id(city_category)))
+        if timeline is None:
+            return None
+        starts, rows = timeline
+        for rate in reversed(rows[:bisect_right(starts, day)]):
+            if not honour_effective_to or rate.effective_to is None or rate.effective_to >= day:
+                return rate
+        return None
+
+    def rates_for_grade(self, grade, day):
+        """
+        {category_name: rate} of every category with a rate in force on day
+        (effective_from <= day <= effective_to).
+        """
+        grade_id = self.grade_id(grade)
+        result = {}
+        for (g_id, category_id), (starts, rows) in self._timelines.items():
+            if g_id != grade_id:
+                continue
+            rate = self.latest(grade_id, category_id, day, honour_effective_to=True)
+            if rate is not None:
+                result[rate.city_category_name] = rate
+        return result
+
+
+da_rate_matrix = VersionedSnapshot("da_rates", DARateMatrix.build)
@@ -0,0 +1,128 @@
+"""
+Employee dashboard aggregation.
+
+All status buckets shown on the employee landing page come from one
+conditional-Count aggregate over the employee's applications, cached per user
+for a short time. The cache entry is dropped from apps.travel.signals whenever
+one of the user's applications is saved or deleted.
+"""
+
+import logging
+
+from django.core.cache import cache
+from django.db.models import Count, Min, Prefetch, Q
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+STATUS_COUNTS_TIMEOUT = 60
+
+# Bucket definitions used by EmployeeDashboardView
+EMPLOYEE_DASHBOARD_BUCKETS = {
+    'draft': ['draft'],
+    'pending': ['pending_manager', 'pending_chro', 'pending_ceo'],
+    'approved': ['approved_manager', 'approved_chro', 'approved_ceo', 'pending_travel_desk'],
+    'booked': ['booking_in_progress', 'booked'],
+    'completed': ['completed'],
+    'rejected': ['rejected_manager', 'rejected_chro', 'rejected_ceo'],
+}
+
+# Bucket definitions used by TravelApplicationDashboardStatsView / MyTravelApplicationsView
+APPLICATION_STATS_BUCKETS = {
+    'draft': ['draft'],
+    'pending': ['submitted', 'pending_manager', 'pending_chro', 'pending_ceo'],
+    'approved': ['approved_manager', 'approved_chro', 'approved_ceo',
+                 'pending_travel_desk', 'booking_in_progress', 'booked'],
+    'rejected': ['rejected_manager', 'rejected_chro', 'rejected_ceo'],
+    'completed': ['completed'],
+}
+
+UPCOMING_STATUSES = ['booked', 'approved_manager', 'approved_chro', 'approved_ceo']
+
+
+def _status_counts_key(user_id):
+    return f"dashboard:status_counts:{user_id}"
+
+
+def get_employee_status_counts(user):
+    """
+    Per-status counts for the user's applications, in a single query.
+    Returns: {'by_status': {status: n}, 'total': n, 'settlement_pending': n}
+    """
+    from apps.travel.models import TravelApplication
+
+    key = _status_counts_key(user.id)
+    try:
+        counts = cache.get(key)
+    except Exception as e:
+        logger.debug("Dashboard cache unavailable: %s", e)
+        counts = None
+    if counts is not None:
+        return counts
+
+    aggregates = {
+        f"status__{code}": Count('id', filter=Q(status=code))
+        for code, _ in TravelApplication.STATUS_CHOICES
+    }
+    aggregates['total'] = Count('id')
+    aggregates['settlement_pending'] = Count('id', filter=Q(status='completed', is_settled=False))
+
+    row = TravelApplication.objects.filter(employee=user).aggregate(**aggregates)
+    counts = {
+        'by_status': {
+            code: row[f"status__{code}"] for code, _ in TravelApplication.STATUS_CHOICES
+        },
+        'total': row['total'],
+        'settlement_pending': row['settlement_pending'],
+    }
+
+    try:
+        cache.set(key, counts, STATUS_COUNTS_TIMEOUT)
+    except Exception as e:
+        logger.debug("Could not cache dashboard counts: %s", e)
+    return counts
+
+
+def bucket_counts(counts, buckets):
+    """Fold per-status counts into the named buckets."""
+    by_status = counts['by_status']
+    return {
+        name: sum(by_status.get(code, 0) for code in statuses)
+        for name, statuses in buckets.items()
+    }
+
+
+def invalidate_employee_status_counts(user_id):
+    try:
+        cache.delete(_status_counts_key(user_id))
+    except Exception as e:
+        logger.debug("Could not invalidate dashboard counts for user %s: %s", user_id, e)
+
+
+def get_upcoming_applications(user, limit=5):
+    """
+    Approved/booked applications with a trip departing today or later, ordered by
+    that departure. Trips (with destination city) are prefetched in the same pass.
+    """
+    from apps.travel.models import TravelApplication, TripDetails
+
+    today = timezone.now().date()
+    return list(
+        TravelApplication.objects.filter(employee=user, status__in=UPCOMING_STATUSES)
+        .annotate(next_departure=Min(
+            'trip_details__departure_date',
+            filter=Q(trip_details__departure_date__gte=today),
+        ))
+        .filter(next_departure__isnull=False)
+        .order_by('next_departure')
+        .prefetch_related(Prefetch(
+            'trip_details',
+            queryset=TripDetails.objects.select_related('to_location'),
+        ))[:limit]
+    )
+
+
+def first_trip(application):
+    """First trip of an application whose trip_details were prefetched."""
+    trips = list(application.trip_details.all())
+    return trips[0] if trips else None
@@ -0,0 +1,124 @@
+"""
+GradeEntitlementIndex
+
+Compiled, in-memory view of GradeEntitlementMaster:
+
+    grade_id -> sub_option_id -> city_category_id | None -> Entitlement
+
+- A row for a specific city category overrides the grade's "All Cities" row
+  (city_category NULL) for that sub option.
+- Sub options carry their mode, so the "does this sub option belong to the
+  booking's mode" check is a lookup as well.
+- Built once per process via VersionedSnapshot and invalidated from the
+  post_save / post_delete receivers in apps.travel.signals.
+"""
+
+import logging
+from collections import namedtuple
+
+from utils.versioned_cache import VersionedSnapshot
+
+logger = logging.getLogger(__name__)
+
+Entitlement = namedtuple("Entitlement", "id is_allowed max_amount city_category_id")
+SubOption = namedtuple("SubOption", "id name mode_id mode_name")
+
+
+class GradeEntitlementIndex:
+    """
+    Answers entitlement questions for any number of bookings with zero queries.
+    """
+
+    def __init__(self, entitlements, sub_options, categories):
+        self.sub_options = {s.id: s for s in sub_options}
+        self.categories = dict(categories)
+        # category name (A/B/C) -> id
+        self.category_ids = {name.casefold(): cid for cid, name in categories}
+
+        self._grades = {}
+        # Rows in id order, i.e. the order the old unordered querysets returned
+        for row in sorted(entitlements, key=lambda r: r["id"]):
+            options = self._grades.setdefault(row["grade_id"], {})
+            by_category = options.setdefault(row["sub_option_id"], {})
+            by_category.setdefault(row["city_category_id"], Entitlement(
+                row["id"], row["is_allowed"], row["max_amount"], row["city_category_id"],
+            ))
+
+    @classmethod
+    def build(cls):
+        from apps.master_data.models import GradeEntitlementMaster, TravelSubOptionMaster, CityCategoriesMaster
+
+        entitlements = list(GradeEntitlementMaster.objects.values(
+            "id", "grade_id", "sub_option_id", "city_category_id", "max_amount", "is_allowed",
+        ))
+        sub_options = [
+            SubOption(*row) for row in
+            TravelSubOptionMaster.objects.values_list("id", "name", "mode_id", "mode__name")
+        ]
+        categories = list(CityCategoriesMaster.objects.values_list("id", "name"))
+        return cls(entitlements, sub_options, categories)
+
+    def sub_option_id(self, sub_option):
+        """Normalize a TravelSubOptionMaster instance or id (int or digit string) to an id (None if invalid)."""
+        if hasattr(sub_option, "pk"):
+            return sub_option.pk
+        if isinstance(sub_option, int) and not isinstance(sub_option, bool):
+            return sub_option
+        text = str(sub_option or "").strip()
+        return int(text) if text.isdigit() else None
+
+    def category_id(self, city_category):
+        """Normalize a CityCategoriesMaster instance, id or name to an id (None if unknown)."""
+        if city_category is None or city_category == "":
+            return None
+        if hasattr(city_category, "pk"):
+            return city_category.pk
+        if isinstance(city_category, int):
+            return city_category
+        text = str(city_category)
+        if text.isdigit():
+            return int(text)
+        return self.category_ids.get(text.casefold())
+
+    def lookup(self, grade_id, sub_option_id, city_category_id=None, mode_name=None):
+        """
+        The entitlement row that applies, or None.
+        - mode_name (optional) must match the sub option's mode, case-insensitively.
+        - city_category_id: the category-specific row wins over the All Cities row;
+          without a category the All Cities row (else the first row) is used.
+        """
+        if mode_name is not None:
+            sub = self.sub_options.get(sub_option_id)
+            if sub is None or (sub.mode_name or "").casefold() != str(mode_name).casefold():
+                return None
+
+        by_category = self._grades.get(grade_id, {}).get(sub_option_id)
+        if not by_category:
+            return None
+        if city_category_id is not None:
+            return by_category.get(city_category_id) or by_category.get(None)
+        return by_category.get(None) or next(iter(by_category.values()))
+
+    def allowed_for_grade(self, grade_id):
+        """
+        Allowed entitlements of a grade grouped by mode, in the shape returned by
+        AllowedTravelModesView: [{"id", "name", "sub_options": [{"id", "name", "max_amount"}]}]
+        """
+        modes = {}
+        rows = sorted(
+            (ent, sub_option_id)
+            for sub_option_id, by_category in self._grades.get(grade_id, {}).items()
+            for ent in by_category.values()
+        )
+        for ent, sub_option_id in rows:
+            if not ent.is_allowed:
+                continue
+            sub = self.sub_options.get(sub_option_id)
+            if sub is None:
+                continue
+            mode = modes.setdefault(sub.mode_id, {"id": sub.mode_id, "name": sub.mode_name, "sub_options": []})
+            mode["sub_options"].append({"id": sub.id, "name": sub.name, "max_amount": ent.max_amount})
+        return list(modes.values())
+
+
+entitlement_index = VersionedSnapshot("grade_entitlements", GradeEntitlementIndex.build)
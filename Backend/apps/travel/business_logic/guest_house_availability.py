@@ -0,0 +1,134 @@
+"""
+Guest house availability
+
+Loads every room-holding AccommodationBooking of a city's guest houses for a
+date window in one query, then answers availability questions in memory:
+
+- Range questions ("how many bookings overlap check_in..check_out") keep the
+  semantics of the old per-guest-house count() queries. Each property keeps
+  its booking starts and ends in two sorted lists, so the overlap count is
+  two bisects: starts before check_out minus ends on/before check_in.
+- Per-night questions (the month calendar) use a day-bucket array per
+  property, built from a difference array over the window.
+"""
+
+from bisect import bisect_left, bisect_right
+from datetime import timedelta
+
+# Bookings in these states hold a room
+HOLDING_STATUSES = ['guest_house_confirmed', 'guest_house_requested']
+
+# Used when GuestHouseMaster.total_rooms is not set
+DEFAULT_TOTAL_ROOMS = 10
+
+
+class _PropertyTimeline:
+    """Booking intervals of one guest house within the loaded window."""
+
+    def __init__(self, guest_house, intervals):
+        self.guest_house = guest_house
+        self.total_rooms = guest_house.total_rooms or DEFAULT_TOTAL_ROOMS
+        self.starts = sorted(start for start, _ in intervals)
+        self.ends = sorted(end for _, end in intervals)
+        self.intervals = intervals
+
+    def overlapping(self, check_in, check_out):
+        """Bookings with check_in_date < check_out and check_out_date > check_in."""
+        return bisect_left(self.starts, check_out) - bisect_right(self.ends, check_in)
+
+    def nightly_occupancy(self, start, end):
+        """Rooms occupied on each night in [start, end), as a list."""
+        nights = (end - start).days
+        delta = [0] * (nights + 1)
+        for check_in, check_out in self.intervals:
+            first = max((check_in - start).days, 0)
+            last = min((check_out - start).days, nights)
+            if first < last:
+                delta[first] += 1
+                delta[last] -= 1
+        occupied = []
+        running = 0
+        for step in delta[:nights]:
+            running += step
+            occupied.append(running)
+        return occupied
+
+
+class GuestHouseAvailability:
+    """
+    Occupancy of a set of guest houses over [window_start, window_end).
+    Questions must fall inside the loaded window.
+    """
+
+    def __init__(self, guest_houses, bookings, window_start, window_end):
+        self.window_start = window_start
+        self.window_end = window_end
+        intervals = {}
+        for guest_house_id, check_in, check_out in bookings:
+            intervals.setdefault(guest_house_id, []).append((check_in, check_out))
+        self.properties = {
+            gh.id: _PropertyTimeline(gh, intervals.get(gh.id, []))
+            for gh in guest_houses
+        }
+
+    @classmethod
+    def load(cls, city, window_start, window_end, guest_houses=None):
+        """
+        Build availability for the active guest houses of city (or the given
+        guest_houses) with one query for guest houses and one for bookings.
+        """
+        from apps.master_data.models import GuestHouseMaster
+        from apps.travel.models import AccommodationBooking
+
+        if guest_houses is None:
+            guest_houses = GuestHouseMaster.objects.filter(city=city, is_active=True)
+        guest_houses = list(guest_houses)
+
+        bookings = AccommodationBooking.objects.filter(
+            guest_house__in=[gh.id for gh in guest_houses],
+            status__in=HOLDING_STATUSES,
+            check_in_date__lt=window_end,
+            check_out_date__gt=window_start,
+        ).values_list('guest_house_id', 'check_in_date', 'check_out_date')
+
+        return cls(guest_houses, list(bookings), window_start, window_end)
+
+    def _timeline(self, guest_house):
+        return self.properties[getattr(guest_house, 'pk', guest_house)]
+
+    def available_rooms(self, guest_house, check_in, check_out):
+        timeline = self._timeline(guest_house)
+        return timeline.total_rooms - timeline.overlapping(check_in, check_out)
+
+    def is_available(self, guest_house, check_in, check_out):
+        return self.available_rooms(guest_house, check_in, check_out) > 0
+
+    def summary(self, check_in, check_out):
+        """[(guest_house, total_rooms, available_rooms)] for every loaded guest house."""
+        return [
+            (t.guest_house, t.total_rooms, t.total_rooms - t.overlapping(check_in, check_out))
+            for t in self.properties.values()
+        ]
+
+    def calendar(self):
+        """
+        Free rooms per night of the window:
+        [{'date', 'free_rooms', 'guest_houses': {guest_house_id: free_rooms}}]
+        """
+        nights = (self.window_end - self.window_start).days
+        per_property = {
+            gh_id: t.nightly_occupancy(self.window_start, self.window_end)
+            for gh_id, t in self.properties.items()
+        }
+        days = []
+        for offset in range(nights):
+            free = {
+                gh_id: max(self.properties[gh_id].total_rooms - occupied[offset], 0)
+                for gh_id, occupied in per_property.items()
+            }
+            days.append({
+                'date': self.window_start + timedelta(days=offset),
+                'free_rooms': sum(free.values()),
+                'guest_houses': free,
+            })
+        return days
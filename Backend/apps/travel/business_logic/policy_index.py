@@ -0,0 +1,122 @@
+"""
+TravelPolicyIndex
+
+Compiled, in-memory view of the active TravelPolicyMaster rows.
+
+- Every active row is placed on a timeline per (policy_type, travel_mode_id,
+  employee_grade_id), sorted by effective_from, plus wildcard buckets with the
+  mode and/or grade left open (None) so "any mode" / "any grade" lookups are
+  a single dict hit as well.
+- The rows effective on a given day are resolved from those timelines once
+  (bisect on effective_from, then the effective_to check) and memoized per
+  day, so the view rolls over at midnight without a rebuild.
+- Within a bucket rows keep the model's default ordering (policy_type, title),
+  matching what the old querysets returned from .first().
+- Built once per process via VersionedSnapshot and invalidated from the
+  post_save / post_delete receivers in apps.travel.signals.
+"""
+
+import logging
+from bisect import bisect_right
+from itertools import product
+
+from django.utils import timezone
+
+from utils.versioned_cache import VersionedSnapshot
+
+logger = logging.getLogger(__name__)
+
+
+class _PolicyDay:
+    """Policies effective on one day, keyed by (policy_type, mode_id|None, grade_id|None)."""
+
+    def __init__(self, buckets, mode_ids):
+        self._buckets = buckets
+        self._mode_ids = mode_ids
+
+    def find(self, policy_type, travel_mode=None, grade=None, mode_name=None):
+        """
+        Rows of policy_type effective today, optionally narrowed to a travel mode
+        (instance, id or case-insensitive mode_name) and/or grade (instance or id).
+        """
+        mode_id = getattr(travel_mode, "pk", travel_mode)
+        if mode_name is not None:
+            mode_id = self._mode_ids.get(mode_name.casefold())
+            if mode_id is None:
+                return []
+        grade_id = getattr(grade, "pk", grade)
+        return self._buckets.get((policy_type, mode_id or None, grade_id or None), [])
+
+    def latest(self, policy_type, travel_mode=None, grade=None, mode_name=None):
+        """The matching row with the most recent effective_from, or None."""
+        rows = self.find(policy_type, travel_mode, grade, mode_name)
+        return max(rows, key=lambda p: p.effective_from) if rows else None
+
+    def matching_type(self, fragment=None):
+        """Every row whose policy_type contains fragment (case-insensitive), or all rows."""
+        fragment = (fragment or "").lower()
+        return [
+            p for (policy_type, mode_id, grade_id), rows in self._buckets.items()
+            if mode_id is None and grade_id is None and fragment in policy_type.lower()
+            for p in rows
+        ]
+
+
+class TravelPolicyIndex:
+    """
+    Answers "which policy applies today" lookups with zero queries.
+    """
+
+    def __init__(self, policies, mode_ids):
+        timelines = {}
+        for position, p in enumerate(policies):
+            for mode_id, grade_id in product((p.travel_mode_id, None), (p.employee_grade_id, None)):
+                key = (p.policy_type, mode_id, grade_id)
+                timelines.setdefault(key, set()).add((position, p))
+
+        # timeline: rows sorted by effective_from, with parallel list of start dates
+        self._timelines = {}
+        for key, entries in timelines.items():
+            rows = sorted(entries, key=lambda e: (e[1].effective_from, e[0]))
+            self._timelines[key] = ([p.effective_from for _, p in rows], rows)
+
+        self._mode_ids = mode_ids
+        self._day = None
+
+    @classmethod
+    def build(cls):
+        from apps.master_data.models import TravelPolicyMaster, TravelModeMaster
+
+        policies = list(TravelPolicyMaster.objects.filter(is_active=True))
+        mode_ids = {}
+        for mode_id, name in TravelModeMaster.objects.order_by("id").values_list("id", "name"):
+            mode_ids.setdefault(name.casefold(), mode_id)
+        return cls(policies, mode_ids)
+
+    def _resolve(self, day):
+        buckets = {}
+        for key, (starts, rows) in self._timelines.items():
+            started = rows[:bisect_right(starts, day)]
+            effective = [e for e in started if e[1].effective_to is None or e[1].effective_to >= day]
+            if effective:
+                buckets[key] = [p for _, p in sorted(effective, key=lambda e: e[0])]
+        logger.debug("TravelPolicyIndex resolved %s buckets for %s", len(buckets), day)
+        return _PolicyDay(buckets, self._mode_ids)
+
+    def on(self, day=None):
+        """The _PolicyDay view for day (default: today), memoized until the date changes."""
+        day = day or timezone.now().date()
+        current = self._day
+        if current is not None and current[0] == day:
+            return current[1]
+        view = self._resolve(day)
+        self._day = (day, view)
+        return view
+
+
+policy_index = VersionedSnapshot("travel_policies", TravelPolicyIndex.build)
+
+
+def effective_policies():
+    """Shortcut: policies effective today."""
+    return policy_index.get().on()
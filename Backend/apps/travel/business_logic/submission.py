@@ -0,0 +1,128 @@
+"""
+Travel application submission pipeline
+
+TravelApplicationSubmitView loads the application graph once
+(load_submission_snapshot) and hands that snapshot to every step:
+the submission validators, the advance-booking warnings, the cost
+calculation, ApprovalEngineV2 and the settlement due date all read the
+prefetched trips / bookings, so the number of queries does not depend on the
+number of trips or bookings.
+
+The approval chain is written with one bulk_create (create_approval_flows)
+and the submission notification is sent only once the transaction has
+committed (on_submitted). Completion needs no scheduling: the sweeper in
+business_logic.completion picks the application up by its travel_end_date.
+"""
+
+import logging
+
+from django.db import transaction
+from django.db.models import Prefetch
+from django.utils import timezone
+
+from .approver_inbox import record_flows_created
+
+logger = logging.getLogger(__name__)
+
+# Minimum days between booking and departure before a warning is shown
+ADVANCE_BOOKING_DAYS = {"flight": 7, "train": 3}
+
+
+def load_submission_snapshot(pk, employee):
+    """
+    The employee's draft application pk with everything submission reads, or None:
+    employee grade / reporting manager, trips with locations (and destination
+    category), bookings with booking type and sub option.
+    """
+    from apps.travel.models import Booking, TravelApplication, TripDetails
+
+    bookings = Booking.objects.select_related("booking_type", "sub_option")
+    trips = TripDetails.objects.select_related(
+        "from_location", "to_location__category"
+    ).prefetch_related(Prefetch("bookings", queryset=bookings))
+
+    return (
+        TravelApplication.objects
+        .filter(pk=pk, employee=employee, status="draft")
+        .select_related("employee__grade", "employee__organizational_profile__reporting_manager")
+        .prefetch_related(Prefetch("trip_details", queryset=trips))
+        .first()
+    )
+
+
+def advance_booking_warnings(travel_app, today=None):
+    """Warnings for flight / train bookings made too close to departure."""
+    today = today or timezone.now().date()
+    warnings = []
+
+    for trip in travel_app.trip_details.all():
+        if not trip.departure_date:
+            continue
+
+        days_ahead = (trip.departure_date - today).days
+
+        for booking in trip.bookings.all():
+            mode = booking.booking_type.name.lower()
+
+            for mode_key, min_days in ADVANCE_BOOKING_DAYS.items():
+                if mode_key in mode and days_ahead < min_days:
+                    label = mode_key.capitalize()
+                    warnings.append({
+                        "type": "advance_booking_violation",
+                        "mode": label,
+                        "message": f"{label} booking is only {days_ahead} days ahead (policy: {min_days} days minimum)",
+                        "severity": "warning"
+                    })
+    return warnings
+
+
+def create_approval_flows(travel_app, entries, **fields):
+    """
+    Persist one TravelApprovalFlow per ApproverEntry with a single bulk_create
+    and count them in the approver inbox counters. fields override the
+    defaults for every row (e.g. status / approved_at for self-approval).
+    """
+    from apps.travel.models import TravelApprovalFlow
+
+    flows = [
+        TravelApprovalFlow(**{
+            "travel_application": travel_app,
+            "approver": entry.user,
+            "approval_level": entry.level,
+            "sequence": entry.sequence,
+            "status": "pending",
+            "can_view": entry.can_view,
+            "can_approve": entry.can_approve,
+            "is_required": entry.is_required,
+            **fields,
+        })
+        for entry in entries
+    ]
+    flows = TravelApprovalFlow.objects.bulk_create(flows)
+    record_flows_created(flows)
+    return flows
+
+
+def _notify_submitted(travel_app, employee):
+    try:
+        from apps.notifications.center import NotificationCenter
+        NotificationCenter.notify(
+            event_name="travel.submitted",
+            reference={"type": "TravelRequest", "id": travel_app.id},
+            payload={
+                "employee_id": employee.id,
+                "approver_id": travel_app.current_approver.id,
+                "request_id": travel_app.get_travel_request_id(),
+                "employee_name": employee.get_full_name(),
+                "approver_name": travel_app.current_approver.get_full_name(),
+                "purpose": travel_app.purpose,
+                "urgency": "high"
+            }
+        )
+    except Exception as e:
+        logger.warning(f"[SubmitView] Email sending failed: {e}")
+
+
+def on_submitted(travel_app, employee):
+    """Side effects of a submission routed to approvers, run after commit."""
+    transaction.on_commit(lambda: _notify_submitted(travel_app, employee))
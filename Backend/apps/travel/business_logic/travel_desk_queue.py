@@ -0,0 +1,57 @@
+"""
+Travel desk queue read model
+
+Everything TravelDeskApplicationListSerializer shows for an application is
+attached to the queryset up front, so a page of the travel desk queue costs
+two queries however many applications are open:
+
+  - booking counters: conditional Count() annotations
+    (total_bookings, pending_bookings, booked_bookings);
+  - employee_grade: annotated from the employee's grade;
+  - the first trip (lowest id) with both locations and their states joined:
+    Prefetch -> FIRST_TRIP_ATTR.
+"""
+
+from django.db.models import Count, F, OuterRef, Prefetch, Q, Subquery
+
+PENDING_BOOKING_STATUSES = ["pending", "requested"]
+BOOKED_BOOKING_STATUSES = ["confirmed", "completed"]
+
+# Attribute holding [first trip] (or []), read by TravelDeskApplicationListSerializer
+FIRST_TRIP_ATTR = "first_trips"
+
+
+def first_trip_prefetch(lookup="trip_details"):
+    """
+    Only the first trip of each application, locations and states pre-joined.
+    lookup is the path to the applications' trips (e.g. travel_application__trip_details).
+    """
+    from apps.travel.models import TripDetails
+
+    first_ids = TripDetails.objects.filter(
+        travel_application=OuterRef("travel_application")
+    ).order_by("id").values("id")[:1]
+
+    return Prefetch(
+        lookup,
+        queryset=TripDetails.objects.filter(id=Subquery(first_ids)).select_related(
+            "from_location__state", "to_location__state"
+        ),
+        to_attr=FIRST_TRIP_ATTR,
+    )
+
+
+def with_desk_queue_annotations(queryset):
+    """Annotate counters / grade and prefetch the first trip for the list serializer."""
+    return queryset.select_related("employee").annotate(
+        employee_grade=F("employee__grade__name"),
+        total_bookings=Count("trip_details__bookings"),
+        pending_bookings=Count(
+            "trip_details__bookings",
+            filter=Q(trip_details__bookings__status__in=PENDING_BOOKING_STATUSES),
+        ),
+        booked_bookings=Count(
+            "trip_details__bookings",
+            filter=Q(trip_details__bookings__status__in=BOOKED_BOOKING_STATUSES),
+        ),
+    ).prefetch_related(first_trip_prefetch())
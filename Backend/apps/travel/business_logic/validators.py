@@ -9,31 +9,19 @@ from rest_framework import serializers
 
 # models imports (assumes these models exist in your project)
 from apps.master_data.models import (
-    TravelPolicyMaster,
-    GradeEntitlementMaster,
     DAIncidentalMaster,
     ConveyanceRateMaster
 )
 from apps.travel.models import TravelApplication
+from apps.travel.business_logic.policy_index import effective_policies
+from apps.travel.business_logic.entitlement_index import entitlement_index
 
 
 # --- helpers -----------------------------------------------------------------
 
 def _get_policy(policy_type, travel_mode=None, grade=None):
     """Return active policy matching filters, or None. Policy lookup is permissive."""
-    today = timezone.now().date()
-    qs = TravelPolicyMaster.objects.filter(
-        policy_type=policy_type,
-        is_active=True,
-        effective_from__lte=today
-    ).filter(Q(effective_to__isnull=True) | Q(effective_to__gte=today))
-
-    if travel_mode:
-        qs = qs.filter(travel_mode=travel_mode)
-    if grade:
-        qs = qs.filter(employee_grade=grade)
-
-    return qs.order_by('-effective_from').first()
+    return effective_policies().latest(policy_type, travel_mode=travel_mode, grade=grade)
 
 
 # --- advance booking --------------------------------------------------------
@@ -62,19 +50,14 @@ def validate_advance_booking(departure_date, mode_name, estimated_cost=0):
     # Use TravelPolicyMaster if present else fallbacks
     # flight default = 7 days; train default = 3 days
     if "flight" in mode:
-        # Get policy without travel_mode filter first
-        policies = TravelPolicyMaster.objects.filter(
-            policy_type="advance_booking",
-            is_active=True,
-            effective_from__lte=today
-        ).filter(Q(effective_to__isnull=True) | Q(effective_to__gte=today))
+        policies = effective_policies()
 
         # Try to find Flight-specific policy
-        policy = policies.filter(travel_mode__name__iexact="Flight").first()
+        policy = next(iter(policies.find("advance_booking", mode_name="Flight")), None)
     
         # Fallback to any advance_booking policy
         if not policy:
-            policy = policies.first()
+            policy = next(iter(policies.find("advance_booking")), None)
 
         required_days = None
         if policy and policy.rule_parameters.get("days") is not None:
@@ -93,14 +76,7 @@ def validate_advance_booking(departure_date, mode_name, estimated_cost=0):
 
     elif "train" in mode:
         # policy = _get_policy("advance_booking", travel_mode__name__iexact="Train")
-        policy = TravelPolicyMaster.objects.filter(
-            policy_type="advance_booking",
-            travel_mode__name__iexact="Train",
-            is_active=True,
-            effective_from__lte=today
-        ).filter(
-            Q(effective_to__isnull=True) | Q(effective_to__gte=today)
-        ).order_by('-effective_from').first()
+        policy = effective_policies().latest("advance_booking", mode_name="Train")
         required_days = None
         if policy and policy.rule_parameters.get("hours") is not None:
             # some policies may be stored in hours
@@ -125,15 +101,22 @@ def validate_advance_booking(departure_date, mode_name, estimated_cost=0):
 
 # --- entitlement -------------------------------------------------------------
 
+def _grade_id(employee):
+    grade_id = getattr(employee, "grade_id", None)
+    if grade_id is None and getattr(employee, "grade", None) is not None:
+        grade_id = employee.grade.pk
+    return grade_id
+
+
 def validate_travel_entitlement(employee, booking_type, sub_option, city_category=None):
     """
-    Validates entitlement based on GradeEntitlementMaster.
+    Validates entitlement based on GradeEntitlementMaster (via the in-memory entitlement index).
     No unexpected filter args, safe for all booking modes.
     """
 
     # --- Grade Handling ---
-    grade = getattr(employee, "grade", None)
-    if not grade:
+    grade_id = _grade_id(employee)
+    if not grade_id:
         raise serializers.ValidationError("Employee grade not assigned.")
 
     # --- Normalize Mode Name (Flight/Train/Car/etc) ---
@@ -143,29 +126,18 @@ def validate_travel_entitlement(employee, booking_type, sub_option, city_categor
     else:
         mode_name = str(booking_type)
 
-    # --- Base Query ---
-    qs = GradeEntitlementMaster.objects.filter(
-        grade=grade,
-        sub_option=sub_option,
-        sub_option__mode__name__iexact=mode_name
+    index = entitlement_index.get()
+    sub_option_id = getattr(sub_option, "pk", sub_option)
+    entitlement = index.lookup(
+        grade_id, sub_option_id, index.category_id(city_category), mode_name=mode_name
     )
 
-    # --- City Category Condition ---
-    if city_category:
-        if hasattr(city_category, "name"):
-            qs = qs.filter(city_category__name__iexact=city_category.name)
-        elif hasattr(city_category, "id"):
-            qs = qs.filter(city_category=city_category.id)
-        else:
-            qs = qs.filter(city_category__name__iexact=str(city_category))
-
-    entitlement = qs.first()
-
     # --- Not Allowed Case ---
     if not entitlement or not entitlement.is_allowed:
+        sub = index.sub_options.get(sub_option_id)
         raise serializers.ValidationError(
-            f"Booking not permitted for grade '{grade.name}' "
-            f"and travel option '{sub_option.name}'."
+            f"Booking not permitted for grade '{employee.grade.name}' "
+            f"and travel option '{sub.name if sub else sub_option_id}'."
         )
 
     # --- Optional max_amount enforcement (kept disabled for now) ---
@@ -177,47 +149,74 @@ def validate_travel_entitlement(employee, booking_type, sub_option, city_categor
 
     return True
 
-'''
-def validate_travel_entitlement(employee, booking_type, sub_option, city_category):
+
+def check_booking_entitlement(employee, booking_type, sub_option, city_category=None):
     """
-    Validate grade entitlement for a booking's sub-option and city category.
-    Raises ValidationError if not entitled.
+    Non-raising variant of validate_travel_entitlement.
+    Returns (is_allowed, max_amount, message).
     """
-    # booking_type: TravelModeMaster instance or object with .id
-    # sub_option: TravelSubOptionMaster instance
-    # city_category: CityCategory instance or id or name
+    try:
+        validate_travel_entitlement(employee, booking_type, sub_option, city_category)
+    except serializers.ValidationError as e:
+        return False, None, " ".join(str(m) for m in e.detail)
 
-    grade = getattr(employee, "grade", None)
-    if not grade:
-        raise serializers.ValidationError("Employee grade not assigned.")
+    index = entitlement_index.get()
+    entitlement = index.lookup(
+        _grade_id(employee), getattr(sub_option, "pk", sub_option), index.category_id(city_category)
+    )
+    return True, entitlement.max_amount, "Booking permitted."
 
-    grade_id = grade.id if hasattr(grade, "id") else grade
-    sub_option_id = sub_option.id if hasattr(sub_option, "id") else sub_option
 
-    # Lookup GradeEntitlementMaster
-    ent_qs = GradeEntitlementMaster.objects.filter(
-        grade=grade_id,
-        sub_option=sub_option_id,
-    )
+def check_booking_entitlements(employee, bookings):
+    """
+    Check many bookings of one draft in a single pass, without touching the database.
+    bookings: iterable of dicts with sub_option_id, city_category_id (id or name)
+              and optional estimated_cost / mode_name.
+    Returns a list of result dicts in the same order.
+    """
+    index = entitlement_index.get()
+    grade_id = _grade_id(employee)
+    results = []
+
+    for position, row in enumerate(bookings):
+        sub_option_id = index.sub_option_id(row.get("sub_option_id"))
+        result = {
+            "index": position,
+            "sub_option_id": sub_option_id,
+            "is_allowed": False,
+            "max_amount": None,
+            "exceeds_max_amount": False,
+        }
+        sub = index.sub_options.get(sub_option_id)
 
-    # city_category could be nullable; handle accordingly
-    if city_category:
-        if hasattr(city_category, "id"):
-            ent_qs = ent_qs.filter(city_category=city_category.id)
+        if not grade_id:
+            result["message"] = "Employee grade not assigned."
+        elif sub is None:
+            result["message"] = "Unknown travel option."
         else:
-            ent_qs = ent_qs.filter(city_category=city_category)
-
-    ent = ent_qs.first()
-    if not ent or not getattr(ent, "is_allowed", False):
-        raise serializers.ValidationError(
-            f"Booking not allowed for grade '{grade.name}' and selected option."
-        )
+            result["sub_option_name"] = sub.name
+            result["mode"] = sub.mode_name
+            entitlement = index.lookup(
+                grade_id, sub.id, index.category_id(row.get("city_category_id")), mode_name=row.get("mode_name")
+            )
+            if not entitlement or not entitlement.is_allowed:
+                result["message"] = f"Booking not permitted for travel option '{sub.name}'."
+            else:
+                result["is_allowed"] = True
+                result["max_amount"] = entitlement.max_amount
+                result["message"] = "Booking permitted."
+                cost = row.get("estimated_cost")
+                if cost not in (None, "") and entitlement.max_amount:
+                    try:
+                        if Decimal(str(cost)) > entitlement.max_amount:
+                            result["exceeds_max_amount"] = True
+                            result["message"] = f"Estimated cost exceeds entitlement limit ({entitlement.max_amount})."
+                    except Exception:
+                        pass
+        results.append(result)
+
+    return results
 
-    # enforce max_amount if configured
-    # if ent.max_amount and ent.max_amount > Decimal('0'):
-        # booking estimated cost must not exceed max_amount
-        # calling code should pass estimated cost if needed. We keep check optional here.
-'''
 
 # --- own car & safety -------------------------------------------------------
 
@@ -0,0 +1,101 @@
+"""Export specs for travel applications and bookings (see utils.exports)."""
+
+from apps.travel.models import TravelApplication, Booking
+from apps.travel.views.filters import TravelApplicationFilter
+from utils.exports import ExportSpec, choice_label, column, full_name
+
+# Roles that export every application / booking; others export their own
+EXPORT_ALL_ROLES = ("Admin", "Finance", "CHRO", "CEO", "Travel Desk")
+
+
+def _exports_all(user):
+    return user.is_staff or any(user.has_role(role) for role in EXPORT_ALL_ROLES)
+
+
+def scope_applications(queryset, user):
+    return queryset if _exports_all(user) else queryset.filter(employee=user)
+
+
+def scope_bookings(queryset, user):
+    return queryset if _exports_all(user) else queryset.filter(trip_details__travel_application__employee=user)
+
+
+def filter_applications(queryset, params, user):
+    """TravelApplicationFilter (including ?search), as in TravelApplicationListCreateView."""
+    return TravelApplicationFilter(params, queryset=queryset).qs
+
+
+def filter_bookings(queryset, params, user):
+    """Query params of BookingListAPIView."""
+    employee_id = params.get("employee_id")
+    application_id = params.get("application_id")
+    status = params.get("status")
+    booking_type = params.get("booking_type")
+
+    if employee_id:
+        queryset = queryset.filter(trip_details__travel_application__employee_id=employee_id)
+    if application_id:
+        queryset = queryset.filter(trip_details__travel_application_id=application_id)
+    if status:
+        queryset = queryset.filter(status=status)
+    if booking_type:
+        queryset = queryset.filter(booking_type_id=booking_type)
+    return queryset
+
+
+def travel_request_id(pk, created_at):
+    """TravelApplication.get_travel_request_id() from values()."""
+    return f"TSF-TR-{created_at.year}-{pk:06d}" if pk and created_at else None
+
+
+APPLICATION_EXPORT = ExportSpec(
+    name="travel_applications",
+    model=TravelApplication,
+    columns=[
+        column("ID", "id"),
+        column("Travel Request ID", "id", "created_at", format=travel_request_id),
+        column("Employee", "employee__username"),
+        column("Employee Name", "employee__first_name", "employee__last_name", format=full_name),
+        column("Grade", "employee__grade__name"),
+        column("Purpose", "purpose"),
+        column("Internal Order", "internal_order"),
+        column("GL Code", "general_ledger__gl_code"),
+        column("Sanction Number", "sanction_number"),
+        column("Advance Amount", "advance_amount"),
+        column("Estimated Total Cost", "estimated_total_cost"),
+        column("Status", "status", format=choice_label(TravelApplication.STATUS_CHOICES)),
+        column("Settled", "is_settled"),
+        column("Created At", "created_at"),
+        column("Submitted At", "submitted_at"),
+        column("Booking Completed At", "booking_completed_at"),
+    ],
+    filter=filter_applications,
+    scope=scope_applications,
+)
+
+BOOKING_EXPORT = ExportSpec(
+    name="bookings",
+    model=Booking,
+    columns=[
+        column("ID", "id"),
+        column(
+            "Travel Request ID",
+            "trip_details__travel_application_id", "trip_details__travel_application__created_at",
+            format=travel_request_id,
+        ),
+        column("Employee", "trip_details__travel_application__employee__username"),
+        column("From", "trip_details__from_location__city_name"),
+        column("To", "trip_details__to_location__city_name"),
+        column("Departure Date", "trip_details__departure_date"),
+        column("Return Date", "trip_details__return_date"),
+        column("Mode", "booking_type__name"),
+        column("Sub Option", "sub_option__name"),
+        column("Status", "status", format=choice_label(Booking.BOOKING_STATUS_CHOICES)),
+        column("Estimated Cost", "estimated_cost"),
+        column("Actual Cost", "actual_cost"),
+        column("Booking Reference", "booking_reference"),
+        column("Vendor Reference", "vendor_reference"),
+    ],
+    filter=filter_bookings,
+    scope=scope_bookings,
+)
@@ -0,0 +1,20 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from utils.audit import AUDIT_ARCHIVE_BATCH_SIZE, AUDIT_LOG_RETENTION_DAYS, archive_audit_logs
+
+
+class Command(BaseCommand):
+    help = 'Move audit log rows older than the retention period to the audit log archive'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=AUDIT_LOG_RETENTION_DAYS,
+                            help='Keep this many days of audit logs')
+        parser.add_argument('--batch-size', type=int, default=AUDIT_ARCHIVE_BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        before = timezone.now() - timedelta(days=options['days'])
+        moved = archive_audit_logs(before=before, batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'Archived {moved} audit log rows older than {before:%Y-%m-%d}'))
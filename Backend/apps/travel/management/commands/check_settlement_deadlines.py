@@ -1,24 +1,32 @@
 from django.core.management.base import BaseCommand
-from django.utils import timezone
-from apps.travel.models import TravelApplication
+from apps.travel.business_logic.completion import (
+    SWEEP_BATCH_SIZE, due_for_completion, overdue_settlements, sweep_travel_completion,
+)
+
 
 class Command(BaseCommand):
-    help = 'Check and notify overdue settlement deadlines'
+    help = 'Complete finished travel and send overdue settlement reminders (same sweep as celery beat)'
 
-    def handle(self, *args, **options):
-        today = timezone.now().date()
-        
-        overdue_apps = TravelApplication.objects.filter(
-            status='completed',
-            is_settled=False,
-            settlement_due_date__lt=today
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=SWEEP_BATCH_SIZE)
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Only list the applications the sweep would touch',
         )
-        
-        for app in overdue_apps:
-            self.stdout.write(f'OVERDUE: {app.get_travel_request_id()} - {app.employee.username}')
-            
-            # Send reminder email
-            from apps.notifications.services import EmailNotificationService
-            # TODO: Create settlement reminder template
-            
-        self.stdout.write(self.style.SUCCESS(f'Found {overdue_apps.count()} overdue settlements'))
\ No newline at end of file
+
+    def handle(self, *args, **options):
+        if options['dry_run']:
+            due = due_for_completion().select_related('employee')
+            overdue = overdue_settlements().select_related('employee')
+            for app in due:
+                self.stdout.write(f'DUE: {app.get_travel_request_id()} - {app.employee.username}')
+            for app in overdue:
+                self.stdout.write(f'OVERDUE: {app.get_travel_request_id()} - {app.employee.username}')
+            return
+
+        summary = sweep_travel_completion(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(
+            f"Completed {summary['completed']} applications, "
+            f"sent {summary['settlement_reminders']} overdue settlement reminders"
+        ))
@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+from apps.travel.business_logic.analytics_rollups import refresh_travel_rollups
+
+
+class Command(BaseCommand):
+    help = 'Rebuild (or incrementally refresh) the travel analytics rollup tables'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--incremental',
+            action='store_true',
+            help='Only recompute days changed since the last refresh',
+        )
+
+    def handle(self, *args, **options):
+        summary = refresh_travel_rollups(full=not options['incremental'])
+        self.stdout.write(self.style.SUCCESS(f'Travel rollups refreshed: {summary}'))
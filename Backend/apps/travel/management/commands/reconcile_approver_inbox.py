@@ -0,0 +1,36 @@
+from django.core.management.base import BaseCommand
+from apps.travel.business_logic.approver_inbox import TOTAL_FIELDS, rebuild_inbox_stats
+from apps.travel.models import ApproverInboxStats
+
+
+class Command(BaseCommand):
+    help = 'Recompute the approver inbox counters from the approval flows'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--approver',
+            type=int,
+            action='append',
+            dest='approvers',
+            help='Only this approver (user id); may be repeated',
+        )
+
+    def _snapshot(self, approvers):
+        rows = ApproverInboxStats.objects.all()
+        if approvers:
+            rows = rows.filter(pk__in=approvers)
+        return {row[0]: row[1:] for row in rows.values_list('approver_id', *TOTAL_FIELDS)}
+
+    def handle(self, *args, **options):
+        approvers = options['approvers']
+        before = self._snapshot(approvers)
+        rows = rebuild_inbox_stats(approvers)
+        after = self._snapshot(approvers)
+
+        drifted = [pk for pk, values in after.items() if before.get(pk) != values]
+        drifted += [pk for pk in before if pk not in after]
+        for pk in drifted:
+            self.stdout.write(f'Approver {pk}: {before.get(pk)} -> {after.get(pk)}')
+        self.stdout.write(self.style.SUCCESS(
+            f'Approver inbox counters rebuilt for {rows} approvers ({len(drifted)} corrected)'
+        ))
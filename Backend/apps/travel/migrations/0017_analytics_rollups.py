@@ -0,0 +1,84 @@
+# Generated by Django 5.2.6 on 2026-10-17 00:25
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('master_data', '0016_alter_glcodemaster_description'),
+        ('travel', '0016_merge_20251212_1004'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AnalyticsWatermark',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=50, unique=True)),
+                ('value', models.DateTimeField()),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='ApprovalLatencyDailyRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('bucket_hours', models.PositiveIntegerField(blank=True, null=True)),
+                ('approval_count', models.PositiveIntegerField(default=0)),
+                ('total_seconds', models.BigIntegerField(default=0)),
+            ],
+            options={
+                'ordering': ['day', 'bucket_hours'],
+                'indexes': [models.Index(fields=['day'], name='travel_appr_day_5c8e09_idx')],
+                'unique_together': {('day', 'bucket_hours')},
+            },
+        ),
+        migrations.CreateModel(
+            name='TravelStatusDailyRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('status', models.CharField(max_length=30)),
+                ('application_count', models.PositiveIntegerField(default=0)),
+                ('estimated_cost_total', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+            ],
+            options={
+                'ordering': ['day', 'status'],
+                'indexes': [models.Index(fields=['day'], name='travel_trav_day_da8706_idx')],
+                'unique_together': {('day', 'status')},
+            },
+        ),
+        migrations.CreateModel(
+            name='TravelDepartmentDailyRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('status', models.CharField(max_length=30)),
+                ('application_count', models.PositiveIntegerField(default=0)),
+                ('estimated_cost_total', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('department', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='travel_rollups', to='master_data.departmentmaster')),
+            ],
+            options={
+                'ordering': ['day'],
+                'indexes': [models.Index(fields=['day', 'status'], name='travel_trav_day_52a17a_idx')],
+                'unique_together': {('day', 'department', 'status')},
+            },
+        ),
+        migrations.CreateModel(
+            name='TravelDestinationDailyRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('trip_count', models.PositiveIntegerField(default=0)),
+                ('city', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='travel_rollups', to='master_data.citymaster')),
+            ],
+            options={
+                'ordering': ['day'],
+                'indexes': [models.Index(fields=['day'], name='travel_trav_day_ff7e8b_idx')],
+                'unique_together': {('day', 'city')},
+            },
+        ),
+    ]
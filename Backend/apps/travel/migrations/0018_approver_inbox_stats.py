@@ -0,0 +1,34 @@
+# Generated by Django 5.2.6 on 2026-10-17 00:55
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('authentication', '0011_organizationalprofile_organizatio_employe_104b31_idx_and_more'),
+        ('travel', '0017_analytics_rollups'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ApproverInboxStats',
+            fields=[
+                ('approver', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='inbox_stats', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('pending_count', models.PositiveIntegerField(default=0)),
+                ('actionable_count', models.PositiveIntegerField(default=0)),
+                ('pending_budget', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('approved_count', models.PositiveIntegerField(default=0)),
+                ('rejected_count', models.PositiveIntegerField(default=0)),
+                ('approval_seconds', models.BigIntegerField(default=0)),
+                ('day', models.DateField(blank=True, null=True)),
+                ('approved_today', models.PositiveIntegerField(default=0)),
+                ('month', models.DateField(blank=True, null=True)),
+                ('approved_this_month', models.PositiveIntegerField(default=0)),
+                ('decided_this_month', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
@@ -0,0 +1,62 @@
+# Generated by Django 5.2.6 on 2026-10-17 01:00
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Max, OuterRef, Subquery
+
+
+def backfill_travel_end_date(apps, schema_editor):
+    TravelApplication = apps.get_model('travel', 'TravelApplication')
+    TripDetails = apps.get_model('travel', 'TripDetails')
+    last_return = (
+        TripDetails.objects.filter(travel_application=OuterRef('pk'))
+        .order_by().values('travel_application')
+        .annotate(last=Max('return_date')).values('last')
+    )
+    TravelApplication.objects.exclude(status='draft').update(travel_end_date=Subquery(last_return))
+
+
+def remove_legacy_completion_tasks(apps, schema_editor):
+    """Drop the one-off beat tasks the old per-application scheduling left behind."""
+    PeriodicTask = apps.get_model('django_celery_beat', 'PeriodicTask')
+    ClockedSchedule = apps.get_model('django_celery_beat', 'ClockedSchedule')
+    legacy = PeriodicTask.objects.filter(
+        name__startswith='travel_complete_',
+        task='notifications.tasks.mark_travel_as_completed',
+    )
+    clocked_ids = list(legacy.values_list('clocked_id', flat=True))
+    legacy.delete()
+    ClockedSchedule.objects.filter(pk__in=clocked_ids, periodictask__isnull=True).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('django_celery_beat', '0014_remove_clockedschedule_enabled'),
+        ('master_data', '0016_alter_glcodemaster_description'),
+        ('travel', '0018_approver_inbox_stats'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='travelapplication',
+            name='settlement_reminded_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='travelapplication',
+            name='travel_end_date',
+            field=models.DateField(blank=True, help_text='Latest trip return date (drives automatic completion)', null=True),
+        ),
+        migrations.AddIndex(
+            model_name='travelapplication',
+            index=models.Index(fields=['status', 'travel_end_date'], name='travel_trav_status_6be74f_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='travelapplication',
+            index=models.Index(fields=['status', 'is_settled', 'settlement_due_date'], name='travel_trav_status_160697_idx'),
+        ),
+        migrations.RunPython(backfill_travel_end_date, migrations.RunPython.noop),
+        migrations.RunPython(remove_legacy_completion_tasks, migrations.RunPython.noop),
+    ]
@@ -1,11 +1,17 @@
 from .application import TravelApplication, TripDetails
 from .booking import Booking, BookingAssignment, BookingNote
-from .approval import TravelApprovalFlow
+from .approval import TravelApprovalFlow, ApproverInboxStats
 from .booking_extended import *
 from .travel_advance import *
+from .analytics import (
+    TravelStatusDailyRollup, TravelDepartmentDailyRollup, TravelDestinationDailyRollup,
+    ApprovalLatencyDailyRollup, AnalyticsWatermark,
+)
 
 __all__ = [
-    'TravelApplication', 'TripDetails', 'Booking', 'TravelApprovalFlow', 
+    'TravelApplication', 'TripDetails', 'Booking', 'TravelApprovalFlow', 'ApproverInboxStats',
     'BookingAssignment', 'BookingNote',
-    'AccommodationBooking', 'VehicleBooking', 'TravelDocument', 'TravelAdvanceRequest'
+    'AccommodationBooking', 'VehicleBooking', 'TravelDocument', 'TravelAdvanceRequest',
+    'TravelStatusDailyRollup', 'TravelDepartmentDailyRollup', 'TravelDestinationDailyRollup',
+    'ApprovalLatencyDailyRollup', 'AnalyticsWatermark',
 ]
\ No newline at end of file
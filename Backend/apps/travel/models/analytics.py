@@ -0,0 +1,105 @@
+from django.db import models
+
+
+class TravelStatusDailyRollup(models.Model):
+    """
+    Applications created per day, grouped by current status.
+    Maintained by apps.travel.business_logic.analytics_rollups.
+    """
+    day = models.DateField()
+    status = models.CharField(max_length=30)
+    application_count = models.PositiveIntegerField(default=0)
+    estimated_cost_total = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+
+    class Meta:
+        unique_together = ('day', 'status')
+        ordering = ['day', 'status']
+        indexes = [
+            models.Index(fields=['day']),
+        ]
+
+    def __str__(self):
+        return f"{self.day} {self.status}: {self.application_count}"
+
+
+class TravelDepartmentDailyRollup(models.Model):
+    """
+    Applications created per day, grouped by the employee's department and current status.
+    """
+    day = models.DateField()
+    department = models.ForeignKey(
+        'master_data.DepartmentMaster',
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name='travel_rollups'
+    )
+    status = models.CharField(max_length=30)
+    application_count = models.PositiveIntegerField(default=0)
+    estimated_cost_total = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+
+    class Meta:
+        unique_together = ('day', 'department', 'status')
+        ordering = ['day']
+        indexes = [
+            models.Index(fields=['day', 'status']),
+        ]
+
+    def __str__(self):
+        return f"{self.day} {self.department_id} {self.status}: {self.application_count}"
+
+
+class TravelDestinationDailyRollup(models.Model):
+    """
+    Trip segments per destination city, by the creation day of their application.
+    """
+    day = models.DateField()
+    city = models.ForeignKey(
+        'master_data.CityMaster',
+        on_delete=models.CASCADE,
+        related_name='travel_rollups'
+    )
+    trip_count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        unique_together = ('day', 'city')
+        ordering = ['day']
+        indexes = [
+            models.Index(fields=['day']),
+        ]
+
+    def __str__(self):
+        return f"{self.day} {self.city_id}: {self.trip_count}"
+
+
+class ApprovalLatencyDailyRollup(models.Model):
+    """
+    Histogram of approval latency (approved_at - created_at) per approval day.
+    bucket_hours is the bucket's upper bound in hours; NULL is the overflow bucket.
+    """
+    day = models.DateField()
+    bucket_hours = models.PositiveIntegerField(null=True, blank=True)
+    approval_count = models.PositiveIntegerField(default=0)
+    total_seconds = models.BigIntegerField(default=0)
+
+    class Meta:
+        unique_together = ('day', 'bucket_hours')
+        ordering = ['day', 'bucket_hours']
+        indexes = [
+            models.Index(fields=['day']),
+        ]
+
+    def __str__(self):
+        return f"{self.day} <= {self.bucket_hours}h: {self.approval_count}"
+
+
+class AnalyticsWatermark(models.Model):
+    """
+    High-water mark of the last successful incremental rollup refresh.
+    """
+    name = models.CharField(max_length=50, unique=True)
+    value = models.DateTimeField()
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.name} @ {self.value}"
@@ -93,6 +93,12 @@ class TravelApplication(models.Model):
     status = models.CharField(max_length=30, choices=STATUS_CHOICES, default='draft')
     is_settled = models.BooleanField(default=False)
     settlement_due_date = models.DateField(null=True, blank=True)
+    travel_end_date = models.DateField(
+        null=True,
+        blank=True,
+        help_text="Latest trip return date (drives automatic completion)",
+    )
+    settlement_reminded_at = models.DateTimeField(null=True, blank=True)
 
     # Cancellation
     cancellation_requested_at = models.DateTimeField(null=True, blank=True)
@@ -150,6 +156,8 @@ class TravelApplication(models.Model):
             models.Index(fields=['employee', 'status']),
             models.Index(fields=['status', 'current_approver']),
             models.Index(fields=['created_at']),
+            models.Index(fields=['status', 'travel_end_date']),
+            models.Index(fields=['status', 'is_settled', 'settlement_due_date']),
         ]
     
     def __str__(self):
@@ -193,16 +201,20 @@ class TravelApplication(models.Model):
                     return True
         return False
     
-    def set_settlement_due_date(self):
-        """Set settlement due date (30 days after latest return date)"""
-        latest_return = self.trip_details.aggregate(
-            max_date=models.Max('return_date')
-        )['max_date']
+    def set_settlement_due_date(self, save=True):
+        """Set travel end date and settlement due date (30 days after latest return date)"""
+        # Read from trip_details.all() so prefetched trips are reused
+        latest_return = max(
+            (trip.return_date for trip in self.trip_details.all() if trip.return_date),
+            default=None
+        )
         
         if latest_return:
             from datetime import timedelta
+            self.travel_end_date = latest_return
             self.settlement_due_date = latest_return + timedelta(days=30)
-            self.save(update_fields=['settlement_due_date'])
+            if save:
+                self.save(update_fields=['travel_end_date', 'settlement_due_date'])
 
     def update_status_after_approval(self, approved_flow):
         """
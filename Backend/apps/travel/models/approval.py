@@ -78,10 +78,14 @@ class TravelApprovalFlow(models.Model):
     
     def approve(self, notes=""):
         """Approve this step and trigger next approval"""
+        from apps.travel.business_logic.approver_inbox import record_decision
+
+        previous_status = self.status
         self.status = 'approved'
         self.approved_at = timezone.now()
         self.notes = notes
         self.save()
+        record_decision(self, previous_status)
 
         # Check if parallel approvals are complete
         if self.parallel_group:
@@ -94,11 +98,53 @@ class TravelApprovalFlow(models.Model):
     
     def reject(self, notes=""):
         """Reject application"""
+        from apps.travel.business_logic.approver_inbox import record_decision
+
+        previous_status = self.status
         self.status = 'rejected'
         self.approved_at = timezone.now()
         self.notes = notes
         self.save()
+        record_decision(self, previous_status)
         
         # Update travel application status to rejected
         self.travel_application.status = f'rejected_{self.approval_level}'
-        self.travel_application.save()
\ No newline at end of file
+        self.travel_application.save()
+
+class ApproverInboxStats(models.Model):
+    """
+    Per-approver counters behind the approval dashboards, kept in step with
+    TravelApprovalFlow by apps.travel.business_logic.approver_inbox (flow
+    creation, approve, reject) and reconciled by the reconcile_approver_inbox
+    command.
+
+    approved_today / approved_this_month / decided_this_month count decisions
+    in the window starting on day / month; a stale window reads as zero and is
+    restarted by the next decision.
+    """
+    approver = models.OneToOneField(
+        'authentication.User',
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='inbox_stats'
+    )
+    pending_count = models.PositiveIntegerField(default=0)
+    # pending flows with can_approve
+    actionable_count = models.PositiveIntegerField(default=0)
+    # estimated_total_cost of the applications behind pending flows
+    pending_budget = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    approved_count = models.PositiveIntegerField(default=0)
+    rejected_count = models.PositiveIntegerField(default=0)
+    # sum of approved_at - created_at over approved flows
+    approval_seconds = models.BigIntegerField(default=0)
+
+    day = models.DateField(null=True, blank=True)
+    approved_today = models.PositiveIntegerField(default=0)
+    month = models.DateField(null=True, blank=True)
+    approved_this_month = models.PositiveIntegerField(default=0)
+    decided_this_month = models.PositiveIntegerField(default=0)
+
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.approver_id}: {self.pending_count} pending"
@@ -1,4 +1,5 @@
 from django.db import models
+from django.utils import timezone
 from django.contrib.contenttypes.models import ContentType
 from django.contrib.contenttypes.fields import GenericForeignKey
 
@@ -22,7 +23,8 @@ class AuditLog(models.Model):
     
     user = models.ForeignKey('authentication.User', on_delete=models.SET_NULL, null=True)
     action = models.CharField(max_length=30, choices=ACTION_CHOICES)
-    timestamp = models.DateTimeField(auto_now_add=True)
+    # Set when the action happens, not when a buffered row is written
+    timestamp = models.DateTimeField(default=timezone.now, editable=False)
     
     # Generic relation to any model
     content_type = models.ForeignKey(ContentType, on_delete=models.CASCADE)
@@ -39,7 +41,37 @@ class AuditLog(models.Model):
         indexes = [
             models.Index(fields=['content_type', 'object_id']),
             models.Index(fields=['user', '-timestamp']),
+            models.Index(fields=['timestamp']),
         ]
     
     def __str__(self):
-        return f"{self.user} {self.action} {self.content_object} at {self.timestamp}"
\ No newline at end of file
+        return f"{self.user} {self.action} {self.content_object} at {self.timestamp}"
+
+
+class AuditLogArchive(models.Model):
+    """
+    AuditLog rows older than the retention period (see
+    utils.audit.archive_audit_logs). Ids are kept from AuditLog; user and
+    content type are plain ids so archived rows outlive what they refer to.
+    """
+
+    id = models.BigIntegerField(primary_key=True)
+    user_id = models.BigIntegerField(null=True, blank=True)
+    action = models.CharField(max_length=30)
+    timestamp = models.DateTimeField()
+    content_type_id = models.IntegerField()
+    object_id = models.PositiveIntegerField()
+    changes = models.JSONField(default=dict)
+    ip_address = models.GenericIPAddressField(null=True, blank=True)
+    user_agent = models.TextField(blank=True)
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['-timestamp']
+        indexes = [
+            models.Index(fields=['content_type_id', 'object_id']),
+            models.Index(fields=['timestamp']),
+        ]
+
+    def __str__(self):
+        return f"{self.user_id} {self.action} {self.content_type_id}:{self.object_id} at {self.timestamp}"
\ No newline at end of file
@@ -1,5 +1,6 @@
 from rest_framework import serializers
 from ..models import TravelApprovalFlow, TravelApplication
+from ..business_logic.approval_queue import PENDING_FLOWS_ATTR
 
 class TravelApprovalFlowSerializer(serializers.ModelSerializer):
     approver_name = serializers.CharField(source='approver.get_full_name', read_only=True)
@@ -46,10 +47,15 @@ class ManagerApprovalListSerializer(serializers.ModelSerializer):
         ]
     
     def get_current_approval(self, obj):
-        current_flow = obj.approval_flows.filter(
-            approver=self.context['request'].user,
-            status='pending'
-        ).first()
+        # Prefetched by the approval queue querysets (business_logic.approval_queue)
+        flows = getattr(obj, PENDING_FLOWS_ATTR, None)
+        if flows is not None:
+            current_flow = flows[0] if flows else None
+        else:
+            current_flow = obj.approval_flows.filter(
+                approver=self.context['request'].user,
+                status='pending'
+            ).order_by('id').first()
         
         if current_flow:
             return {
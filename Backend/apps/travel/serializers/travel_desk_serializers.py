@@ -2,6 +2,7 @@ from rest_framework import serializers
 from apps.travel.models import TravelApplication, TripDetails, Booking, BookingAssignment, BookingNote
 from apps.travel.models.audit import AuditLog
 from apps.travel.serializers.travel_serializers import TripDetailsSerializer, BookingSerializer
+from apps.travel.business_logic.travel_desk_queue import FIRST_TRIP_ATTR
 
 
 class ApplicationDetailSerializer(serializers.ModelSerializer):
@@ -134,7 +135,11 @@ class TravelDeskTripSerializer(serializers.ModelSerializer):
 
 
 class TravelDeskApplicationListSerializer(serializers.ModelSerializer):
-    travel_request_id = serializers.CharField(read_only=True)
+    """
+    Reads only attributes attached by
+    business_logic.travel_desk_queue.with_desk_queue_annotations.
+    """
+    travel_request_id = serializers.CharField(source="get_travel_request_id", read_only=True)
     employee_name = serializers.SerializerMethodField()
     employee_grade = serializers.CharField(read_only=True)
     from_location = serializers.SerializerMethodField()
@@ -142,9 +147,9 @@ class TravelDeskApplicationListSerializer(serializers.ModelSerializer):
     departure_date = serializers.SerializerMethodField()
     return_date = serializers.SerializerMethodField()
     status_label = serializers.SerializerMethodField()
-    total_bookings = serializers.SerializerMethodField()
-    pending_bookings = serializers.SerializerMethodField()
-    booked_bookings = serializers.SerializerMethodField()
+    total_bookings = serializers.IntegerField(read_only=True)
+    pending_bookings = serializers.IntegerField(read_only=True)
+    booked_bookings = serializers.IntegerField(read_only=True)
 
     class Meta:
         model = TravelApplication
@@ -157,31 +162,13 @@ class TravelDeskApplicationListSerializer(serializers.ModelSerializer):
 
     def get_employee_name(self, obj):
         return getattr(obj.employee, "get_full_name", lambda: obj.employee.username)()
-    
-    def get_employee_grade(self, obj):
-        return getattr(obj.employee, "get_grade", lambda: obj.employee.grade)()
 
     def get_status_label(self, obj):
         return obj.get_status_display()
 
-    def get_total_bookings(self, obj):
-        return Booking.objects.filter(trip_details__travel_application=obj).count()
-
-    def get_pending_bookings(self, obj):
-        return Booking.objects.filter(
-            trip_details__travel_application=obj,
-            status__in=["pending", "requested"]
-        ).count()
-
-    def get_booked_bookings(self, obj):
-        return Booking.objects.filter(
-            trip_details__travel_application=obj,
-            status__in=["confirmed", "completed"]
-        ).count()
-    
     def get_first_trip(self, obj):
-        trip = obj.trip_details.order_by("id").first()
-        return trip
+        trips = getattr(obj, FIRST_TRIP_ATTR)
+        return trips[0] if trips else None
     
     def get_from_location(self, obj):
         trip = self.get_first_trip(obj)
@@ -252,8 +239,8 @@ class BookingAssignmentSerializer(serializers.ModelSerializer):
             raise serializers.ValidationError({"booking_ids": "At least one booking id is required"})
 
         # Ensure all bookings belong to the same application
-        bookings = Booking.objects.filter(id__in=booking_ids).select_related("trip_details__travel_application")
-        if bookings.count() != len(set(booking_ids)):
+        bookings = list(Booking.objects.filter(id__in=booking_ids).select_related("trip_details"))
+        if len(bookings) != len(set(booking_ids)):
             raise serializers.ValidationError({"booking_ids": "One or more booking IDs are invalid"})
 
         apps = {
@@ -264,10 +251,55 @@ class BookingAssignmentSerializer(serializers.ModelSerializer):
             raise serializers.ValidationError({"booking_ids": "All bookings must belong to the same application"})
 
         attrs["_application_id"] = apps.pop()
-        attrs["_bookings"] = list(bookings)
+        attrs["_bookings"] = bookings
         return attrs
 
 
+class ApplicationForwardSerializer(serializers.Serializer):
+    application_id = serializers.IntegerField(min_value=1)
+    agent_id = serializers.IntegerField(min_value=1)
+
+
+class BulkForwardSerializer(serializers.Serializer):
+    """
+    Used by Travel Desk to forward many applications, each to its own
+    booking agent, in one request.
+    """
+
+    MAX_FORWARDS = 200
+
+    forwards = ApplicationForwardSerializer(many=True)
+
+    def validate_forwards(self, forwards):
+        from apps.authentication.models import ExternalProfile
+
+        if not forwards:
+            raise serializers.ValidationError("At least one application is required")
+        if len(forwards) > self.MAX_FORWARDS:
+            raise serializers.ValidationError(f"At most {self.MAX_FORWARDS} applications per request")
+
+        application_ids = [f["application_id"] for f in forwards]
+        if len(set(application_ids)) != len(application_ids):
+            raise serializers.ValidationError("Each application can only be forwarded once per request")
+
+        found = set(TravelApplication.objects.filter(id__in=application_ids).values_list("id", flat=True))
+        missing = sorted(set(application_ids) - found)
+        if missing:
+            raise serializers.ValidationError(f"Applications not found: {missing}")
+
+        agents = {
+            profile.user_id: profile.user
+            for profile in ExternalProfile.objects.select_related("user").filter(
+                user_id__in={f["agent_id"] for f in forwards}
+            )
+        }
+        invalid = sorted({f["agent_id"] for f in forwards} - set(agents))
+        if invalid:
+            raise serializers.ValidationError(f"Invalid booking agents: {invalid}")
+
+        return [(f["application_id"], agents[f["agent_id"]]) for f in forwards]
+
+
 class BookingNoteSerializer(serializers.ModelSerializer):
     author_name = serializers.SerializerMethodField(read_only=True)
 
@@ -0,0 +1,61 @@
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from apps.master_data.models import (
+    ApprovalMatrix, TravelPolicyMaster, TravelModeMaster,
+    GradeEntitlementMaster, TravelSubOptionMaster, CityCategoriesMaster,
+    DAIncidentalMaster, GradeMaster,
+)
+from apps.travel.models import TravelApplication
+from apps.travel.business_logic.approval_matrix_index import approval_matrix_index
+from apps.travel.business_logic.policy_index import policy_index
+from apps.travel.business_logic.entitlement_index import entitlement_index
+from apps.travel.business_logic.da_rates import da_rate_matrix
+from apps.travel.business_logic.dashboard import invalidate_employee_status_counts
+from apps.travel.business_logic.analytics_rollups import mark_day_dirty
+
+
+@receiver([post_save, post_delete], sender=ApprovalMatrix)
+def invalidate_approval_matrix_index(sender, **kwargs):
+    """Rebuild the compiled ApprovalMatrix index once the change is committed."""
+    transaction.on_commit(approval_matrix_index.invalidate)
+
+
+@receiver([post_save, post_delete], sender=TravelApplication)
+def invalidate_employee_dashboard(sender, instance, **kwargs):
+    """Drop the employee's cached dashboard counts when one of their applications changes."""
+    employee_id = instance.employee_id
+    transaction.on_commit(lambda: invalidate_employee_status_counts(employee_id))
+
+
+@receiver(post_delete, sender=TravelApplication)
+def queue_deleted_application_rollup_day(sender, instance, **kwargs):
+    """Deleted rows leave no updated_at behind; queue their rollup day explicitly."""
+    if instance.created_at:
+        day = instance.created_at.date()
+        transaction.on_commit(lambda: mark_day_dirty(day))
+
+
+@receiver([post_save, post_delete], sender=TravelPolicyMaster)
+@receiver([post_save, post_delete], sender=TravelModeMaster)
+def invalidate_travel_policy_index(sender, **kwargs):
+    """Rebuild the effective-dated policy index once the change is committed."""
+    transaction.on_commit(policy_index.invalidate)
+
+
+@receiver([post_save, post_delete], sender=GradeEntitlementMaster)
+@receiver([post_save, post_delete], sender=TravelSubOptionMaster)
+@receiver([post_save, post_delete], sender=TravelModeMaster)
+@receiver([post_save, post_delete], sender=CityCategoriesMaster)
+def invalidate_entitlement_index(sender, **kwargs):
+    """Rebuild the grade entitlement index once the change is committed."""
+    transaction.on_commit(entitlement_index.invalidate)
+
+
+@receiver([post_save, post_delete], sender=DAIncidentalMaster)
+@receiver([post_save, post_delete], sender=GradeMaster)
+@receiver([post_save, post_delete], sender=CityCategoriesMaster)
+def invalidate_da_rate_matrix(sender, **kwargs):
+    """Rebuild the DA / incidental rate matrix once the change is committed."""
+    transaction.on_commit(da_rate_matrix.invalidate)
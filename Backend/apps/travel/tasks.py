@@ -0,0 +1,18 @@
+from celery import shared_task
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task
+def refresh_travel_analytics_rollups(full=False):
+    """Incrementally refresh the travel analytics rollup tables (scheduled by celery beat)."""
+    from apps.travel.business_logic.analytics_rollups import refresh_travel_rollups
+    return refresh_travel_rollups(full=full)
+
+
+@shared_task
+def sweep_travel_completion(batch_size=500, max_batches=None):
+    """Complete due travel applications and send settlement reminders (scheduled by celery beat)."""
+    from apps.travel.business_logic.completion import sweep_travel_completion as sweep
+    return sweep(batch_size=batch_size, max_batches=max_batches)
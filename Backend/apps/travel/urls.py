@@ -3,7 +3,7 @@ from django.urls import path
 from .views.travel_views import *
 from .views.approval_views import *
 from .views.booking import *
-from .views.booking_calendar import GuestHouseAvailabilityView
+from .views.booking_calendar import GuestHouseAvailabilityView, GuestHouseAvailabilityCalendarView
 from .views.approval_delegation import ApprovalDelegationView
 from .views.cancellation import *
 from .views.dashboards import *
@@ -15,6 +15,7 @@ urlpatterns = [
     # Travel Applications
     path('my-applications/', MyTravelApplicationsView.as_view(), name='my-travel-applications'),
     path('applications/', TravelApplicationListCreateView.as_view(), name='travel-application-list'),
+    path('applications/export/', TravelApplicationExportView.as_view(), name='travel-application-export'),
     path('applications/<int:pk>/', TravelApplicationDetailView.as_view(), name='travel-application-detail'),
     path('applications/<int:pk>/submit/', TravelApplicationSubmitView.as_view(), name='travel-application-submit'),
     path('applications/<int:pk>/validate/', TravelApplicationValidationView.as_view(), name='travel-application-validate'),
@@ -37,6 +38,7 @@ urlpatterns = [
     path("travel-desk/bookings/<int:booking_id>/reassign/", TravelDeskReassignBookingView.as_view(), name="travel-desk-reassign-booking"),
     path("travel-desk/bookings/<int:booking_id>/notes/", BookingNotesView.as_view(), name="travel-desk-booking-notes"),
     path("travel-desk/applications/<int:app_id>/forward/", ForwardApplicationView.as_view(), name="travel-desk-forward-application"),
+    path("travel-desk/applications/forward/", TravelDeskBulkForwardView.as_view(), name="travel-desk-bulk-forward"),
     path("travel-desk/applications/<int:app_id>/cancel/", TravelDeskCancelApplicationView.as_view(), name="travel-desk-cancel-application"),
 
     # Booking Agent
@@ -52,6 +54,7 @@ urlpatterns = [
 
     # Booking
     path('bookings/', BookingListAPIView.as_view(), name='booking-list'),
+    path('bookings/export/', BookingExportView.as_view(), name='booking-export'),
     path('bookings/<int:pk>/', BookingDetailAPIView.as_view(), name='booking-detail'),
 
     # Itinerary 
@@ -84,6 +87,7 @@ urlpatterns = [
 
     # Booking Management
     path('bookings/check-entitlement/', CheckBookingEntitlementView.as_view(), name='check-entitlement'),
+    path('bookings/check-entitlement/bulk/', BulkCheckBookingEntitlementView.as_view(), name='check-entitlement-bulk'),
     path('bookings/accommodation/request/', AccommodationBookingRequestView.as_view(), name='accommodation-request'),
     path('bookings/vehicle/request/', VehicleBookingRequestView.as_view(), name='vehicle-request'),
     path('bookings/accommodation/', AccommodationBookingListView.as_view(), name='accommodation-list'),
@@ -93,6 +97,7 @@ urlpatterns = [
     path('bookings/vehicle/<int:pk>/confirm/', VehicleBookingConfirmView.as_view(), name='vehicle-confirm'),
     path('bookings/status/update/', BookingStatusUpdateView.as_view(), name='booking-status-update'),
     path('bookings/check-availability/', GuestHouseAvailabilityView.as_view()),
+    path('bookings/availability-calendar/', GuestHouseAvailabilityCalendarView.as_view(), name='availability-calendar'),
     
     # Document Management
     path('documents/upload/', TravelDocumentUploadView.as_view(), name='document-upload'),
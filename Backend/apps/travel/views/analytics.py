@@ -1,73 +1,88 @@
 from rest_framework.views import APIView
 from rest_framework.permissions import IsAuthenticated
-from django.db.models import Sum, Count, Avg, Q, F
+from django.db.models import Sum, Q, F
 from django.db.models.functions import TruncMonth, TruncWeek
-from datetime import datetime, timedelta
-from utils.response_formatter import success_response
+from datetime import date, datetime, time, timedelta
+from utils.response_formatter import success_response, error_response, paginated_response
+from utils.pagination import StandardResultsSetPagination
 from apps.authentication.decorators import require_role
-from apps.travel.models import TripDetails
+from apps.travel.business_logic.compliance import find_violations, violation_details
 
 class TravelAnalyticsView(APIView): 
-    """Travel analytics and trends"""
+    """
+    Travel analytics and trends.
+    Reads only from the daily rollup tables (see business_logic/analytics_rollups.py),
+    so any date range costs the same. Optional ?start_date=YYYY-MM-DD&end_date=YYYY-MM-DD,
+    defaulting to the last 90 days.
+    """
     permission_classes = [IsAuthenticated]
     
     @require_role('Admin', 'Finance', 'CHRO', 'CEO')
     def get(self, request):
-        from apps.travel.models import TravelApplication
+        from apps.travel.models import (
+            TravelStatusDailyRollup, TravelDepartmentDailyRollup,
+            TravelDestinationDailyRollup, ApprovalLatencyDailyRollup,
+        )
         
         # Date range
-        end_date = datetime.now()
+        end_date = datetime.now().date()
         start_date = end_date - timedelta(days=90)  # Last 90 days
+        try:
+            if request.query_params.get('start_date'):
+                start_date = date.fromisoformat(request.query_params['start_date'])
+            if request.query_params.get('end_date'):
+                end_date = date.fromisoformat(request.query_params['end_date'])
+        except ValueError:
+            return error_response(
+                message='Invalid date range',
+                errors={'detail': 'start_date and end_date must be YYYY-MM-DD'}
+            )
         
-        # Total applications
-        total_apps = TravelApplication.objects.filter(
-            created_at__gte=start_date
-        ).count()
+        in_range = Q(day__gte=start_date, day__lte=end_date)
+        status_rollups = TravelStatusDailyRollup.objects.filter(in_range)
         
         # Status breakdown
-        status_breakdown = TravelApplication.objects.filter(
-            created_at__gte=start_date
-        ).values('status').annotate(count=Count('id'))
+        status_breakdown = status_rollups.values('status').annotate(
+            count=Sum('application_count')
+        ).order_by('status')
+        
+        # Total applications
+        total_apps = sum(item['count'] for item in status_breakdown)
         
         # Monthly trend
-        monthly_trend = TravelApplication.objects.filter(
-            created_at__gte=start_date
-        ).annotate(
-            month=TruncMonth('created_at')
+        monthly_trend = status_rollups.annotate(
+            month=TruncMonth('day')
         ).values('month').annotate(
-            count=Count('id'),
-            total_cost=Sum('estimated_total_cost')
+            count=Sum('application_count'),
+            total_cost=Sum('estimated_cost_total')
         ).order_by('month')
         
         # Top destinations
-        top_destinations = TripDetails.objects.filter(
-            travel_application__created_at__gte=start_date
-        ).values(
-            'to_location__city_name'
+        top_destinations = TravelDestinationDailyRollup.objects.filter(in_range).values(
+            to_location__city_name=F('city__city_name')
         ).annotate(
-            visit_count=Count('id')
+            visit_count=Sum('trip_count')
         ).order_by('-visit_count')[:10]
         
-        # Average approval time
-        from apps.travel.models import TravelApprovalFlow
-        avg_approval = TravelApprovalFlow.objects.filter(
-            status='approved',
-            approved_at__gte=start_date
-        ).annotate(
-            approval_duration=F('approved_at') - F('created_at')
-        ).aggregate(
-            avg_duration=Avg('approval_duration')
+        # Average approval time + latency histogram
+        latency = list(
+            ApprovalLatencyDailyRollup.objects.filter(in_range).values('bucket_hours').annotate(
+                count=Sum('approval_count'),
+                seconds=Sum('total_seconds')
+            ).order_by(F('bucket_hours').asc(nulls_last=True))
         )
+        approvals_count = sum(item['count'] for item in latency)
+        approvals_seconds = sum(item['seconds'] for item in latency)
         
         # Department-wise spending
-        dept_spending = TravelApplication.objects.filter(
-            created_at__gte=start_date,
+        dept_spending = TravelDepartmentDailyRollup.objects.filter(
+            in_range,
             status__in=['completed', 'booked']
         ).values(
-            'employee__department__dept_name'
+            'department__dept_name'
         ).annotate(
-            total_spend=Sum('estimated_total_cost'),
-            trip_count=Count('id')
+            total_spend=Sum('estimated_cost_total'),
+            trip_count=Sum('application_count')
         ).order_by('-total_spend')[:10]
         
         return success_response(
@@ -75,8 +90,8 @@ class TravelAnalyticsView(APIView):
                 'summary': {
                     'total_applications': total_apps,
                     'date_range': {
-                        'start': start_date.date(),
-                        'end': end_date.date()
+                        'start': start_date,
+                        'end': end_date
                     }
                 },
                 'status_breakdown': list(status_breakdown),
@@ -90,12 +105,19 @@ class TravelAnalyticsView(APIView):
                 ],
                 'top_destinations': list(top_destinations),
                 'average_approval_hours': (
-                    avg_approval['avg_duration'].total_seconds() / 3600 
-                    if avg_approval['avg_duration'] else 0
+                    approvals_seconds / approvals_count / 3600
+                    if approvals_count else 0
                 ),
+                'approval_time_histogram': [
+                    {
+                        'max_hours': item['bucket_hours'],
+                        'count': item['count']
+                    }
+                    for item in latency
+                ],
                 'department_spending': [
                     {
-                        'department': item['employee__department__dept_name'],
+                        'department': item['department__dept_name'],
                         'total_spend': float(item['total_spend'] or 0),
                         'trip_count': item['trip_count']
                     }
@@ -107,67 +129,46 @@ class TravelAnalyticsView(APIView):
 
 
 class ComplianceReportView(APIView):
-    """Travel policy compliance report"""
+    """
+    Travel policy compliance report.
+    Optional ?days=N (default 30) or ?start_date=YYYY-MM-DD&end_date=YYYY-MM-DD;
+    violation_details is paginated with ?page / ?page_size.
+    """
     permission_classes = [IsAuthenticated]
+    pagination_class = StandardResultsSetPagination
     
     @require_role('Admin', 'CHRO', 'Finance')
     def get(self, request):
-        from apps.travel.models import TravelApplication
-        
-        # Get applications from last 30 days
-        cutoff = datetime.now() - timedelta(days=30)
-        
-        applications = TravelApplication.objects.filter(
-            submitted_at__gte=cutoff
-        ).select_related('employee')
+        # Get applications from last 30 days (or the requested window)
+        try:
+            days = int(request.query_params.get('days', 30))
+            start = datetime.now() - timedelta(days=days)
+            end = None
+            if request.query_params.get('start_date'):
+                start = datetime.combine(date.fromisoformat(request.query_params['start_date']), time.min)
+            if request.query_params.get('end_date'):
+                end = datetime.combine(date.fromisoformat(request.query_params['end_date']), time.min) + timedelta(days=1)
+        except ValueError:
+            return error_response(
+                message='Invalid date range',
+                errors={'detail': 'days must be an integer; start_date and end_date must be YYYY-MM-DD'}
+            )
         
-        violations = []
+        total, violations = find_violations(start, end)
         
-        for app in applications:
-            app_violations = []
-            
-            # Check advance booking compliance
-            for trip in app.trip_details.all():
-                days_ahead = (trip.departure_date - app.submitted_at.date()).days
-                
-                for booking in trip.bookings.all():
-                    mode = booking.booking_type.name.lower()
-                    
-                    if mode == 'flight' and days_ahead < 7:
-                        app_violations.append({
-                            'type': 'advance_booking',
-                            'message': f'Flight booked {days_ahead} days ahead (required: 7 days)'
-                        })
-                    
-                    if mode == 'flight' and booking.estimated_cost > 10000:
-                        # Check if CEO approval exists
-                        has_ceo_approval = app.approval_flows.filter(
-                            approval_level='ceo',
-                            status='approved'
-                        ).exists()
-                        
-                        if not has_ceo_approval:
-                            app_violations.append({
-                                'type': 'missing_approval',
-                                'message': f'Flight cost ₹{booking.estimated_cost} requires CEO approval'
-                            })
-            
-            if app_violations:
-                violations.append({
-                    'travel_request_id': app.get_travel_request_id(),
-                    'employee': app.employee.get_full_name(),
-                    'violations': app_violations
-                })
+        paginator = self.pagination_class()
+        page_ids = paginator.paginate_queryset(list(violations), request, view=self)
         
-        compliance_rate = ((applications.count() - len(violations)) / applications.count() * 100) if applications.count() > 0 else 100
+        compliance_rate = ((total - len(violations)) / total * 100) if total > 0 else 100
         
-        return success_response(
-            data={
-                'total_applications': applications.count(),
-                'compliant': applications.count() - len(violations),
+        return paginated_response(
+            serializer_data={
+                'total_applications': total,
+                'compliant': total - len(violations),
                 'violations': len(violations),
                 'compliance_rate': round(compliance_rate, 2),
-                'violation_details': violations
+                'violation_details': violation_details(page_ids, violations)
             },
+            paginator=paginator,
             message='Compliance report generated'
-        )
\ No newline at end of file
+        )
@@ -2,6 +2,7 @@ from rest_framework.views import APIView
 from rest_framework.permissions import IsAuthenticated
 from django.db import transaction
 from utils.response_formatter import success_response, error_response
+from apps.travel.business_logic.approver_inbox import record_flows_reassigned
 
 class ApprovalDelegationView(APIView):
     """Delegate approval authority to another user (temporary)"""
@@ -26,9 +27,11 @@ class ApprovalDelegationView(APIView):
             approver=request.user,
             status='pending'
         )
+        flows = list(pending_approvals.select_related('travel_application'))
         
-        # Reassign to delegate
+        # Reassign to delegate, moving the inbox counters with the flows
         reassigned_count = pending_approvals.update(approver=delegate_user)
+        record_flows_reassigned(flows, delegate_user)
         
         # Log delegation (TODO: create DelegationLog model if needed)
         
@@ -4,13 +4,15 @@ from rest_framework.response import Response
 from rest_framework import status
 from rest_framework.permissions import IsAuthenticated
 from django.db import transaction
-from django.utils import timezone
 
-from ..models import TravelApplication, TravelApprovalFlow, TripDetails
+from ..models import TravelApplication, TravelApprovalFlow
 from ..serializers.approval_serializers import (
     TravelApprovalFlowSerializer, ApprovalActionSerializer,
     ManagerApprovalListSerializer
 )
+from ..business_logic.approval_queue import approver_queue, status_queue
+from ..business_logic.approver_inbox import get_inbox_stats
+from ..business_logic.travel_desk_queue import FIRST_TRIP_ATTR, first_trip_prefetch
 from ...authentication.permissions import HasCustomPermission
 from apps.authentication.decorators import require_permission, require_role
 from utils.response_formatter import success_response, error_response, validation_error_response, paginated_response
@@ -27,28 +29,9 @@ class ManagerApprovalsView(ListAPIView):
     permission_classes = [IsAuthenticated]
     
     def get_queryset(self):
-        user = self.request.user
         status_filter = self.request.query_params.get('status', 'pending')  # default: pending
-
-        queryset = TravelApplication.objects.filter(
-            approval_flows__approver=user,
-            approval_flows__can_approve=True
-        ).select_related(
-            'employee__grade', 'employee__department'
-        ).prefetch_related(
-            'trip_details__from_location', 'trip_details__to_location'
-        ).distinct()
-
-        if status_filter == 'pending':
-            queryset = queryset.filter(approval_flows__status='pending')
-        elif status_filter == 'approved':
-            queryset = queryset.filter(approval_flows__status='approved')
-        elif status_filter == 'rejected':
-            queryset = queryset.filter(approval_flows__status='rejected')
-        elif status_filter == 'all':
-            pass  # no filter applied — show all approvals
-
-        return queryset.order_by('-submitted_at')
+        # 'all' (or anything else) applies no status filter
+        return approver_queue(self.request.user, flow_status=status_filter)
     
     def list(self, request, *args, **kwargs):
         queryset = self.filter_queryset(self.get_queryset())
@@ -76,16 +59,7 @@ class ManagerPendingApprovalsView(ListAPIView):
     permission_classes = [IsAuthenticated]
     
     def get_queryset(self):
-        # return TravelApplication.objects.all()
-        return TravelApplication.objects.filter(
-            approval_flows__approver=self.request.user,
-            approval_flows__status='pending',
-            approval_flows__can_approve=True
-        ).select_related(
-            'employee__grade', 'employee__department'
-        ).prefetch_related(
-            'trip_details__from_location', 'trip_details__to_location'
-        ).distinct().order_by('-submitted_at')
+        return approver_queue(self.request.user, flow_status='pending')
     
     def list(self, request, *args, **kwargs):
         """Override to use standard response"""
@@ -284,11 +258,7 @@ class CHROPendingApprovalsView(ListAPIView):
     permission_required = 'travel_request_approve_all'
     
     def get_queryset(self):
-        return TravelApplication.objects.filter(
-            status='pending_chro'
-        ).select_related(
-            'employee__grade', 'employee__department'
-        ).order_by('-submitted_at')
+        return status_queue(self.request.user, 'pending_chro')
     
     def list(self, request, *args, **kwargs):
         queryset = self.filter_queryset(self.get_queryset())
@@ -305,11 +275,7 @@ class CEOPendingApprovalsView(ListAPIView):
     permission_required = 'travel_request_approve_all'
     
     def get_queryset(self):
-        return TravelApplication.objects.filter(
-            status='pending_ceo'
-        ).select_related(
-            'employee__grade', 'employee__department'  
-        ).order_by('-submitted_at')
+        return status_queue(self.request.user, 'pending_ceo')
     
     def list(self, request, *args, **kwargs):
         queryset = self.filter_queryset(self.get_queryset())
@@ -327,37 +293,26 @@ class ApprovalDashboardView(APIView):
     
     def get(self, request):
         user = request.user
+        stats = get_inbox_stats(user)
         
-        # Pending approvals
-        pending_approvals = TravelApprovalFlow.objects.filter(
-            approver=user,
-            status='pending',
-            can_approve=True
-        ).count()
-        
-        # Total approvals done
-        total_approvals_done = TravelApprovalFlow.objects.filter(
-            approver=user,
-            status__in=['approved', 'rejected']
-        ).count()
-        
-        # This month's approvals
-        approvals_this_month = TravelApprovalFlow.objects.filter(
-            approver=user,
-            status__in=['approved', 'rejected'],
-            approved_at__month=timezone.now().month,
-            approved_at__year=timezone.now().year
-        ).count()
-        
-        # Recent activity
+        # Recent activity (first trip of each application prefetched)
         recent_approvals = TravelApprovalFlow.objects.filter(
             approver=user,
             status__in=['pending','approved', 'rejected']
         ).select_related(
             'travel_application__employee'
+        ).prefetch_related(
+            first_trip_prefetch('travel_application__trip_details')
         ).order_by('-approved_at')[:5]
 
-
+        def location(application):
+            trips = getattr(application, FIRST_TRIP_ATTR)
+            if not trips:
+                return None
+            return {
+                'from_location__city_name': trips[0].from_location.city_name,
+                'to_location__city_name': trips[0].to_location.city_name,
+            }
         
         recent_data = [
             {
@@ -366,7 +321,7 @@ class ApprovalDashboardView(APIView):
                 'action': approval.status,
                 'date': approval.approved_at,
                 'approval_level': approval.approval_level,
-                'location' : TripDetails.objects.filter(travel_application=approval.travel_application).values('from_location__city_name', 'to_location__city_name').first()
+                'location': location(approval.travel_application)
             }
             for approval in recent_approvals
         ]
@@ -374,9 +329,9 @@ class ApprovalDashboardView(APIView):
         return success_response(
             data={
                 'statistics': {
-                    'pending_approvals': pending_approvals,
-                    'total_approvals_done': total_approvals_done,
-                    'approvals_this_month': approvals_this_month
+                    'pending_approvals': stats['actionable'],
+                    'total_approvals_done': stats['decided'],
+                    'approvals_this_month': stats['decided_this_month']
                 },
                 'recent_activity': recent_data
             },
@@ -389,37 +344,14 @@ class ApprovalStatsView(APIView):
     permission_classes = [IsAuthenticated]
     
     def get(self, request):
-        from django.db.models import Sum
-        
-        today = timezone.now().date()
-        
-        pending = TravelApprovalFlow.objects.filter(
-            approver=request.user,
-            status='pending'
-        ).count()
-        
-        approved_today = TravelApprovalFlow.objects.filter(
-            approver=request.user,
-            status='approved',
-            approved_at__date=today
-        ).count()
-        
-        total_budget = TravelApplication.objects.filter(
-            approval_flows__approver=request.user,
-            approval_flows__status='pending'
-        ).aggregate(total=Sum('estimated_total_cost'))['total'] or 0
-        
-        rejected = TravelApprovalFlow.objects.filter(
-            approver=request.user,
-            status='rejected'
-        ).count()
+        stats = get_inbox_stats(request.user)
         
         return success_response(
             data={
-                'pending_approval': pending,
-                'approved_today': approved_today,
-                'total_budget': float(total_budget),
-                'rejected': rejected
+                'pending_approval': stats['pending'],
+                'approved_today': stats['approved_today'],
+                'total_budget': float(stats['pending_budget']),
+                'rejected': stats['rejected']
             },
             message='Approval statistics retrieved successfully'
         )
\ No newline at end of file
@@ -1,4 +1,4 @@
-from django.db.models import Q, F, Avg, ExpressionWrapper, DurationField
+from django.db.models import F, Avg, ExpressionWrapper, DurationField
 from django.utils.timezone import now, timedelta
 from django.utils import timezone
 from rest_framework.views import APIView
@@ -11,9 +11,10 @@ from apps.travel.models import Booking, BookingAssignment, BookingNote, TravelAp
 from apps.travel.serializers.booking_agent_serializers import *
 from apps.travel.services import refresh_application_booking_status
 from apps.authentication.permissions import IsBookingAgent
-from apps.travel.models.audit import AuditLog
+from utils.audit import log_action
 from utils.response_formatter import success_response, error_response
-from utils.pagination import StandardResultsSetPagination
+from utils.pagination import KeysetPagination
+from apps.search.index import filter_by_search
 
 
 class BookingAgentsListView(APIView):
@@ -179,15 +180,11 @@ class BookingAgentBookingsListView(APIView):
 
         search = request.query_params.get("search")
         if search:
-            qs = qs.filter(
-                Q(trip_details__travel_application__travel_request_id__icontains=search)
-                | Q(trip_details__travel_application__employee__first_name__icontains=search)
-                | Q(trip_details__travel_application__employee__last_name__icontains=search)
-            )
+            qs = filter_by_search(qs, "booking", search, rank=False)
 
-        qs = qs.order_by("status", "created_at")
+        qs = qs.order_by("status", "created_at", "id")
 
-        paginator = StandardResultsSetPagination()
+        paginator = KeysetPagination(ordering=("status", "created_at", "id"))
         page = paginator.paginate_queryset(qs, request)
         serializer = AgentBookingListSerializer(page, many=True)
         return paginator.get_paginated_response(serializer.data)
@@ -305,10 +302,10 @@ class BookingAgentUpdateStatusView(APIView):
         # ----------------------------
         # 5. Audit Log
         # ----------------------------
-        AuditLog.objects.create(
+        log_action(
             user=user,
             action="update_booking_status",
-            content_object=booking,
+            obj=booking,
             changes={
                 "booking_id": booking.id,
                 "new_status": new_status,
@@ -359,10 +356,10 @@ class BookingAgentFileUploadView(APIView):
         booking.uploaded_at = timezone.now()
         booking.save(update_fields=["booking_file", "uploaded_by", "uploaded_at"])
 
-        AuditLog.objects.create(
+        log_action(
             user=user,
             action="update_booking_status",
-            content_object=booking,
+            obj=booking,
             changes={
                 "file_uploaded": file_obj.name,
             },
@@ -416,10 +413,10 @@ class BookingAgentNotesView(APIView):
 
         note = serializer.save()
 
-        AuditLog.objects.create(
+        log_action(
             user=user,
             action="update_booking_status",
-            content_object=booking,
+            obj=booking,
             changes={"note": note.note},
         )
 
@@ -477,10 +474,10 @@ class BookingAgentAcceptBookingView(APIView):
         booking.save(update_fields=["status"])
 
         # Audit
-        AuditLog.objects.create(
+        log_action(
             user=user,
             action="update_booking_status",
-            content_object=booking,
+            obj=booking,
             changes={
                 "booking_id": booking.id,
                 "new_status": "in_progress",
@@ -581,10 +578,10 @@ class BookingAgentCompleteBookingView(APIView):
             application.save(update_fields=["status"])
 
         # 6) Audit log
-        AuditLog.objects.create(
+        log_action(
             user=user,
             action="update_booking_status",
-            content_object=booking,
+            obj=booking,
             changes={
                 "booking_id": booking.id,
                 "new_status": "completed",
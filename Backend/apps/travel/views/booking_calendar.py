@@ -1,7 +1,7 @@
 from rest_framework.views import APIView
 from rest_framework.permissions import IsAuthenticated
-from utils.response_formatter import success_response
-from datetime import datetime, timedelta
+from utils.response_formatter import success_response, error_response
+from datetime import date, datetime, timedelta
 
 class GuestHouseAvailabilityView(APIView):
     """Check guest house availability for date range"""
@@ -13,24 +13,13 @@ class GuestHouseAvailabilityView(APIView):
         check_out = datetime.strptime(request.data.get('check_out_date'), '%Y-%m-%d').date()
         
         from apps.master_data.models import CityMaster
-        from apps.master_data.models import GuestHouseMaster
-        from apps.travel.models import AccommodationBooking
+        from apps.travel.business_logic.guest_house_availability import GuestHouseAvailability
         
         city = CityMaster.objects.get(id=city_id)
-        guest_houses = GuestHouseMaster.objects.filter(city=city, is_active=True)
+        occupancy = GuestHouseAvailability.load(city, check_in, check_out)
         
         availability = []
-        for gh in guest_houses:
-            overlapping = AccommodationBooking.objects.filter(
-                guest_house=gh,
-                status__in=['guest_house_confirmed', 'guest_house_requested'],
-                check_in_date__lt=check_out,
-                check_out_date__gt=check_in
-            ).count()
-            
-            total_rooms = gh.total_rooms or 10
-            available = total_rooms - overlapping
-            
+        for gh, total_rooms, available in occupancy.summary(check_in, check_out):
             availability.append({
                 'id': gh.id,
                 'name': gh.name,
@@ -44,4 +33,44 @@ class GuestHouseAvailabilityView(APIView):
         return success_response(
             data={'guest_houses': availability},
             message='Availability checked successfully'
-        )
\ No newline at end of file
+        )
+
+
+class GuestHouseAvailabilityCalendarView(APIView):
+    """Free guest house rooms per night for a month (?city_id=&month=YYYY-MM)"""
+    permission_classes = [IsAuthenticated]
+    
+    def get(self, request):
+        city_id = request.query_params.get('city_id')
+        try:
+            month_start = datetime.strptime(
+                request.query_params.get('month') or date.today().strftime('%Y-%m'), '%Y-%m'
+            ).date()
+        except ValueError:
+            return error_response(message='month must be YYYY-MM')
+        if not city_id:
+            return error_response(message='city_id is required')
+        
+        from apps.master_data.models import CityMaster
+        from apps.travel.business_logic.guest_house_availability import GuestHouseAvailability
+        
+        try:
+            city = CityMaster.objects.get(id=city_id)
+        except (CityMaster.DoesNotExist, ValueError):
+            return error_response(message='City not found', status_code=404)
+        
+        month_end = (month_start + timedelta(days=32)).replace(day=1)
+        occupancy = GuestHouseAvailability.load(city, month_start, month_end)
+        
+        return success_response(
+            data={
+                'city': city.city_name,
+                'month': month_start.strftime('%Y-%m'),
+                'guest_houses': [
+                    {'id': t.guest_house.id, 'name': t.guest_house.name, 'total_rooms': t.total_rooms}
+                    for t in occupancy.properties.values()
+                ],
+                'days': occupancy.calendar()
+            },
+            message='Availability calendar loaded successfully'
+        )
@@ -1,11 +1,15 @@
 from rest_framework.views import APIView
 from rest_framework.permissions import IsAuthenticated
-from django.db.models import Sum, Count, Q, Avg, F
 from django.utils import timezone
 from datetime import timedelta
 from apps.authentication.models.user import User
 from utils.response_formatter import success_response
 from apps.authentication.decorators import require_role
+from apps.travel.business_logic.dashboard import (
+    EMPLOYEE_DASHBOARD_BUCKETS, bucket_counts, first_trip,
+    get_employee_status_counts, get_upcoming_applications,
+)
+from apps.travel.business_logic.approver_inbox import get_inbox_stats
 
 class EmployeeDashboardView(APIView):
     """Comprehensive employee dashboard"""
@@ -16,24 +20,8 @@ class EmployeeDashboardView(APIView):
         
         user = request.user
         
-        # Status counts
-        status_counts = {
-            'draft': TravelApplication.objects.filter(employee=user, status='draft').count(),
-            'pending': TravelApplication.objects.filter(
-                employee=user,
-                status__in=['pending_manager', 'pending_chro', 'pending_ceo']
-            ).count(),
-            'approved': TravelApplication.objects.filter(
-                employee=user,
-                status__in=['approved_manager', 'approved_chro', 'approved_ceo', 'pending_travel_desk']
-            ).count(),
-            'booked': TravelApplication.objects.filter(employee=user, status__in=['booking_in_progress', 'booked']).count(),
-            'completed': TravelApplication.objects.filter(employee=user, status='completed').count(),
-            'rejected': TravelApplication.objects.filter(
-                employee=user,
-                status__in=['rejected_manager', 'rejected_chro', 'rejected_ceo']
-            ).count(),
-        }
+        counts = get_employee_status_counts(user)
+        status_counts = bucket_counts(counts, EMPLOYEE_DASHBOARD_BUCKETS)
         
         # Recent applications
         recent = TravelApplication.objects.filter(employee=user).order_by('-created_at')[:5]
@@ -46,35 +34,24 @@ class EmployeeDashboardView(APIView):
             'estimated_cost': float(app.estimated_total_cost or 0)
         } for app in recent]
         
-        # Upcoming travels
-        today = timezone.now().date()
-        upcoming = TravelApplication.objects.filter(
-            employee=user,
-            status__in=['booked', 'approved_manager', 'approved_chro', 'approved_ceo'],
-            trip_details__departure_date__gte=today
-        ).distinct().order_by('trip_details__departure_date')[:5]
-        
-        upcoming_data = [{
-            'id': app.id,
-            'travel_request_id': app.get_travel_request_id(),
-            'departure_date': app.trip_details.first().departure_date if app.trip_details.exists() else None,
-            'destination': app.trip_details.first().to_location.city_name if app.trip_details.exists() else None
-        } for app in upcoming]
-        
-        # Settlement pending
-        settlement_pending = TravelApplication.objects.filter(
-            employee=user,
-            status='completed',
-            is_settled=False
-        ).count()
+        # Upcoming travels (trips + destination prefetched)
+        upcoming_data = []
+        for app in get_upcoming_applications(user):
+            trip = first_trip(app)
+            upcoming_data.append({
+                'id': app.id,
+                'travel_request_id': app.get_travel_request_id(),
+                'departure_date': trip.departure_date if trip else None,
+                'destination': trip.to_location.city_name if trip else None
+            })
         
         return success_response(
             data={
                 'status_counts': status_counts,
                 'recent_applications': recent_data,
                 'upcoming_travels': upcoming_data,
-                'settlement_pending': settlement_pending,
-                'total_applications': TravelApplication.objects.filter(employee=user).count()
+                'settlement_pending': counts['settlement_pending'],
+                'total_applications': counts['total']
             },
             message='Dashboard data retrieved successfully'
         )
@@ -89,12 +66,7 @@ class ManagerDashboardView(APIView):
         from apps.travel.models import TravelApplication, TravelApprovalFlow
         
         user = request.user
-        
-        # Pending approvals
-        pending = TravelApprovalFlow.objects.filter(
-            approver=user,
-            status='pending'
-        ).count()
+        stats = get_inbox_stats(user)
         
         # Team statistics (subordinates)
         team_members = User.objects.filter(reporting_manager=user)
@@ -102,36 +74,14 @@ class ManagerDashboardView(APIView):
             employee__in=team_members
         ).count()
         
-        # This month's approvals
-        this_month = timezone.now().replace(day=1)
-        approvals_this_month = TravelApprovalFlow.objects.filter(
-            approver=user,
-            status='approved',
-            approved_at__gte=this_month
-        ).count()
-        
-        # Budget overview
-        pending_budget = TravelApplication.objects.filter(
-            approval_flows__approver=user,
-            approval_flows__status='pending'
-        ).aggregate(total=Sum('estimated_total_cost'))['total'] or 0
-        
-        # Average approval time
-        avg_time = TravelApprovalFlow.objects.filter(
-            approver=user,
-            status='approved'
-        ).annotate(
-            approval_time=F('approved_at') - F('created_at')
-        ).aggregate(avg=Avg('approval_time'))
-        
         return success_response(
             data={
-                'pending_approvals': pending,
+                'pending_approvals': stats['pending'],
                 'team_size': team_members.count(),
                 'team_travel_requests': team_travel_count,
-                'approvals_this_month': approvals_this_month,
-                'pending_budget': float(pending_budget),
-                'average_approval_hours': avg_time['avg'].total_seconds() / 3600 if avg_time['avg'] else 0
+                'approvals_this_month': stats['approved_this_month'],
+                'pending_budget': float(stats['pending_budget']),
+                'average_approval_hours': stats['average_approval_hours']
             },
             message='Manager dashboard retrieved successfully'
         )
@@ -1,6 +1,6 @@
 import django_filters
+from apps.search.index import filter_by_search
 from apps.travel.models import TravelApplication, TravelApprovalFlow
-from django.db.models import Q
 
 class TravelApplicationFilter(django_filters.FilterSet):
     """Advanced filtering for travel applications"""
@@ -30,15 +30,8 @@ class TravelApplicationFilter(django_filters.FilterSet):
         fields = ['status', 'is_settled']
     
     def search_filter(self, queryset, name, value):
-        """Search across multiple fields"""
-        return queryset.filter(
-            Q(purpose__icontains=value) |
-            Q(internal_order__icontains=value) |
-            Q(sanction_number__icontains=value) |
-            Q(employee__username__icontains=value) |
-            Q(employee__first_name__icontains=value) |
-            Q(employee__last_name__icontains=value)
-        )
+        """Search request id, employee, purpose, IO / sanction and cities (search index)"""
+        return filter_by_search(queryset, "travel_application", value, rank=False)
 
 
 class ApprovalFlowFilter(django_filters.FilterSet):
@@ -1,4 +1,4 @@
-from django.db.models import F, Avg, ExpressionWrapper, DurationField, Q
+from django.db.models import F, Avg, ExpressionWrapper, DurationField
 from django.utils import timezone
 from django.utils.timezone import now, timedelta
 from django.db import transaction
@@ -7,11 +7,14 @@ from rest_framework.permissions import IsAuthenticated
 
 from apps.travel.models import TravelApplication, Booking, BookingAssignment, BookingNote
 from apps.travel.serializers.travel_desk_serializers import *
-from apps.travel.models.audit import AuditLog
+from apps.travel.business_logic.travel_desk_queue import with_desk_queue_annotations
+from apps.travel.business_logic.booking_assignment import assign_bookings, forward_applications
+from apps.search.index import filter_by_search
+from utils.audit import log_action
 from apps.authentication.permissions import IsTravelDesk
 from apps.authentication.models import User, ExternalProfile
 from utils.response_formatter import success_response, error_response
-from utils.pagination import StandardResultsSetPagination
+from utils.pagination import KeysetPagination
 from apps.notifications.notifications import *
 
 
@@ -103,7 +106,7 @@ class TravelDeskDashboardView(APIView):
         # -------------------------------
         # 5. RECENTLY UPDATED APPLICATIONS
         # -------------------------------
-        recent_apps = apps.order_by("-updated_at")[:5]
+        recent_apps = with_desk_queue_annotations(apps).order_by("-updated_at")[:5]
 
         return success_response(
             message="Travel Desk Dashboard",
@@ -134,16 +137,6 @@ class TravelDeskApplicationListView(APIView):
         if status_filter:
             qs = qs.filter(status=status_filter)
 
-        search = request.query_params.get("search")
-        if search:
-            qs = qs.filter(
-                Q(travel_request_id__icontains=search)
-                | Q(purpose__icontains=search)
-                | Q(employee__first_name__icontains=search)
-                | Q(employee__last_name__icontains=search)
-                | Q(employee__username__icontains=search)
-            )
-
         date_from = request.query_params.get("date_from")
         date_to = request.query_params.get("date_to")
         if date_from:
@@ -151,9 +144,14 @@ class TravelDeskApplicationListView(APIView):
         if date_to:
             qs = qs.filter(submitted_at__date__lte=date_to)
 
-        qs = qs.order_by("-submitted_at", "-id")
+        qs = with_desk_queue_annotations(qs).order_by("-submitted_at", "-id")
+
+        # Search index matches, best first
+        search = request.query_params.get("search")
+        if search:
+            qs = filter_by_search(qs, "travel_application", search)
 
-        paginator = StandardResultsSetPagination()
+        paginator = KeysetPagination(ordering=("-submitted_at", "-id"))
         page = paginator.paginate_queryset(qs, request)
         serializer = TravelDeskApplicationListSerializer(page, many=True)
 
@@ -218,59 +216,7 @@ class TravelDeskAssignBookingsView(APIView):
         if not booking_agent:
             return error_response(message="Invalid booking agent")
 
-        with transaction.atomic():
-            for b in bookings:
-
-                assignment, created = BookingAssignment.objects.get_or_create(
-                    booking=b,
-                    defaults={
-                        "assigned_to": booking_agent,
-                        "assigned_by": request.user,
-                        "assignment_scope": scope,
-                        "assigned_at": timezone.now(),
-                    }
-                )
-
-                if not created:
-                    assignment.assigned_to = booking_agent
-                    assignment.assigned_by = request.user
-                    assignment.assignment_scope = scope
-                    assignment.assigned_at = timezone.now()
-                    assignment.accepted_at = None
-                    assignment.completed_at = None
-                    assignment.save(update_fields=[
-                        "assigned_to", "assigned_by", "assignment_scope",
-                        "assigned_at", "accepted_at", "completed_at"
-                    ])
-
-                # Update booking status
-                if b.status == "pending":
-                    b.status = "requested"
-                    b.save(update_fields=["status"])
-
-                # Audit
-                AuditLog.objects.create(
-                    user=request.user,
-                    action="assign_booking",
-                    content_object=b,
-                    changes={
-                        "booking_id": b.id,
-                        "application_id": application_id,
-                        "agent_id": booking_agent.id,
-                        "scope": scope,
-                    },
-                )
-
-            # Application status bump
-            app = TravelApplication.objects.get(id=application_id)
-            if app.status in [
-                "approved_manager",
-                "approved_chro",
-                "approved_ceo",
-                "pending_travel_desk",
-            ]:
-                app.status = "booking_in_progress"
-                app.save(update_fields=["status"])
+        assign_bookings(bookings, booking_agent, request.user, scope=scope)
 
         return success_response(
             message="Bookings assigned successfully",
@@ -338,10 +284,10 @@ class TravelDeskReassignBookingView(APIView):
                 booking.save(update_fields=["status"])
 
             # Audit logging
-            AuditLog.objects.create(
+            log_action(
                 user=request.user,
                 action="reassign_booking",
-                content_object=booking,
+                obj=booking,
                 changes={
                     "booking_id": booking.id,
                     "old_agent": old_agent.id if old_agent else None,
@@ -385,10 +331,10 @@ class BookingNotesView(APIView):
 
         note = serializer.save()
 
-        AuditLog.objects.create(
+        log_action(
             user=request.user,
             action="update_booking_status",
-            content_object=booking,
+            obj=booking,
             changes={
                 "note_id": note.id,
                 "note": note.note,
@@ -417,63 +363,8 @@ class ForwardApplicationView(APIView):
         except ExternalProfile.DoesNotExist:
             return error_response(message="Invalid booking agent")
 
-        # Fetch all bookings belonging to the application
-        bookings = Booking.objects.filter(trip_details__travel_application=app)
-
         agent_user = agent_profile.user
-
-        with transaction.atomic():
-            for booking in bookings:
-                assignment, created = BookingAssignment.objects.update_or_create(
-                    booking=booking,
-                    defaults={
-                        "assigned_to": agent_user,
-                        "assigned_by": request.user,
-                        "assignment_scope": "full_application",
-                        "accepted_at": None,
-                        "completed_at": None,
-                    },
-                )
-
-                # update booking status → requested
-                if booking.status == "pending":
-                    booking.status = "requested"
-                    booking.save(update_fields=["status"])
-
-                # Audit log
-                AuditLog.objects.create(
-                    user=request.user,
-                    action="assign_booking",
-                    content_object=booking,
-                    changes={
-                        "booking_id": booking.id,
-                        "application_id": app.id,
-                        "agent_id": agent_user.id,
-                        "scope": "full_application",
-                    },
-                )
-
-            #  Bump application status
-            if app.status in [
-                "approved_manager",
-                "approved_chro",
-                "approved_ceo",
-                "pending_travel_desk",
-            ]:
-                app.status = "booking_in_progress"
-                app.save(update_fields=["status"])
-
-            # High-level forward audit
-            AuditLog.objects.create(
-                user=request.user,
-                action="forward_to_travel_desk",
-                content_object=app,
-                changes={
-                    "application_id": app.id,
-                    "forwarded_to": agent_user.id,
-                    "total_bookings": bookings.count(),
-                },
-            )
+        forwarded = forward_applications([(app.id, agent_user)], request.user)
 
         # Notify assigned agent
         # notify_booking_agent(
@@ -487,7 +378,38 @@ class ForwardApplicationView(APIView):
             data={
                 "application_id": app.id,
                 "agent_id": agent_user.id,
-                "total_bookings": bookings.count(),
+                "total_bookings": forwarded[app.id],
+            }
+        )
+
+
+class TravelDeskBulkForwardView(APIView):
+    """
+    Forward many applications, each to its own booking agent, in one call:
+    {"forwards": [{"application_id": 1, "agent_id": 7}, ...]}
+    """
+    permission_classes = [IsAuthenticated, IsTravelDesk]
+
+    def post(self, request):
+        serializer = BulkForwardSerializer(data=request.data)
+        if not serializer.is_valid():
+            return error_response(message="Validation error", data=serializer.errors)
+
+        forwards = serializer.validated_data["forwards"]
+        forwarded = forward_applications(forwards, request.user)
+
+        return success_response(
+            message="Applications forwarded successfully",
+            data={
+                "forwarded": [
+                    {
+                        "application_id": application_id,
+                        "agent_id": agent.id,
+                        "total_bookings": forwarded[application_id],
+                    }
+                    for application_id, agent in forwards
+                ],
+                "total_bookings": sum(forwarded.values()),
             }
         )
 
@@ -532,10 +454,10 @@ class TravelDeskCancelApplicationView(APIView):
             app.status = "cancelled"
             app.save(update_fields=["status"])
 
-            AuditLog.objects.create(
+            log_action(
                 user=request.user,
                 action="cancel",
-                content_object=app,
+                obj=app,
                 changes={"reason": reason}
             )
 
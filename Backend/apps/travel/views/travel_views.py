@@ -12,20 +12,28 @@ from ..models import TravelApplication, Booking
 from apps.travel.models import TravelApprovalFlow
 from ..serializers.travel_serializers import *
 from apps.authentication.permissions import IsEmployee, IsOwnerOrApprover
-from rest_framework.pagination import PageNumberPagination
 from django.db.models import Q
 from utils.response_formatter import success_response, error_response, validation_error_response, paginated_response
 from django.core.exceptions import ValidationError
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import filters
 from .filters import TravelApplicationFilter
-from utils.pagination import StandardResultsSetPagination
+from utils.pagination import KeysetPagination
+from utils.exports import ExportView
+from apps.travel.business_logic.dashboard import (
+    APPLICATION_STATS_BUCKETS, bucket_counts, get_employee_status_counts,
+)
+from apps.travel.business_logic.approval_engine_v2 import ApprovalEngineV2, ApproverEntry, EngineSnapshot
+from apps.travel.business_logic.submission import (
+    advance_booking_warnings, create_approval_flows, load_submission_snapshot, on_submitted,
+)
 
 import logging
 
 logger = logging.getLogger(__name__)
 
-class TravelApplicationPagination(PageNumberPagination):
+class TravelApplicationPagination(KeysetPagination):
+    # ?pagination=keyset pages by (-created_at, -id) whatever ?ordering says
     page_size = 10
     page_size_query_param = 'page_size'
     max_page_size = 100
@@ -37,24 +45,9 @@ class TravelApplicationDashboardStatsView(APIView):
     def get(self, request):
         user = request.user
         
-        stats = {
-            'total_applications': TravelApplication.objects.filter(employee=user).count(),
-            'draft': TravelApplication.objects.filter(employee=user, status='draft').count(),
-            'pending': TravelApplication.objects.filter(
-                employee=user, 
-                status__in=['submitted', 'pending_manager', 'pending_chro', 'pending_ceo']
-            ).count(),
-            'approved': TravelApplication.objects.filter(
-                employee=user,
-                status__in=['approved_manager', 'approved_chro', 'approved_ceo', 
-                          'pending_travel_desk', 'booking_in_progress', 'booked']
-            ).count(),
-            'rejected': TravelApplication.objects.filter(
-                employee=user,
-                status__in=['rejected_manager', 'rejected_chro', 'rejected_ceo']
-            ).count(),
-            'completed': TravelApplication.objects.filter(employee=user, status='completed').count(),
-        }
+        counts = get_employee_status_counts(user)
+        stats = {'total_applications': counts['total']}
+        stats.update(bucket_counts(counts, APPLICATION_STATS_BUCKETS))
         
         return success_response(
             data=stats,
@@ -95,9 +88,9 @@ class TravelApplicationListCreateView(ListCreateAPIView):
         Application starts in 'draft' status and must be submitted separately.
     """
     serializer_class = TravelApplicationSerializer
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
+    # ?search is handled by TravelApplicationFilter (search index)
+    filter_backends = [DjangoFilterBackend, filters.OrderingFilter]
     filterset_class = TravelApplicationFilter
-    search_fields = ['purpose', 'internal_order', 'sanction_number', 'employee__username']
     ordering_fields = ['created_at', 'estimated_total_cost', 'submitted_at']
     ordering = ['-created_at']
     permission_classes = [IsAuthenticated]
@@ -193,24 +186,24 @@ class TravelApplicationSubmitView(APIView):
     """
     Submit a travel application for approval.
     This version uses ApprovalEngineV2.
+
+    The application graph is loaded once (load_submission_snapshot) and
+    shared by validation, warnings, cost calculation and the approval
+    engine; see apps.travel.business_logic.submission.
     """
     permission_classes = [IsAuthenticated]
 
     @transaction.atomic
     def post(self, request, pk):
 
-        # 1) Load travel application
-        try:
-            travel_app = TravelApplication.objects.get(
-                pk=pk,
-                employee=request.user,
-                status="draft"
-            )
-        except TravelApplication.DoesNotExist:
+        # 1) Load travel application (trips, bookings, employee profile prefetched)
+        travel_app = load_submission_snapshot(pk, request.user)
+        if travel_app is None:
             return error_response(
                 message="Travel application not found or already submitted",
                 status_code=status.HTTP_404_NOT_FOUND
             )
+        employee = travel_app.employee
 
         # 2) Validate serializer (minimal payload to enforce internal checks)
         serializer = TravelApplicationSubmissionSerializer(
@@ -230,43 +223,8 @@ class TravelApplicationSubmitView(APIView):
                 status_code=400
             )
 
-        # EARLY CHECK - Collect all bookings
-        all_bookings = []
-        for trip in travel_app.trip_details.all():
-            all_bookings.extend(list(trip.bookings.all()))
-
-        # STEP 5: Check special rules BEFORE engine
-        ceo_required = False
-        chro_required = False
-
         # 4) Collect warnings (advance-booking)
-        warnings = []
-        today = timezone.now().date()
-
-        for trip in travel_app.trip_details.all():
-            if not trip.departure_date:
-                continue
-
-            days_ahead = (trip.departure_date - today).days
-
-            for booking in trip.bookings.all():
-                mode = booking.booking_type.name.lower()
-
-                if "flight" in mode and days_ahead < 7:
-                    warnings.append({
-                        "type": "advance_booking_violation",
-                        "mode": "Flight",
-                        "message": f"Flight booking is only {days_ahead} days ahead (policy: 7 days minimum)",
-                        "severity": "warning"
-                    })
-
-                if "train" in mode and days_ahead < 3:
-                    warnings.append({
-                        "type": "advance_booking_violation",
-                        "mode": "Train",
-                        "message": f"Train booking is only {days_ahead} days ahead (policy: 3 days minimum)",
-                        "severity": "warning"
-                    })
+        warnings = advance_booking_warnings(travel_app)
 
         # 5) Calculate estimated cost
         try:
@@ -274,46 +232,34 @@ class TravelApplicationSubmitView(APIView):
         except Exception as e:
             logger.warning(f"[SubmitView] Cost calculation failed for TA {travel_app.id}: {e}")
 
-        # 6) Build approver chain using ApprovalEngineV2
-        from apps.travel.business_logic.approval_engine_v2 import ApprovalEngineV2
-
-        engine = ApprovalEngineV2(travel_app, request.user)
+        # 6) Build approver chain using ApprovalEngineV2 (roles / policies from one snapshot)
+        snapshot = EngineSnapshot.load({employee.id})
+        engine = ApprovalEngineV2(travel_app, employee, snapshot=snapshot)
         approver_entries = engine.build()
 
-        # If no approvers → treat as self approval
-        if len(approver_entries) == 0 and travel_app.self_approved:
-            travel_app.status = "pending_travel_desk"
-            # travel_app.save(update_fields=["status", "self_approved"])
-            travel_app.save(update_fields=["status"])
-
-        # STEP 6.5: CHECK FOR SELF-APPROVAL (NEW)
-        self_approved = False
-        if not approver_entries:
-            self_approved = True
+        now = timezone.now()
+        travel_app.submitted_at = now
+        travel_app.set_settlement_due_date(save=False)
 
         # -----------------------------------------
         # SELF-APPROVAL SCENARIO (NO APPROVERS)
         # -----------------------------------------
-        if self_approved or not approver_entries:            
+        if not approver_entries:
             # Create auto-approval flow entry for record
-            TravelApprovalFlow.objects.create(
-                travel_application=travel_app,
-                approver=request.user,
-                approval_level="self_approval",
-                sequence=1,
+            create_approval_flows(
+                travel_app,
+                [ApproverEntry(employee, "self_approval", sequence=1)],
                 status="approved",
-                can_view=True,
-                can_approve=True,
-                is_required=True,
                 notes="Auto-approved (no approver required)",
-                approved_at=timezone.now()
+                approved_at=now
             )
             # Directly move to travel desk
             travel_app.status = "pending_travel_desk"
-            travel_app.submitted_at = timezone.now()
             travel_app.current_approver = None
-            travel_app.set_settlement_due_date()
-            travel_app.save(update_fields=["status"]) 
+            travel_app.save(update_fields=[
+                "status", "submitted_at", "current_approver",
+                "travel_end_date", "settlement_due_date", "estimated_total_cost",
+            ])
 
             return success_response(
                 data={
@@ -333,29 +279,19 @@ class TravelApplicationSubmitView(APIView):
         # If approvers list exists → continue with manager/CEO/CHRO reorder logic
         # -----
 
-        org_profile = getattr(request.user, "organizational_profile", None)
+        org_profile = getattr(employee, "organizational_profile", None)
         reporting_manager = getattr(org_profile, "reporting_manager", None)
 
-        from apps.authentication.models import UserRole
-
-        is_ceo = UserRole.objects.filter(
-            user=request.user,
-            role__name__iexact="CEO",
-            is_active=True
-        ).exists()
-
-        is_chro = UserRole.objects.filter(
-            user=request.user,
-            role__name__iexact="CHRO",
-            is_active=True
-        ).exists()
+        employee_roles = snapshot.user_roles.get(employee.id, set())
+        is_ceo = "ceo" in employee_roles
+        is_chro = "chro" in employee_roles
 
         # determine rule triggers
         ceo_required = any(a.level == "ceo" for a in approver_entries)
         chro_required = any(a.level == "chro" for a in approver_entries)
 
         # Reporting manager = self case
-        if reporting_manager == request.user:
+        if reporting_manager == employee:
             if is_ceo and ceo_required:     # CEO submitting CEO-required request
                 approver_entries = [a for a in approver_entries if a.level != "manager"]
             if is_chro and chro_required:   # CHRO submitting CHRO-required request
@@ -371,59 +307,28 @@ class TravelApplicationSubmitView(APIView):
                 status_code=400
             )
 
-        # 7) Create TravelApprovalFlow rows
-        approval_chain = []
-        for entry in approver_entries:
-            flow = TravelApprovalFlow.objects.create(
-                travel_application=travel_app,
-                approver=entry.user,
-                approval_level=entry.level,
-                sequence=entry.sequence,
-                status="pending",
-                can_view=entry.can_view,
-                can_approve=entry.can_approve,
-                is_required=entry.is_required
-            )
+        # 7) Update travel application (saved first: the approver inbox counters
+        #    read the estimated cost from the database)
+        first_approver = approver_entries[0]
+        travel_app.status = f"pending_{first_approver.level}"
+        travel_app.current_approver = first_approver.user
+        travel_app.save()
 
-            approval_chain.append({
+        # 8) Create TravelApprovalFlow rows (one bulk insert)
+        flows = create_approval_flows(travel_app, approver_entries)
+        approval_chain = [
+            {
                 "sequence": flow.sequence,
                 "approval_level": flow.approval_level,
                 "approver": flow.approver.get_full_name(),
                 "approver_email": flow.approver.email,
                 "status": flow.status
-            })
-
-        # 8) Update travel application
-        first_approver = approver_entries[0]
-        travel_app.status = f"pending_{first_approver.level}"
-        travel_app.submitted_at = timezone.now()
-        travel_app.current_approver = first_approver.user
-        travel_app.set_settlement_due_date()
-        travel_app.save()
-
-        # Schedule auto-completion
-        from notifications.tasks import schedule_travel_completion
-        schedule_travel_completion(travel_app)
-
-        # 9) Send email notification
-        try:
-            from apps.notifications.center import NotificationCenter
-            NotificationCenter.notify(
-                event_name="travel.submitted",
-                reference={"type": "TravelRequest", "id": 999},
-                payload={
-                    "employee_id": request.user.id,
-                    "approver_id": travel_app.current_approver.id,
-                    "request_id": travel_app.get_travel_request_id(),
-                    "employee_name": request.user.get_full_name(),
-                    "approver_name": travel_app.current_approver.get_full_name(),
-                    "purpose": travel_app.purpose,
-                    "urgency": "high"
-                }
-            )
+            }
+            for flow in flows
+        ]
 
-        except Exception as e:
-            logger.warning(f"[SubmitView] Email sending failed: {e}")
+        # 9) Send email notification once committed
+        on_submitted(travel_app, employee)
 
         # 10) Final response
         return success_response(
@@ -826,7 +731,7 @@ class MyTravelApplicationsView(APIView):
     Dashboard view for employee's travel applications
     """
     permission_classes = [IsAuthenticated,]
-    pagination_class = StandardResultsSetPagination
+    pagination_class = KeysetPagination
 
     def get(self, request):
         user = request.user
@@ -864,24 +769,9 @@ class MyTravelApplicationsView(APIView):
         serializer = TravelApplicationSerializer(page, many=True)
 
         # Statistics
-        stats = {
-            'total_applications': TravelApplication.objects.filter(employee=user).count(),
-            'draft': TravelApplication.objects.filter(employee=user, status='draft').count(),
-            'pending': TravelApplication.objects.filter(
-                employee=user,
-                status__in=['submitted', 'pending_manager', 'pending_chro', 'pending_ceo']
-            ).count(),
-            'approved': TravelApplication.objects.filter(
-                employee=user,
-                status__in=['approved_manager', 'approved_chro', 'approved_ceo',
-                            'pending_travel_desk', 'booking_in_progress', 'booked']
-            ).count(),
-            'rejected': TravelApplication.objects.filter(
-                employee=user,
-                status__in=['rejected_manager', 'rejected_chro', 'rejected_ceo']
-            ).count(),
-            'completed': TravelApplication.objects.filter(employee=user, status='completed').count(),
-        }
+        counts = get_employee_status_counts(user)
+        stats = {'total_applications': counts['total']}
+        stats.update(bucket_counts(counts, APPLICATION_STATS_BUCKETS))
 
         return paginated_response(
             serializer_data={
@@ -1093,7 +983,11 @@ class TravelApplicationCostEstimateView(APIView):
         
         total_cost = 0
         
-        for trip in travel_app.trip_details.all():
+        trips = travel_app.trip_details.select_related(
+            'from_location', 'to_location__category'
+        ).prefetch_related('bookings__booking_type', 'bookings__sub_option')
+        
+        for trip in trips:
             trip_costs = {
                 'trip_id': trip.id,
                 'from_to': f"{trip.from_location.city_name} → {trip.to_location.city_name}",
@@ -1156,34 +1050,110 @@ class CheckBookingEntitlementView(APIView):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        from apps.master_data.models import TravelSubOption, CityCategoriesMaster
+        from apps.travel.business_logic.entitlement_index import entitlement_index
         from apps.travel.business_logic.validators import check_booking_entitlement
         
-        try:
-            sub_option = TravelSubOption.objects.select_related('mode').get(id=sub_option_id)
-            city_category = CityCategoriesMaster.objects.get(id=city_category_id)
-            
-            is_allowed, max_amount, message = check_booking_entitlement(
-                request.user,
-                sub_option.mode,
-                sub_option,
-                city_category
-            )
-            
-            return Response({
-                'is_allowed': is_allowed,
-                'max_amount': float(max_amount) if max_amount else None,
-                'message': message,
-                'sub_option_name': sub_option.name,
-                'city_category': city_category.name
-            })
+        index = entitlement_index.get()
+        sub_option = index.sub_options.get(index.sub_option_id(sub_option_id))
+        city_category = index.category_id(city_category_id)
+        category_name = index.categories.get(city_category)
         
-        except (TravelSubOption.DoesNotExist, CityCategoriesMaster.DoesNotExist) as e:
+        if sub_option is None or category_name is None:
             return Response(
-                {'error': str(e)},
+                {'error': 'Travel sub option or city category not found'},
                 status=status.HTTP_404_NOT_FOUND
             )
         
+        is_allowed, max_amount, message = check_booking_entitlement(
+            request.user,
+            sub_option.mode_name,
+            sub_option.id,
+            city_category
+        )
+        
+        return Response({
+            'is_allowed': is_allowed,
+            'max_amount': float(max_amount) if max_amount else None,
+            'message': message,
+            'sub_option_name': sub_option.name,
+            'city_category': category_name
+        })
+
+
+class BulkCheckBookingEntitlementView(APIView):
+    """
+    Check every booking of a draft in one call.
+    Body: {"application_id": <id>} to check a saved draft's bookings, or
+          {"bookings": [{"sub_option_id", "city_category_id", "estimated_cost"}, ...]}
+          for rows not saved yet.
+    """
+    permission_classes = [IsAuthenticated]
+    
+    def post(self, request):
+        from apps.travel.business_logic.validators import check_booking_entitlements
+        
+        application_id = request.data.get('application_id')
+        bookings = request.data.get('bookings')
+        
+        if application_id:
+            try:
+                application_id = int(application_id)
+            except (TypeError, ValueError):
+                return Response(
+                    {'error': 'application_id must be an integer'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            rows = [
+                {
+                    'booking_id': booking_id,
+                    'trip_id': trip_id,
+                    'sub_option_id': sub_option_id,
+                    'city_category_id': category_id,
+                    'estimated_cost': estimated_cost,
+                    'mode_name': mode_name,
+                }
+                for booking_id, trip_id, sub_option_id, category_id, estimated_cost, mode_name in (
+                    Booking.objects.filter(
+                        trip_details__travel_application_id=application_id,
+                        trip_details__travel_application__employee=request.user,
+                        sub_option__isnull=False,
+                    ).order_by('trip_details_id', 'id').values_list(
+                        'id', 'trip_details_id', 'sub_option_id',
+                        'trip_details__to_location__category_id', 'estimated_cost',
+                        'booking_type__name',
+                    )
+                )
+            ]
+        elif isinstance(bookings, list):
+            for position, row in enumerate(bookings):
+                if not isinstance(row, dict) or any(
+                    isinstance(row.get(key), (dict, list))
+                    for key in ('sub_option_id', 'city_category_id', 'mode_name')
+                ):
+                    return Response(
+                        {'error': f'bookings[{position}] must be an object with sub_option_id and city_category_id'},
+                        status=status.HTTP_400_BAD_REQUEST
+                    )
+            rows = bookings
+        else:
+            return Response(
+                {'error': 'application_id or a bookings list is required'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        results = check_booking_entitlements(request.user, rows)
+        for row, result in zip(rows, results):
+            for key in ('booking_id', 'trip_id'):
+                if row.get(key) is not None:
+                    result[key] = row[key]
+            if result['max_amount'] is not None:
+                result['max_amount'] = float(result['max_amount'])
+        
+        return Response({
+            'all_allowed': all(r['is_allowed'] and not r['exceeds_max_amount'] for r in results),
+            'results': results
+        })
+        
 
 class RequestAccommodationBookingView(APIView):
     """
@@ -1267,6 +1237,16 @@ class BookingListAPIView(ListAPIView):
         return qs
 
 
+class TravelApplicationExportView(ExportView):
+    """Export travel applications with the TravelApplicationListCreateView filters."""
+    export_name = 'travel_applications'
+
+
+class BookingExportView(ExportView):
+    """Export bookings with the BookingListAPIView filters."""
+    export_name = 'bookings'
+
+
 class BookingDetailAPIView(RetrieveAPIView):
     queryset = Booking.objects.all().select_related(
         'booking_type', 'sub_option', 'trip_details'
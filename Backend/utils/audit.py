@@ -1,10 +1,111 @@
-from apps.travel.models.audit import AuditLog
+"""
+Audit pipeline
+
+log_action / record never write AuditLog inside the caller's transaction:
+  - entries are built up front (content types come from an in-process map
+    loaded with one query per process, see get_content_type),
+  - they are queued with transaction.on_commit, so actions rolled back leave
+    no audit rows,
+  - inside audit_buffer() (every request, via AuditBufferMiddleware) the
+    committed entries collect in a request-local buffer written with one
+    bulk_create when the request ends; outside it they are written right
+    after commit.
+With AUDIT_LOG_ASYNC the writes are handed to the write_audit_logs Celery
+task in batches of AUDIT_TASK_BATCH_SIZE instead (falling back to a direct
+write when the broker is unavailable).
+
+Old rows are moved to AuditLogArchive by archive_audit_logs (celery beat
+task archive_old_audit_logs / archive_audit_logs command), keeping AuditLog
+to AUDIT_LOG_RETENTION_DAYS. An archive table is used rather than MySQL
+range partitioning because InnoDB does not partition tables with foreign keys.
+"""
+
+import json
+import logging
+import threading
+from contextlib import contextmanager
+from datetime import timedelta
+
+from celery import shared_task
+from django.conf import settings
 from django.contrib.contenttypes.models import ContentType
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.db.models.signals import post_migrate
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from apps.travel.models.audit import AuditLog, AuditLogArchive
+
+logger = logging.getLogger(__name__)
+
+AUDIT_LOG_ASYNC = getattr(settings, 'AUDIT_LOG_ASYNC', False)
+AUDIT_TASK_BATCH_SIZE = 500
+# A request buffering more entries than this writes them early
+AUDIT_BUFFER_MAX = 1000
+AUDIT_LOG_RETENTION_DAYS = getattr(settings, 'AUDIT_LOG_RETENTION_DAYS', 365)
+AUDIT_ARCHIVE_BATCH_SIZE = 5000
+
+SERIALIZED_FIELDS = (
+    'user_id', 'action', 'content_type_id', 'object_id',
+    'changes', 'ip_address', 'user_agent',
+)
+
+
+# ---------------------------------------------------------------------------
+# Content types
+# ---------------------------------------------------------------------------
+
+_content_types = {}
+
+
+def get_content_type(model):
+    """ContentType of model (class or instance); the first call loads them all."""
+    opts = model._meta.concrete_model._meta
+    key = (opts.app_label, opts.model_name)
+    content_type = _content_types.get(key)
+    if content_type is None:
+        if not _content_types:
+            _content_types.update(
+                ((ct.app_label, ct.model), ct) for ct in ContentType.objects.all()
+            )
+        content_type = _content_types.get(key) or ContentType.objects.get_for_model(model)
+        _content_types[key] = content_type
+    return content_type
+
+
+def clear_content_type_cache(**kwargs):
+    _content_types.clear()
+
+
+post_migrate.connect(clear_content_type_cache, dispatch_uid='utils.audit.clear_content_type_cache')
+
+
+# ---------------------------------------------------------------------------
+# Entries
+# ---------------------------------------------------------------------------
+
+def build_entry(user, action, model, object_id, changes=None, request=None):
+    """An unsaved AuditLog for object_id of model (class or instance)."""
+    entry = AuditLog(
+        user=user,
+        action=action,
+        content_type=get_content_type(model),
+        object_id=object_id,
+        # Dates / decimals in changes are stored as the API shows them
+        changes=json.loads(json.dumps(changes or {}, cls=DjangoJSONEncoder)),
+        timestamp=timezone.now(),
+    )
+    if request:
+        entry.ip_address = get_client_ip(request)
+        entry.user_agent = request.META.get('HTTP_USER_AGENT', '')[:500]
+    return entry
+
 
 def log_action(user, action, obj, changes=None, request=None):
     """
     Log an audit action
-    
+
     Args:
         user: User who performed action
         action: Action type ('create', 'update', etc.)
@@ -12,21 +113,133 @@ def log_action(user, action, obj, changes=None, request=None):
         changes: Dict of changes made
         request: HttpRequest object for IP/user agent
     """
-    content_type = ContentType.objects.get_for_model(obj)
-    
-    audit_data = {
-        'user': user,
-        'action': action,
-        'content_type': content_type,
-        'object_id': obj.id,
-        'changes': changes or {}
-    }
-    
-    if request:
-        audit_data['ip_address'] = get_client_ip(request)
-        audit_data['user_agent'] = request.META.get('HTTP_USER_AGENT', '')[:500]
-    
-    AuditLog.objects.create(**audit_data)
+    record(build_entry(user, action, obj, obj.pk, changes, request))
+
+
+def record(*entries):
+    """Queue AuditLog entries for writing once the current transaction commits."""
+    if entries:
+        transaction.on_commit(lambda: _committed(entries))
+
+
+# ---------------------------------------------------------------------------
+# Buffer / writers
+# ---------------------------------------------------------------------------
+
+_buffer = threading.local()
+
+
+def _buffered():
+    if not hasattr(_buffer, 'entries'):
+        _buffer.entries = []
+        _buffer.depth = 0
+    return _buffer
+
+
+def _committed(entries):
+    state = _buffered()
+    if not state.depth:
+        write(entries)
+        return
+    state.entries.extend(entries)
+    if len(state.entries) >= AUDIT_BUFFER_MAX:
+        flush()
+
+
+def flush():
+    state = _buffered()
+    entries, state.entries = state.entries, []
+    write(entries)
+
+
+@contextmanager
+def audit_buffer():
+    """Collect committed audit entries and write them together on exit."""
+    state = _buffered()
+    state.depth += 1
+    try:
+        yield
+    finally:
+        state.depth -= 1
+        if not state.depth:
+            flush()
+
+
+def _serialize(entry):
+    row = {name: getattr(entry, name) for name in SERIALIZED_FIELDS}
+    row['timestamp'] = entry.timestamp.isoformat()
+    return row
+
+
+def write(entries):
+    """Write entries now, or hand them to Celery when AUDIT_LOG_ASYNC is set."""
+    if not entries:
+        return
+    if AUDIT_LOG_ASYNC:
+        sent = 0
+        try:
+            while sent < len(entries):
+                batch = entries[sent:sent + AUDIT_TASK_BATCH_SIZE]
+                write_audit_logs.delay([_serialize(entry) for entry in batch])
+                sent += len(batch)
+            return
+        except Exception:
+            logger.exception('Could not enqueue audit logs; writing them directly')
+            entries = entries[sent:]
+    try:
+        AuditLog.objects.bulk_create(entries, batch_size=AUDIT_TASK_BATCH_SIZE)
+    except Exception:
+        logger.exception('Failed to write %s audit log entries', len(entries))
+
+
+@shared_task
+def write_audit_logs(rows):
+    """Insert serialized audit entries (see write)."""
+    AuditLog.objects.bulk_create(
+        [AuditLog(**{**row, 'timestamp': parse_datetime(row['timestamp'])}) for row in rows],
+        batch_size=AUDIT_TASK_BATCH_SIZE,
+    )
+    return len(rows)
+
+
+# ---------------------------------------------------------------------------
+# Archival
+# ---------------------------------------------------------------------------
+
+ARCHIVED_FIELDS = ('id', 'timestamp', *SERIALIZED_FIELDS)
+
+
+def archive_audit_logs(before=None, batch_size=AUDIT_ARCHIVE_BATCH_SIZE):
+    """
+    Move AuditLog rows older than before (default: the retention period)
+    to AuditLogArchive, oldest first, one batch per transaction. Returns the
+    number of rows moved.
+    """
+    before = before or timezone.now() - timedelta(days=AUDIT_LOG_RETENTION_DAYS)
+    old = AuditLog.objects.filter(timestamp__lt=before).order_by('timestamp', 'id')
+    moved = 0
+    while True:
+        rows = list(old.values(*ARCHIVED_FIELDS)[:batch_size])
+        if not rows:
+            break
+        with transaction.atomic():
+            AuditLogArchive.objects.bulk_create(
+                [AuditLogArchive(**row) for row in rows], ignore_conflicts=True
+            )
+            AuditLog.objects.filter(id__in=[row['id'] for row in rows]).delete()
+        moved += len(rows)
+    return moved
+
+
+@shared_task
+def archive_old_audit_logs():
+    """Archive AuditLog rows past the retention period (scheduled by celery beat)."""
+    return archive_audit_logs()
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
 
 def get_client_ip(request):
     """Extract client IP from request"""
@@ -48,4 +261,4 @@ def get_object_changes(old_obj, new_obj, fields):
                 'old': str(old_value),
                 'new': str(new_value)
             }
-    return changes
\ No newline at end of file
+    return changes
@@ -0,0 +1,399 @@
+"""
+Streaming CSV / XLSX exports
+
+An ExportSpec describes one exportable entity: its model, the values()
+columns to write, how to filter it from query params (the same filters as the
+entity's list view) and how to restrict it to what the caller may see. Specs
+live next to their app (apps/<app>/exports.py) and are looked up by name in
+EXPORT_SPECS.
+
+Rows are read in primary-key keyset batches of EXPORT_CHUNK_SIZE with a
+values_list() projection - no model instances, no serializers - so memory
+stays constant whatever the export size, on every database backend (MySQL
+drivers buffer a whole result set, so a single .iterator() would not).
+
+ExportView serves a spec:
+  - CSV up to EXPORT_STREAM_MAX_ROWS rows is streamed straight back with
+    StreamingHttpResponse;
+  - larger exports, XLSX, or ?background=1 are written by the
+    generate_export_task Celery job to MEDIA_ROOT/exports/<user id>/ and
+    fetched from ExportFileView once ready. Files older than
+    EXPORT_RETENTION_HOURS (default 24) are deleted by the
+    purge_old_export_files beat task.
+"""
+
+import csv
+import logging
+import os
+import uuid
+from collections import namedtuple
+import time
+from datetime import date, datetime, timedelta
+
+from celery import shared_task
+from django.conf import settings
+from django.db.models import Q
+from django.http import FileResponse, QueryDict, StreamingHttpResponse
+from django.utils import timezone
+from django.utils.module_loading import import_string
+from rest_framework import status
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.views import APIView
+
+from utils.response_formatter import success_response, error_response
+
+logger = logging.getLogger(__name__)
+
+EXPORT_SPECS = {
+    'users': 'apps.authentication.exports.USER_EXPORT',
+    'travel_applications': 'apps.travel.exports.APPLICATION_EXPORT',
+    'bookings': 'apps.travel.exports.BOOKING_EXPORT',
+    'expense_claims': 'apps.expenses.exports.CLAIM_EXPORT',
+}
+
+EXPORT_CHUNK_SIZE = 2000
+# Larger CSV exports are generated in the background
+EXPORT_STREAM_MAX_ROWS = getattr(settings, 'EXPORT_STREAM_MAX_ROWS', 50000)
+EXPORT_DIR = 'exports'
+EXPORT_FORMATS = ('csv', 'xlsx')
+# Files ExportFileView serves (PDF: expense claim reports)
+EXPORT_FILE_FORMATS = EXPORT_FORMATS + ('pdf',)
+# Background export files (and their .part / .failed markers) older than this are deleted
+EXPORT_RETENTION = timedelta(hours=getattr(settings, 'EXPORT_RETENTION_HOURS', 24))
+
+ExportColumn = namedtuple('ExportColumn', 'header lookups format')
+
+
+def column(header, *lookups, format=None):
+    """
+    An export column reading one or more values() lookups.
+    format(*values) turns them into the cell value (default: the single value).
+    """
+    return ExportColumn(header, lookups, format)
+
+
+def choice_label(choices):
+    """Column formatter showing the display label of a choices field."""
+    labels = dict(choices)
+    return lambda value: labels.get(value, value)
+
+
+def full_name(first_name, last_name):
+    return f"{first_name or ''} {last_name or ''}".strip()
+
+
+def search_q(fields, term):
+    """The OR-of-icontains filter DRF's SearchFilter builds for search_fields."""
+    q = Q()
+    for bit in term.replace(',', ' ').split():
+        bit_q = Q()
+        for field in fields:
+            bit_q |= Q(**{f"{field}__icontains": bit})
+        q &= bit_q
+    return q
+
+
+class ExportSpec:
+    """
+    name:      registry key (see EXPORT_SPECS), also the file name stem
+    model:     exported model
+    columns:   [column(...)]
+    filter:    filter(queryset, params, user) -> queryset; params is a QueryDict
+    scope:     scope(queryset, user) -> queryset restricted to what user may export
+    allow:     allow(user) -> whether user may export this entity at all
+               (ExportView answers 403 otherwise)
+    """
+
+    def __init__(self, name, model, columns, filter=None, scope=None, allow=None):
+        self.name = name
+        self.model = model
+        self.columns = columns
+        self._filter = filter
+        self._scope = scope
+        self._allow = allow
+
+    def allows(self, user):
+        return self._allow(user) if self._allow else True
+
+    @property
+    def headers(self):
+        return [c.header for c in self.columns]
+
+    def queryset(self, params, user):
+        queryset = self.model._default_manager.all()
+        if self._scope:
+            queryset = self._scope(queryset, user)
+        if self._filter:
+            queryset = self._filter(queryset, params, user)
+        return queryset
+
+    def count(self, params, user):
+        return self._keyed(params, user).count()
+
+    def _keyed(self, params, user):
+        # Filters that join multi-valued relations can repeat a row; selecting
+        # by pk__in keeps every row once and makes pk keyset paging exact.
+        ids = self.queryset(params, user).order_by().values('pk')
+        return self.model._default_manager.filter(pk__in=ids)
+
+    def iter_rows(self, params, user, chunk_size=EXPORT_CHUNK_SIZE):
+        """Yield one list of raw cell values per row, reading chunk_size rows per query."""
+        base = self._keyed(params, user).order_by('pk')
+        lookups = [lookup for c in self.columns for lookup in c.lookups]
+        last_pk = None
+        while True:
+            batch = base if last_pk is None else base.filter(pk__gt=last_pk)
+            batch = list(batch.values_list('pk', *lookups)[:chunk_size])
+            for values in batch:
+                yield self._cells(values[1:])
+            if len(batch) < chunk_size:
+                return
+            last_pk = batch[-1][0]
+
+    def _cells(self, values):
+        cells = []
+        i = 0
+        for c in self.columns:
+            raw = values[i:i + len(c.lookups)]
+            i += len(c.lookups)
+            cells.append(c.format(*raw) if c.format else raw[0])
+        return cells
+
+
+def get_spec(name):
+    path = EXPORT_SPECS.get(name)
+    return import_string(path) if path else None
+
+
+def to_querydict(params):
+    """Rebuild a QueryDict from {key: [values]} (query params passed to Celery)."""
+    query = QueryDict(mutable=True)
+    for key, values in (params or {}).items():
+        query.setlist(key, values)
+    return query
+
+
+def _csv_value(value):
+    if value is None:
+        return ''
+    if isinstance(value, datetime):
+        return timezone.localtime(value).isoformat() if timezone.is_aware(value) else value.isoformat()
+    if isinstance(value, date):
+        return value.isoformat()
+    return value
+
+
+def _xlsx_value(value):
+    if isinstance(value, datetime) and timezone.is_aware(value):
+        return timezone.localtime(value).replace(tzinfo=None)
+    if isinstance(value, (list, dict)):
+        return str(value)
+    return value
+
+
+class _Echo:
+    """File-like object whose write() hands the line back to the caller."""
+
+    def write(self, value):
+        return value
+
+
+def iter_csv(spec, params, user):
+    writer = csv.writer(_Echo())
+    yield writer.writerow(spec.headers)
+    for row in spec.iter_rows(params, user):
+        yield writer.writerow([_csv_value(v) for v in row])
+
+
+def write_csv(spec, params, user, path):
+    with open(path, 'w', newline='', encoding='utf-8') as fh:
+        for line in iter_csv(spec, params, user):
+            fh.write(line)
+
+
+def write_xlsx(spec, params, user, path):
+    # openpyxl is optional: only background XLSX exports need it
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet(title=spec.name[:31])
+    sheet.append(spec.headers)
+    for row in spec.iter_rows(params, user):
+        sheet.append([_xlsx_value(v) for v in row])
+    workbook.save(path)
+
+
+WRITERS = {'csv': write_csv, 'xlsx': write_xlsx}
+
+
+def xlsx_available():
+    try:
+        import openpyxl  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def export_path(user_id, token, file_format):
+    directory = os.path.join(settings.MEDIA_ROOT, EXPORT_DIR, str(user_id))
+    return os.path.join(directory, f"{token}.{file_format}")
+
+
+def start_export_file(user_id, token, file_format):
+    """Create the pending marker of a background export and return its final path."""
+    path = export_path(user_id, token, file_format)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    open(f"{path}.part", 'w').close()
+    return path
+
+
+def record_export_failure(path, error):
+    """Drop the partial file and leave a .failed marker for ExportFileView."""
+    partial = f"{path}.part"
+    if os.path.exists(partial):
+        os.remove(partial)
+    with open(f"{path}.failed", 'w', encoding='utf-8') as fh:
+        fh.write(str(error))
+
+
+@shared_task
+def generate_export_task(name, params, user_id, file_format, token):
+    """
+    Write export `name` for user_id to MEDIA_ROOT/exports/<user_id>/<token>.<format>.
+    The file is written as .part and renamed when complete; a .failed marker
+    records an error for ExportFileView.
+    """
+    from apps.authentication.models import User
+
+    spec = get_spec(name)
+    user = User.objects.get(pk=user_id)
+    path = export_path(user_id, token, file_format)
+    partial = f"{path}.part"
+
+    try:
+        WRITERS[file_format](spec, to_querydict(params), user, partial)
+        os.replace(partial, path)
+    except Exception as e:
+        logger.exception("Export %s (%s) failed for user %s", name, token, user_id)
+        record_export_failure(path, e)
+        return None
+
+    logger.info("Export %s written to %s", name, path)
+    return path
+
+
+def purge_old_exports(max_age=EXPORT_RETENTION):
+    """
+    Delete files under MEDIA_ROOT/exports/ last modified more than max_age ago,
+    and the per-user directories left empty. Returns the number of files deleted.
+    """
+    root = os.path.join(settings.MEDIA_ROOT, EXPORT_DIR)
+    if not os.path.isdir(root):
+        return 0
+    cutoff = time.time() - max_age.total_seconds()
+    removed = 0
+    for directory, _, files in os.walk(root, topdown=False):
+        for name in files:
+            path = os.path.join(directory, name)
+            try:
+                if os.path.getmtime(path) < cutoff:
+                    os.remove(path)
+                    removed += 1
+            except FileNotFoundError:
+                continue
+        if directory != root:
+            try:
+                os.rmdir(directory)
+            except OSError:
+                pass  # still holds recent exports
+    return removed
+
+
+@shared_task
+def purge_old_export_files():
+    """Apply the export retention (scheduled by celery beat)."""
+    removed = purge_old_exports()
+    if removed:
+        logger.info("Deleted %s expired export files", removed)
+    return removed
+
+
+class ExportView(APIView):
+    """
+    GET: export the rows of export_name matching the list view's filters.
+      - file_format: csv (default) | xlsx
+      - background=1: always generate the file in the background
+    """
+    permission_classes = [IsAuthenticated]
+    export_name = None
+
+    def get(self, request):
+        spec = get_spec(self.export_name)
+        if not spec.allows(request.user):
+            return error_response(
+                message="You do not have permission to export this data",
+                status_code=status.HTTP_403_FORBIDDEN,
+            )
+        params = request.query_params
+        file_format = params.get('file_format', 'csv').lower()
+
+        if file_format not in EXPORT_FORMATS:
+            return error_response(
+                message=f"Unsupported export format '{file_format}'",
+                errors={'file_format': list(EXPORT_FORMATS)},
+            )
+        if file_format == 'xlsx' and not xlsx_available():
+            return error_response(
+                message="XLSX export is not available on this server",
+                errors={'file_format': ['Install openpyxl or use csv']},
+            )
+
+        background = file_format != 'csv' or params.get('background') in ('1', 'true')
+        if not background:
+            background = spec.count(params, request.user) > EXPORT_STREAM_MAX_ROWS
+
+        if not background:
+            filename = f"{spec.name}_{timezone.localdate():%Y%m%d}.csv"
+            response = StreamingHttpResponse(iter_csv(spec, params, request.user), content_type="text/csv")
+            response["Content-Disposition"] = f"attachment; filename={filename}"
+            return response
+
+        token = uuid.uuid4()
+        start_export_file(request.user.id, token, file_format)
+        generate_export_task.delay(spec.name, dict(params.lists()), request.user.id, file_format, str(token))
+        return success_response(
+            data={
+                'token': str(token),
+                'file_format': file_format,
+                'status_url': request.build_absolute_uri(f"/api/exports/{token}/"),
+            },
+            message="Export is being generated",
+            status_code=status.HTTP_202_ACCEPTED,
+        )
+
+
+class ExportFileView(APIView):
+    """
+    GET: download a background export of the caller (202 while it is still
+    being generated, 404 for an unknown token).
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, token):
+        for file_format in EXPORT_FILE_FORMATS:
+            path = export_path(request.user.id, token, file_format)
+            if os.path.exists(path):
+                return FileResponse(open(path, 'rb'), as_attachment=True, filename=os.path.basename(path))
+            if os.path.exists(f"{path}.failed"):
+                return error_response(
+                    message="Export failed",
+                    status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                )
+            if os.path.exists(f"{path}.part"):
+                return success_response(
+                    data={'token': str(token), 'ready': False},
+                    message="Export is not ready yet",
+                    status_code=status.HTTP_202_ACCEPTED,
+                )
+
+        return error_response(message="Export not found", status_code=status.HTTP_404_NOT_FOUND)
@@ -4,6 +4,7 @@ from django.http import JsonResponse
 from django.core.exceptions import ValidationError
 from rest_framework.exceptions import APIException
 from rest_framework import status as http_status
+from utils.response_formatter import envelope, needs_envelope
 
 class StandardResponseMiddleware:
     """
@@ -14,6 +15,9 @@ class StandardResponseMiddleware:
         "data": {...},
         "errors": {...}
     }
+    DRF responses are wrapped by utils.renderers.EnvelopeJSONRenderer while
+    they are rendered; this only wraps what other renderers produced and
+    turns exceptions raised outside DRF into the same format.
     """
     
     def __init__(self, get_response):
@@ -21,58 +25,22 @@ class StandardResponseMiddleware:
     
     def __call__(self, request):
         response = self.get_response(request)
-        
-        # Only process JSON API responses
-        if not request.path.startswith('/api/'):
+
+        # EnvelopeJSONRenderer already wrapped and rendered it in one pass
+        if getattr(response, 'envelope_rendered', False):
             return response
-        
-        # Skip documentation-related endpoints (Swagger, Redoc, Schema)
-        if request.path.startswith(('/api/docs/', '/api/redoc/', '/api/schema/')):
+
+        # Only process JSON API responses (not documentation endpoints)
+        if not hasattr(response, 'data') or not needs_envelope(request.path, response.data):
             return response
-        
-        # Skip if response is already properly formatted
-        if hasattr(response, 'data') and isinstance(response.data, dict):
-            if all(key in response.data for key in ['success', 'message']):
-                return response
-        
-        # Wrap response in standard format
-        if hasattr(response, 'data'):
-            wrapped_data = self._wrap_response(response.data, response.status_code)
-            response.data = wrapped_data
-            # response.content = json.dumps(wrapped_data).encode('utf-8')
-            response.content = json.dumps(wrapped_data, default=str).encode('utf-8')
-        
+
+        # Responses from other renderers: wrap and re-render
+        wrapped_data = envelope(response.data, response.status_code)
+        response.data = wrapped_data
+        response.content = json.dumps(wrapped_data, default=str).encode('utf-8')
+
         return response
-    
-    def _wrap_response(self, data, status_code):
-        """Wrap response data in standard format"""
-        is_success = 200 <= status_code < 400
-        
-        # If already in standard format, return as-is
-        if isinstance(data, dict) and 'success' in data and 'message' in data:
-            return data
-        
-        # Determine message based on status code
-        if is_success:
-            message = "Success"
-            if isinstance(data, dict) and 'message' in data:
-                message = data.pop('message')
-        else:
-            message = "Error"
-            if isinstance(data, dict):
-                if 'detail' in data:
-                    message = data['detail']
-                    data = {'detail': data['detail']}
-                elif 'error' in data:
-                    message = data['error']
-        
-        return {
-            'success': is_success,
-            'message': message,
-            'data': data if is_success else None,
-            'errors': data if not is_success else None
-        }
-    
+
     def process_exception(self, request, exception):
         """Handle exceptions and return standardized error response"""
         if not request.path.startswith('/api/'):
@@ -98,4 +66,19 @@ class StandardResponseMiddleware:
             'message': 'An error occurred',
             'data': None,
             'errors': error_detail
-        }, status=status_code)
\ No newline at end of file
+        }, status=status_code)
+
+class AuditBufferMiddleware:
+    """
+    Collect the request's audit entries (utils.audit) and write them with one
+    bulk_create once the response is ready.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        from utils.audit import audit_buffer
+
+        with audit_buffer():
+            return self.get_response(request)
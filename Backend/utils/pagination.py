@@ -1,5 +1,17 @@
+import base64
+import json
+from datetime import date, datetime
+from decimal import Decimal
+
+from django.conf import settings
+from django.db.models import F, Q
+from rest_framework.exceptions import NotFound
 from rest_framework.pagination import PageNumberPagination
 from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+# ?page_size=0 / -1 (whole table in one response) is honoured only when this is on
+ALLOW_UNPAGINATED_LISTS = getattr(settings, 'ALLOW_UNPAGINATED_LISTS', settings.DEBUG)
 
 class StandardResultsSetPagination(PageNumberPagination):
     page_size = 10  # Default number of items per page
@@ -13,7 +25,8 @@ class FlexiblePagination(PageNumberPagination):
     1. Global default page size from settings
     2. Per-view custom page size
     3. Query parameter override (?page_size=20)
-    4. Disabling pagination (?page_size=0 or per-view disable)
+    4. Disabling pagination (?page_size=0 or per-view disable); the query
+       parameter form only when ALLOW_UNPAGINATED_LISTS (development)
     5. Maximum page size limit for security
     """
     page_size = 20  # Default fallback
@@ -55,9 +68,11 @@ class FlexiblePagination(PageNumberPagination):
                 query_page_size = int(query_page_size)
                 # Special values to disable pagination
                 if query_page_size in [0, -1]:
-                    return None
+                    if ALLOW_UNPAGINATED_LISTS:
+                        return None
                 # Respect max_page_size limit
-                return min(query_page_size, self.max_page_size)
+                elif query_page_size > 0:
+                    return min(query_page_size, self.max_page_size)
             except (ValueError, TypeError):
                 pass  # Invalid value, fall through to defaults
 
@@ -104,4 +119,156 @@ class LargePagination(PageNumberPagination):
     """
     page_size = 100
     page_size_query_param = 'page_size'
-    max_page_size = 500
\ No newline at end of file
+    max_page_size = 500
+
+
+class KeysetPagination(StandardResultsSetPagination):
+    """
+    Page-number pagination with a keyset (cursor) mode for high-volume lists.
+
+    Without a cursor this paginates by page number exactly as
+    StandardResultsSetPagination. Clients switch to keyset mode with
+    ?pagination=keyset (first page) and then follow the next / previous
+    links, which carry an opaque ?cursor=. A keyset page is read as
+    "rows after the cursor's key, in `ordering`" with no OFFSET and no
+    COUNT(*), so page 1000 costs the same as page 1; ?include_count=1 adds
+    an exact count.
+
+    ordering is a tuple of model fields ending in a unique one, e.g.
+    ('-created_at', '-id'); NULLs sort as the smallest value. It is taken
+    from the constructor, else the view's keyset_ordering, else the class.
+    """
+    ordering = ('-created_at', '-id')
+    cursor_query_param = 'cursor'
+    mode_query_param = 'pagination'
+    count_query_param = 'include_count'
+
+    def __init__(self, ordering=None):
+        if ordering is not None:
+            self.ordering = tuple(ordering)
+        self.keyset = False
+
+    def paginate_queryset(self, queryset, request, view=None):
+        params = request.query_params
+        if self.cursor_query_param not in params and params.get(self.mode_query_param) != 'keyset':
+            return super().paginate_queryset(queryset, request, view)
+
+        if view is not None and getattr(view, 'keyset_ordering', None):
+            self.ordering = tuple(view.keyset_ordering)
+        self.keyset = True
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        self.count = queryset.count() if params.get(self.count_query_param) in ('1', 'true') else None
+
+        key, reverse = self.decode_cursor(queryset.model, params.get(self.cursor_query_param))
+        fields = [(name.lstrip('-'), name.startswith('-') != reverse) for name in self.ordering]
+
+        queryset = queryset.order_by(*(
+            F(name).desc(nulls_last=True) if descending else F(name).asc(nulls_first=True)
+            for name, descending in fields
+        ))
+        if key is not None:
+            queryset = queryset.filter(self._after(fields, key))
+
+        rows = list(queryset[:self.page_size + 1])
+        has_more = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+        if reverse:
+            rows.reverse()
+
+        # Forward pages always have a previous page once a cursor was followed,
+        # backward pages always have a next one
+        self.next_key = self._key(rows[-1]) if rows and (has_more if not reverse else True) else None
+        self.previous_key = self._key(rows[0]) if rows and key is not None and (has_more if reverse else True) else None
+        return rows
+
+    @staticmethod
+    def _after(fields, key):
+        """Rows strictly after key in the (name, descending) ordering fields."""
+        condition = None
+        equal = Q()
+        for (name, descending), value in zip(fields, key):
+            if value is None:
+                # NULL sorts lowest: nothing follows it descending, non-NULLs ascending
+                after = None if descending else Q(**{f'{name}__isnull': False})
+                same = Q(**{f'{name}__isnull': True})
+            elif descending:
+                after = Q(**{f'{name}__lt': value}) | Q(**{f'{name}__isnull': True})
+                same = Q(**{name: value})
+            else:
+                after = Q(**{f'{name}__gt': value})
+                same = Q(**{name: value})
+            if after is not None:
+                condition = equal & after if condition is None else condition | (equal & after)
+            equal &= same
+        return condition if condition is not None else Q(pk__in=[])
+
+    def _key(self, row):
+        names = [name.lstrip('-') for name in self.ordering]
+        if isinstance(row, dict):
+            return [row[name] for name in names]
+        return [getattr(row, name) for name in names]
+
+    def encode_cursor(self, key, reverse=False):
+        values = [
+            v.isoformat() if isinstance(v, (datetime, date)) else str(v) if isinstance(v, Decimal) else v
+            for v in key
+        ]
+        payload = json.dumps({'k': values, 'r': reverse}, separators=(',', ':'))
+        return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+    def decode_cursor(self, model, cursor):
+        """(key values, reverse) of cursor, or (None, False) for the first page."""
+        if not cursor:
+            return None, False
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+            values, reverse = payload['k'], bool(payload.get('r'))
+            if len(values) != len(self.ordering):
+                raise ValueError
+            key = [
+                None if value is None else model._meta.get_field(name.lstrip('-')).to_python(value)
+                for name, value in zip(self.ordering, values)
+            ]
+        except Exception:
+            raise NotFound('Invalid cursor')
+        return key, reverse
+
+    def _link(self, key, reverse):
+        if key is None:
+            return None
+        url = remove_query_param(self.request.build_absolute_uri(), self.page_query_param)
+        return replace_query_param(url, self.cursor_query_param, self.encode_cursor(key, reverse))
+
+    def get_next_link(self):
+        if not self.keyset:
+            return super().get_next_link()
+        return self._link(self.next_key, reverse=False)
+
+    def get_previous_link(self):
+        if not self.keyset:
+            return super().get_previous_link()
+        return self._link(self.previous_key, reverse=True)
+
+    def get_pagination_meta(self):
+        """Pagination metadata for utils.response_formatter.paginated_response."""
+        if not self.keyset:
+            return {
+                'count': self.page.paginator.count,
+                'next': self.get_next_link(),
+                'previous': self.get_previous_link(),
+                'total_pages': self.page.paginator.num_pages,
+                'current_page': self.page.number,
+                'page_size': self.get_page_size(self.request),
+            }
+        return {
+            'count': self.count,
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'page_size': self.page_size,
+        }
+
+    def get_paginated_response(self, data):
+        if not self.keyset:
+            return super().get_paginated_response(data)
+        return Response({**self.get_pagination_meta(), 'results': data})
@@ -1,4 +1,4 @@
-from django.db import connection
+from django.db import connection, connections, router
 from functools import wraps
 import time
 
@@ -36,4 +36,20 @@ def optimize_queryset(queryset, select_related=None, prefetch_related=None):
     if prefetch_related:
         queryset = queryset.prefetch_related(*prefetch_related)
     
-    return queryset
\ No newline at end of file
+    return queryset
+
+
+def bulk_upsert(model, objs, unique_fields, update_fields, batch_size=500):
+    """
+    bulk_create objs, updating update_fields of the rows that already exist.
+
+    unique_fields is only passed where the backend supports a conflict target;
+    MySQL (ON DUPLICATE KEY UPDATE) rejects it and matches on any unique key,
+    so models upserted this way must have no other unique key (an auto
+    primary key left unset on objs is fine).
+    """
+    features = connections[router.db_for_write(model)].features
+    options = {'update_conflicts': True, 'update_fields': update_fields}
+    if features.supports_update_conflicts_with_target:
+        options['unique_fields'] = unique_fields
+    return model.objects.bulk_create(objs, batch_size=batch_size, **options)
@@ -0,0 +1,105 @@
+"""
+API JSON rendering
+
+EnvelopeJSONRenderer (the default DRF renderer) produces the standard
+{success, message, data, errors} format in the single render pass, so
+StandardResponseMiddleware no longer serializes /api/ payloads a second
+time. Output is byte-for-byte what the middleware used to send:
+  - data that views wrapped themselves (success_response / error_response /
+    paginated_response) renders as DRF's JSONRenderer renders it, through
+    orjson when it is installed;
+  - raw data (e.g. master-data list views) is wrapped here and written with
+    json.dumps(..., default=str), the middleware's format.
+
+orjson output is only used when it is identical to the stdlib encoder's:
+types orjson formats differently (datetimes, decimals) go through DRF's
+encoder via orjson's default hook, and payloads containing floats orjson
+would print in another notation (1e16 vs 1e+16) are rendered by JSONRenderer.
+The one difference: NaN / Infinity, which JSONRenderer refuses to render,
+come out of orjson as null.
+"""
+
+import json
+import re
+
+from rest_framework.utils.encoders import JSONEncoder
+from rest_framework.renderers import JSONRenderer
+
+from utils.response_formatter import envelope, needs_envelope
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+if orjson:
+    ORJSON_OPTIONS = (
+        orjson.OPT_NON_STR_KEYS
+        | orjson.OPT_PASSTHROUGH_DATETIME
+        | orjson.OPT_PASSTHROUGH_DATACLASS
+    )
+
+# orjson and json.dumps format floats differently in exponent notation (1e16 /
+# 1e+16) and below 1e-4 (0.00001 / 1e-05). Look-alikes inside strings only
+# cost a fallback render.
+_EXPONENT = re.compile(rb'e-?[0-9]')
+
+
+def orjson_floats_differ(content):
+    if b'0.0000' in content:
+        return True
+    # A literal prefix keeps the scan fast; check the digit before the "e" per match
+    return any(
+        content[match.start() - 1:match.start()].isdigit()
+        for match in _EXPONENT.finditer(content)
+    )
+
+
+_drf_encoder = JSONEncoder()
+
+
+class EnvelopeJSONRenderer(JSONRenderer):
+    """JSONRenderer that wraps API responses in the standard format."""
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        renderer_context = renderer_context or {}
+        request = renderer_context.get('request')
+        response = renderer_context.get('response')
+
+        if request is not None and response is not None:
+            # Tell StandardResponseMiddleware there is nothing left to do
+            response.envelope_rendered = True
+            if needs_envelope(request.path, data):
+                data = envelope(data, response.status_code)
+                response.data = data
+                return json.dumps(data, default=str, allow_nan=not self.strict).encode('utf-8')
+
+        return self.render_json(data, accepted_media_type, renderer_context)
+
+    def render_json(self, data, accepted_media_type=None, renderer_context=None):
+        """JSONRenderer.render, through orjson when it gives the same bytes."""
+        if data is None:
+            return b''
+        if not self._orjson_compatible(accepted_media_type, renderer_context or {}):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        try:
+            ret = orjson.dumps(data, default=_drf_encoder.default, option=ORJSON_OPTIONS)
+        except TypeError:
+            # Unsupported keys / integers beyond 64 bits
+            return super().render(data, accepted_media_type, renderer_context)
+        if orjson_floats_differ(ret):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        # Same strict javascript subset escaping as JSONRenderer
+        return ret.replace('\u2028'.encode(), b'\\u2028').replace('\u2029'.encode(), b'\\u2029')
+
+    def _orjson_compatible(self, accepted_media_type, renderer_context):
+        # orjson only writes compact, non-ASCII-escaped output
+        return (
+            orjson is not None
+            and self.compact
+            and self.strict
+            and not self.ensure_ascii
+            and self.get_indent(accepted_media_type, renderer_context) is None
+        )
@@ -62,19 +62,22 @@ def paginated_response(serializer_data, paginator, message="Success"):
     Returns:
         Response with pagination metadata
     """
+    if hasattr(paginator, 'get_pagination_meta'):
+        # KeysetPagination: no page numbers in keyset mode
+        pagination = paginator.get_pagination_meta()
+    else:
+        pagination = {
+            'count': paginator.page.paginator.count,
+            'next': paginator.get_next_link(),
+            'previous': paginator.get_previous_link(),
+            'total_pages': paginator.page.paginator.num_pages,
+            'current_page': paginator.page.number,
+            'page_size': paginator.get_page_size(paginator.request)
+        }
     return success_response(
         data=serializer_data,
         message=message,
-        meta={
-            'pagination': {
-                'count': paginator.page.paginator.count,
-                'next': paginator.get_next_link(),
-                'previous': paginator.get_previous_link(),
-                'total_pages': paginator.page.paginator.num_pages,
-                'current_page': paginator.page.number,
-                'page_size': paginator.get_page_size(paginator.request)
-            }
-        }
+        meta={'pagination': pagination}
     )
 
 
@@ -100,4 +103,52 @@ def validation_error_response(serializer_errors):
         message="Validation failed",
         errors=formatted_errors,
         status_code=status.HTTP_400_BAD_REQUEST
-    )
\ No newline at end of file
+    )
+
+# API paths whose responses are not wrapped in the standard format
+UNWRAPPED_PATHS = ('/api/docs/', '/api/redoc/', '/api/schema/')
+
+
+def is_enveloped(data):
+    """True when data already has the standard format."""
+    return isinstance(data, dict) and 'success' in data and 'message' in data
+
+
+def needs_envelope(path, data):
+    """True when a response for path carrying data must be wrapped in the standard format."""
+    if not path.startswith('/api/') or path.startswith(UNWRAPPED_PATHS):
+        return False
+    return not is_enveloped(data)
+
+
+def envelope(data, status_code):
+    """
+    Wrap raw response data in the standard format. Used by EnvelopeJSONRenderer
+    and, for responses it did not render, StandardResponseMiddleware.
+    """
+    is_success = 200 <= status_code < 400
+
+    # If already in standard format, return as-is
+    if is_enveloped(data):
+        return data
+
+    # Determine message based on status code
+    if is_success:
+        message = "Success"
+        if isinstance(data, dict) and 'message' in data:
+            message = data.pop('message')
+    else:
+        message = "Error"
+        if isinstance(data, dict):
+            if 'detail' in data:
+                message = data['detail']
+                data = {'detail': data['detail']}
+            elif 'error' in data:
+                message = data['error']
+
+    return {
+        'success': is_success,
+        'message': message,
+        'data': data if is_success else None,
+        'errors': data if not is_success else None
+    }
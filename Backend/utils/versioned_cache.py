@@ -0,0 +1,68 @@
+import logging
+import threading
+import uuid
+
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+
+class VersionedSnapshot:
+    """
+    Process-local snapshot of rarely-changing master data.
+
+    The snapshot is built lazily by `builder()` and kept in memory for the
+    lifetime of the worker process. A version token stored in the shared
+    cache (Redis) lets every worker notice when another process invalidated
+    it, so an admin edit in one gunicorn worker is picked up everywhere on
+    the next read.
+
+    Usage:
+        matrix_index = VersionedSnapshot("approval_matrix", ApprovalMatrixIndex.build)
+        index = matrix_index.get()
+        matrix_index.invalidate()   # from a post_save / post_delete receiver
+    """
+
+    def __init__(self, name, builder):
+        self.name = name
+        self.version_key = f"snapshot:{name}:version"
+        self._builder = builder
+        self._lock = threading.Lock()
+        self._value = None
+        self._version = None
+
+    def _shared_version(self):
+        """Read (or initialise) the shared version token. Returns None if cache is down."""
+        try:
+            version = cache.get(self.version_key)
+            if version is None:
+                cache.add(self.version_key, uuid.uuid4().hex, None)
+                version = cache.get(self.version_key)
+            return version
+        except Exception as e:
+            logger.debug("VersionedSnapshot %s: cache unavailable (%s)", self.name, e)
+            return None
+
+    def get(self):
+        """Return the current snapshot, rebuilding it if it is missing or stale."""
+        version = self._shared_version()
+        value = self._value
+        if value is not None and (version is None or version == self._version):
+            return value
+
+        with self._lock:
+            if self._value is None or (version is not None and version != self._version):
+                self._value = self._builder()
+                self._version = version
+                logger.debug("VersionedSnapshot %s rebuilt (version=%s)", self.name, version)
+            return self._value
+
+    def invalidate(self):
+        """Drop the local copy and bump the shared version so other workers rebuild too."""
+        with self._lock:
+            self._value = None
+            self._version = None
+        try:
+            cache.set(self.version_key, uuid.uuid4().hex, None)
+        except Exception as e:
+            logger.debug("VersionedSnapshot %s: could not bump version (%s)", self.name, e)